@@ -0,0 +1,43 @@
+"""
+Benchmarks reproducibles de la API.
+
+Cada módulo se ejecuta desde `api/` (p. ej. `python -m benchmarks.bulk_progress`)
+y trabaja sobre una base de datos de prueba temporal, nunca sobre la de
+desarrollo. Con `DB_ENGINE=postgres` la base temporal se crea en Postgres.
+"""
+
+import os
+import time
+from contextlib import contextmanager
+
+
+def setup():
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+    import django
+
+    django.setup()
+
+
+@contextmanager
+def test_database():
+    """Crea una base de datos de prueba con las migraciones aplicadas y la destruye al salir."""
+    setup()
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    setup_test_environment()
+    old_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0, serialize=False)
+    try:
+        yield connection
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+@contextmanager
+def timer(results, key):
+    """Guarda en `results[key]` los segundos que tarda el bloque."""
+    start = time.perf_counter()
+    yield
+    results[key] = time.perf_counter() - start
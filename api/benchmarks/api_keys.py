@@ -0,0 +1,71 @@
+"""
+Costo por petición de autenticar: sesión frente a API key, con y sin caché.
+
+    python -m benchmarks.api_keys --requests 2000
+
+Pide `/api/health/` (una vista sin consultas propias) autenticando con
+sesión, con una API key verificada en cada petición (caché vaciada) y con la
+caché de claves verificadas. Reporta µs y consultas por petición. El
+contador de uso se escribe en lotes, así que no suma consultas por petición.
+"""
+
+import argparse
+import time
+from unittest import mock
+
+from . import test_database
+
+
+def measure(client, requests, before=None, **headers):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from django.urls import reverse
+
+    url = reverse("heath")
+    client.get(url, **headers)  # Calentamiento.
+    elapsed = 0.0
+    with CaptureQueriesContext(connection) as queries:
+        for _ in range(requests):
+            if before:
+                before()
+            start = time.perf_counter()
+            response = client.get(url, **headers)
+            elapsed += time.perf_counter() - start
+            assert response.status_code == 200, response.status_code
+    return elapsed / requests * 1e6, len(queries) / requests
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    with test_database():
+        from django.contrib.auth import get_user_model
+        from rest_framework.test import APIClient
+
+        from common import authentication
+        from common.models import ServiceAPIKey
+        from health.views import HealthStatusView
+
+        user = get_user_model().objects.create_user("bench_session", password="bench")
+        _, raw_key = ServiceAPIKey.objects.create_key(name="bench")
+
+        session = APIClient()
+        session.force_login(user)
+        key = {"HTTP_AUTHORIZATION": f"Api-Key {raw_key}"}
+        runs = (
+            ("sesión", session, None, {}),
+            ("api key sin caché", APIClient(), authentication.verified_keys.clear, key),
+            ("api key con caché", APIClient(), None, key),
+        )
+        print(f"{'autenticación':<20} {'µs/petición':>12} {'consultas/petición':>19}")
+        with mock.patch.object(HealthStatusView, "throttle_classes", []):
+            for name, client, before, headers in runs:
+                micros, queries = measure(client, args.requests, before, **headers)
+                print(f"{name:<20} {micros:>12.1f} {queries:>19.2f}")
+        authentication.usage.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Filas por segundo del upsert masivo frente al `POST` fila a fila.
+
+    python -m benchmarks.bulk_progress --students 300 --tasks 20
+"""
+
+import argparse
+from unittest import mock
+
+from . import test_database, timer
+
+
+def seed(students, tasks):
+    from django.contrib.auth import get_user_model
+
+    from tasks.models import BlockTask, StudyBlock, StudyTopic
+    from users.models import Student
+
+    User = get_user_model()
+    topic = StudyTopic.objects.create(name="Benchmark masivo")
+    block = StudyBlock.objects.create(topic=topic, number=1, title="Bloque benchmark")
+    task_objs = BlockTask.objects.bulk_create(
+        BlockTask(block=block, title=f"Tarea {i}", instructions="-", order=i) for i in range(1, tasks + 1)
+    )
+    users = User.objects.bulk_create(User(username=f"bench_bulk_{i}") for i in range(students))
+    student_objs = Student.objects.bulk_create(Student(user=u, full_name=u.username) for u in users)
+    return [s.pk for s in student_objs], [t.pk for t in task_objs]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=300)
+    parser.add_argument("--tasks", type=int, default=20)
+    parser.add_argument("--single-rows", type=int, default=1000, help="filas a enviar por la ruta fila a fila")
+    args = parser.parse_args()
+
+    with test_database():
+        from django.urls import reverse
+        from rest_framework.test import APIClient
+
+        from users.models import StudentTaskProgress
+        from users.views import StudentTaskProgressViewSet
+
+        student_ids, task_ids = seed(args.students, args.tasks)
+        rows = [{"student": s, "task": t, "status": "pending"} for s in student_ids for t in task_ids]
+        client = APIClient()
+        results = {}
+
+        # El throttling por IP cortaría el recorrido fila a fila; se mide solo el endpoint.
+        with mock.patch.object(StudentTaskProgressViewSet, "throttle_classes", []):
+            single = rows[: args.single_rows]
+            with timer(results, "single"):
+                for row in single:
+                    client.post(reverse("student-task-progress-list"), row, format="json")
+            StudentTaskProgress.objects.all().delete()
+
+            with timer(results, "bulk_insert"):
+                client.post(reverse("student-task-progress-bulk"), rows, format="json")
+            for row in rows:
+                row["status"] = "in_progress"
+            with timer(results, "bulk_update"):
+                client.post(reverse("student-task-progress-bulk"), rows, format="json")
+
+        print(f"filas: {len(rows)} ({args.students} estudiantes × {args.tasks} tareas)")
+        print(f"POST fila a fila   : {len(single) / results['single']:>10.0f} filas/s ({len(single)} filas)")
+        print(f"bulk (inserción)   : {len(rows) / results['bulk_insert']:>10.0f} filas/s")
+        print(f"bulk (actualizar)  : {len(rows) / results['bulk_update']:>10.0f} filas/s")
+
+
+if __name__ == "__main__":
+    main()
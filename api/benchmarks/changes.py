@@ -0,0 +1,133 @@
+"""
+Sincronizar el progreso de un estudiante: volver a listar todo frente a pedir
+solo los cambios, y lo que cuestan los triggers del registro de cambios.
+
+    python -m benchmarks.changes --tasks 500 --changes 1 10 100 --rows 20000
+
+Para un estudiante con progreso en `--tasks` tareas, tras `N` cambios compara
+recorrer todas las páginas de `/api/student-task-progress/?student=` con
+`/api/changes/?since=<seq>&student=`: ms, bytes y consultas. Con `--rows` mide
+además el `bulk_create` y el `UPDATE` masivo de esas filas con los triggers
+instalados y sin ellos.
+"""
+
+import argparse
+import time
+from unittest import mock
+
+from . import test_database, timer
+
+
+def seed(tasks):
+    from django.contrib.auth import get_user_model
+
+    from tasks.models import BlockTask, StudyBlock, StudyTopic
+    from users.models import Student, StudentTaskProgress
+
+    topic = StudyTopic.objects.create(name="Benchmark cambios")
+    block = StudyBlock.objects.create(topic=topic, number=1, title="Bloque benchmark")
+    task_objs = BlockTask.objects.bulk_create(
+        BlockTask(block=block, title=f"Tarea {i}", instructions="-", order=i) for i in range(1, tasks + 1)
+    )
+    user = get_user_model().objects.create(username="bench_changes")
+    student = Student.objects.create(user=user, full_name=user.username)
+    StudentTaskProgress.objects.bulk_create(StudentTaskProgress(student=student, task=task) for task in task_objs)
+    return student
+
+
+def fetch(client, url, params):
+    """Sigue `next` hasta el final; devuelve ms, bytes y consultas."""
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    size = 0
+    start = time.perf_counter()
+    with CaptureQueriesContext(connection) as queries:
+        while url:
+            response = client.get(url, params)
+            assert response.status_code == 200, response.status_code
+            size += len(response.content)
+            url, params = response.json().get("next"), None
+    return (time.perf_counter() - start) * 1000, size, len(queries)
+
+
+def compare_sync(student, counts):
+    from django.urls import reverse
+    from rest_framework.test import APIClient
+
+    from users import changes
+    from users.models import StudentTaskProgress
+
+    client = APIClient()
+    progress = list(StudentTaskProgress.objects.filter(student=student).order_by("pk"))
+    print(f"{'cambios':>8} {'sincronización':<16} {'ms':>8} {'bytes':>10} {'consultas':>10}")
+    for count in counts:
+        since = changes.last_seq()
+        for row in progress[:count]:
+            row.notes += "."
+            row.save(update_fields=["notes"])
+        runs = (
+            ("listado completo", reverse("student-task-progress-list"), {"student": student.pk}),
+            ("cambios", reverse("changes-list"), {"since": since, "student": student.pk}),
+        )
+        for name, url, params in runs:
+            millis, size, queries = fetch(client, url, params)
+            print(f"{count:>8} {name:<16} {millis:>8.1f} {size:>10} {queries:>10}")
+
+
+def compare_writes(rows):
+    from django.contrib.auth import get_user_model
+    from django.db import connection
+
+    from tasks.models import BlockTask
+    from users import changes
+    from users.models import ProgressChange, Student, StudentTaskProgress
+
+    User = get_user_model()
+    tasks = list(BlockTask.objects.values_list("pk", flat=True))
+    # Filas nuevas: todas las tareas para estudiantes sin progreso previo.
+    users = User.objects.bulk_create(User(username=f"bench_writes_{i}") for i in range(-(-rows // len(tasks))))
+    students = Student.objects.bulk_create(Student(user=u, full_name=u.username) for u in users)
+    new = [(s.pk, t) for s in students for t in tasks][:rows]
+
+    results = {}
+    for name in ("con triggers", "sin triggers"):
+        StudentTaskProgress.objects.filter(student__in=students).delete()
+        with timer(results, (name, "insert")):
+            StudentTaskProgress.objects.bulk_create(StudentTaskProgress(student_id=s, task_id=t) for s, t in new)
+        with timer(results, (name, "update")):
+            StudentTaskProgress.objects.filter(student__in=students).update(status="in_progress")
+        with connection.schema_editor() as schema_editor:
+            changes.uninstall(schema_editor)
+    with connection.schema_editor() as schema_editor:
+        changes.install(schema_editor)
+
+    print(f"\nEscrituras masivas: {len(new)} filas (registro de cambios: {ProgressChange.objects.count()} filas)")
+    print(f"{'triggers':<14} {'insert filas/s':>15} {'update filas/s':>15}")
+    for name in ("con triggers", "sin triggers"):
+        insert, update = results[(name, "insert")], results[(name, "update")]
+        print(f"{name:<14} {len(new) / insert:>15.0f} {len(new) / update:>15.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=500)
+    parser.add_argument("--changes", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--rows", type=int, default=20000, help="Filas de las escrituras masivas (0 las omite).")
+    args = parser.parse_args()
+
+    with test_database():
+        from users.views import ProgressChangeViewSet, StudentTaskProgressViewSet
+
+        student = seed(args.tasks)
+        with (
+            mock.patch.object(StudentTaskProgressViewSet, "throttle_classes", []),
+            mock.patch.object(ProgressChangeViewSet, "throttle_classes", []),
+        ):
+            compare_sync(student, args.changes)
+        if args.rows:
+            compare_writes(args.rows)
+
+
+if __name__ == "__main__":
+    main()
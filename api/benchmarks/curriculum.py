@@ -0,0 +1,64 @@
+"""
+Tiempo de importación de un plan de estudios grande.
+
+    python -m benchmarks.curriculum --topics 50 --blocks 20 --tasks 50
+
+Genera un documento NDJSON (un tema por línea) y mide tres pasadas del
+comando `import_curriculum`: la carga inicial, una reimportación sin
+cambios y otra con el título de una de cada diez tareas modificado.
+"""
+
+import argparse
+import io
+import json
+
+from . import test_database, timer
+
+
+def document(topics, blocks, tasks, revision=0):
+    lines = []
+    for t in range(topics):
+        topic = {"name": f"Tema {t}", "description": "Plan generado", "blocks": []}
+        for b in range(1, blocks + 1):
+            topic["blocks"].append(
+                {
+                    "number": b,
+                    "title": f"Bloque {b}",
+                    "tasks": [
+                        {
+                            "order": o,
+                            "title": f"Tarea {o} v{revision if o % 10 == 0 else 0}",
+                            "instructions": "Leer el material y resolver los ejercicios.",
+                            "estimated_minutes": 15,
+                        }
+                        for o in range(1, tasks + 1)
+                    ],
+                }
+            )
+        lines.append(json.dumps(topic))
+    return "\n".join(lines).encode()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--topics", type=int, default=50)
+    parser.add_argument("--blocks", type=int, default=20)
+    parser.add_argument("--tasks", type=int, default=50, help="Tareas por bloque.")
+    args = parser.parse_args()
+
+    with test_database():
+        from tasks import curriculum
+        from tasks.models import BlockTask
+
+        runs = [("carga inicial", 0), ("sin cambios", 0), ("10% modificado", 1)]
+        print(f"{'pasada':<16} {'segundos':>9} {'tareas':>8}  totales")
+        for label, revision in runs:
+            body = document(args.topics, args.blocks, args.tasks, revision)
+            results = {}
+            with timer(results, label):
+                report = curriculum.import_curriculum(curriculum.iter_json(io.BytesIO(body)))
+            print(f"{label:<16} {results[label]:>9.2f} {BlockTask.objects.count():>8}  {report['totals']}")
+
+
+if __name__ == "__main__":
+    main()
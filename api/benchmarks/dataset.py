@@ -0,0 +1,162 @@
+"""
+Generador reproducible del conjunto de datos de benchmark.
+
+Con la misma semilla y los mismos tamaños produce siempre los mismos
+temas, bloques, tareas, estudiantes y progreso. Todo se inserta por lotes
+(`bulk_create`, y `executemany` para el progreso, que es la tabla grande);
+como eso no emite señales, al final se regeneran los resúmenes de progreso
+y se invalida la caché de respuestas.
+"""
+
+import datetime
+import random
+
+PREFIX = "bench"
+WORDS = (
+    "álgebra cálculo vectores matrices funciones límites derivadas integrales grafos árboles listas "
+    "recursión conjuntos lógica probabilidad estadística series ecuaciones geometría programación"
+).split()
+
+
+def _text(rng, words):
+    return " ".join(rng.choices(WORDS, k=words))
+
+
+def _batched(items, size):
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _insert_rows(model, fields, rows):
+    from django.db import connections
+
+    connection = connections[model.objects.db]
+    qn = connection.ops.quote_name
+    columns = ", ".join(qn(model._meta.get_field(name).column) for name in fields)
+    placeholders = ", ".join(["%s"] * len(fields))
+    with connection.cursor() as cursor:
+        cursor.executemany(f"INSERT INTO {qn(model._meta.db_table)} ({columns}) VALUES ({placeholders})", rows)
+
+
+def exists():
+    from tasks.models import StudyTopic
+
+    return StudyTopic.objects.filter(name__startswith=f"{PREFIX} ").exists()
+
+
+def reset():
+    """Borra los datos creados por un `generate` anterior."""
+    from django.contrib.auth import get_user_model
+
+    from tasks.models import StudyTopic
+
+    StudyTopic.objects.filter(name__startswith=f"{PREFIX} ").delete()
+    get_user_model().objects.filter(username__startswith=f"{PREFIX}_").delete()
+
+
+def generate(
+    topics=500, blocks=10, tasks=10, students=50000, progress=20, seed=42, batch_size=5000, log=lambda message: None
+):
+    """
+    Crea `topics` temas con `blocks` bloques de `tasks` tareas cada uno, y
+    `students` estudiantes con progreso en `progress` tareas al azar.
+    Devuelve la cantidad de filas creadas por modelo.
+    """
+    from django.contrib.auth import get_user_model
+    from django.db import connections, transaction
+    from django.utils import timezone
+
+    from common.cache import bump_generation
+    from tasks.models import BlockTask, StudyBlock, StudyTopic
+    from users import rollups
+    from users.models import Student, StudentTaskProgress
+
+    User = get_user_model()
+    rng = random.Random(seed)
+    now = timezone.now()
+    adapt = connections[StudentTaskProgress.objects.db].ops.adapt_datetimefield_value
+    counts = {}
+
+    with transaction.atomic():
+        created = StudyTopic.objects.bulk_create(
+            (
+                StudyTopic(
+                    name=f"{PREFIX} {i:05d} {rng.choice(WORDS)}",
+                    description=_text(rng, 12),
+                    difficulty=rng.choice(StudyTopic.Difficulty.values),
+                )
+                for i in range(topics)
+            ),
+            batch_size=batch_size,
+        )
+        counts["topics"] = len(created)
+        created_blocks = StudyBlock.objects.bulk_create(
+            (
+                StudyBlock(topic=topic, number=n, title=_text(rng, 3), description=_text(rng, 10))
+                for topic in created
+                for n in range(1, blocks + 1)
+            ),
+            batch_size=batch_size,
+        )
+        counts["blocks"] = len(created_blocks)
+        counts["tasks"] = 0
+        for batch in _batched(
+            (
+                BlockTask(
+                    block=block,
+                    title=_text(rng, 4),
+                    instructions=_text(rng, 30),
+                    estimated_minutes=rng.choice((10, 15, 20, 30, 45)),
+                    order=order,
+                )
+                for block in created_blocks
+                for order in range(1, tasks + 1)
+            ),
+            batch_size,
+        ):
+            counts["tasks"] += len(BlockTask.objects.bulk_create(batch))
+    log(f"{counts['topics']} temas, {counts['blocks']} bloques y {counts['tasks']} tareas.")
+
+    task_ids = list(BlockTask.objects.filter(block__topic__in=created).values_list("pk", flat=True))
+    statuses = StudentTaskProgress.Status.values
+    counts["students"] = counts["progress"] = 0
+    # Por tramos de estudiantes (unas `batch_size` filas de progreso), cada uno en su transacción.
+    step = max(batch_size // max(progress, 1), 1)
+    for start in range(0, students, step):
+        stop = min(start + step, students)
+        with transaction.atomic():
+            users = User.objects.bulk_create(
+                User(username=f"{PREFIX}_{i:07d}", password="!", date_joined=now) for i in range(start, stop)
+            )
+            new_students = Student.objects.bulk_create(
+                Student(user=user, full_name=f"{_text(rng, 1).title()} {user.username}") for user in users
+            )
+            rows = []
+            for student in new_students:
+                for task_id in rng.sample(task_ids, min(progress, len(task_ids))):
+                    status = rng.choice(statuses)
+                    started = completed = None
+                    if status != "pending":
+                        started = now - datetime.timedelta(days=rng.randint(1, 90))
+                    if status == "completed":
+                        completed = started + datetime.timedelta(hours=rng.randint(1, 48))
+                    rows.append((student.pk, task_id, status, adapt(started), adapt(completed), "", adapt(now)))
+            _insert_rows(
+                StudentTaskProgress,
+                ("student", "task", "status", "started_at", "completed_at", "notes", "updated_at"),
+                rows,
+            )
+        counts["students"] += len(new_students)
+        counts["progress"] += len(rows)
+        if counts["students"] % 10000 < len(new_students):
+            log(f"{counts['students']} estudiantes, {counts['progress']} filas de progreso.")
+
+    rollups.rebuild()
+    bump_generation(StudyTopic, StudyBlock, BlockTask)
+    return counts
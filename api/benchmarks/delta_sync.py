@@ -0,0 +1,112 @@
+"""
+Sincronizar el catálogo: cargar todo frente a pedir solo lo que cambió.
+
+    python -m benchmarks.delta_sync --topics 50 --blocks 10 --tasks 10 --changes 10 100 1000
+
+Recorre todas las páginas de `/api/topics/`, `/api/blocks/` y
+`/api/block-tasks/` (carga completa) y, tras cambiar `N` tareas y borrar
+`N / 10`, las mismas páginas con `?updated_since=` más `deleted/` de cada
+recurso (sincronización incremental): ms, bytes y peticiones. Sin caché de
+respuestas, para medir la consulta.
+"""
+
+import argparse
+import time
+from datetime import timedelta
+from unittest import mock
+
+from . import test_database
+
+RESOURCES = ("study-topics", "study-blocks", "block-tasks")
+
+
+def walk(client, url, params):
+    """Sigue `next` hasta el final; devuelve bytes, peticiones y la primera respuesta."""
+    size = requests = 0
+    first = None
+    while url:
+        response = client.get(url, params)
+        assert response.status_code == 200, response.status_code
+        first = first or response
+        size += len(response.content)
+        requests += 1
+        url, params = response.json().get("next"), None
+    return size, requests, first
+
+
+def full_load(client):
+    from django.urls import reverse
+
+    size = requests = 0
+    start = time.perf_counter()
+    for name in RESOURCES:
+        resource_size, resource_requests, first = walk(client, reverse(f"{name}-list"), {})
+        size, requests = size + resource_size, requests + resource_requests
+    return (time.perf_counter() - start) * 1000, size, requests, first["X-Sync-Timestamp"]
+
+
+def delta_sync(client, since):
+    from django.urls import reverse
+
+    size = requests = 0
+    start = time.perf_counter()
+    for name in RESOURCES:
+        for url_name in (f"{name}-list", f"{name}-deleted"):
+            resource_size, resource_requests, _ = walk(client, reverse(url_name), {"updated_since": since})
+            size, requests = size + resource_size, requests + resource_requests
+    return (time.perf_counter() - start) * 1000, size, requests
+
+
+def change(count):
+    from tasks.models import BlockTask
+
+    pks = list(BlockTask.objects.order_by("?").values_list("pk", flat=True)[: count + count // 10])
+    for task in BlockTask.objects.filter(pk__in=pks[:count]):
+        task.title += " (editada)"
+        task.save(update_fields=["title", "updated_at"])
+    BlockTask.objects.filter(pk__in=pks[count:]).delete()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--topics", type=int, default=50)
+    parser.add_argument("--blocks", type=int, default=10)
+    parser.add_argument("--tasks", type=int, default=10)
+    parser.add_argument("--changes", type=int, nargs="+", default=[10, 100, 1000])
+    args = parser.parse_args()
+
+    with test_database():
+        from django.test import override_settings
+        from django.utils import timezone
+        from rest_framework.test import APIClient
+
+        from tasks.models import BlockTask, StudyBlock, StudyTopic
+        from tasks.views import BlockTaskViewSet, StudyBlockViewSet, StudyTopicViewSet
+
+        from .dataset import generate
+
+        generate(topics=args.topics, blocks=args.blocks, tasks=args.tasks, students=1, progress=0)
+        # Los datos generados quedan fuera del margen de `X-Sync-Timestamp`.
+        past = timezone.now() - timedelta(hours=1)
+        for model in (StudyTopic, StudyBlock, BlockTask):
+            model.objects.update(updated_at=past)
+
+        client = APIClient()
+        print(f"tareas: {BlockTask.objects.count()}")
+        print(f"{'cambios':>8} {'sincronización':<14} {'ms':>9} {'bytes':>11} {'peticiones':>11}")
+        with (
+            override_settings(RESPONSE_CACHE_TIMEOUT=0),
+            mock.patch.object(StudyTopicViewSet, "throttle_classes", []),
+            mock.patch.object(StudyBlockViewSet, "throttle_classes", []),
+            mock.patch.object(BlockTaskViewSet, "throttle_classes", []),
+        ):
+            for count in args.changes:
+                millis, size, requests, since = full_load(client)
+                print(f"{count:>8} {'completa':<14} {millis:>9.1f} {size:>11} {requests:>11}")
+                change(count)
+                millis, size, requests = delta_sync(client, since)
+                print(f"{count:>8} {'incremental':<14} {millis:>9.1f} {size:>11} {requests:>11}")
+
+
+if __name__ == "__main__":
+    main()
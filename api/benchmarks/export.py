@@ -0,0 +1,73 @@
+"""
+Memoria pico de la exportación en streaming según la cantidad de filas.
+
+    python -m benchmarks.export --rows 10000 100000 1000000
+
+Para cada tamaño se crea el progreso (estudiantes × tareas) y se consume el
+stream completo de `/api/student-task-progress/export/` midiendo con
+`tracemalloc` la memoria de Python reservada durante la respuesta.
+"""
+
+import argparse
+import tracemalloc
+from unittest import mock
+
+from . import test_database, timer
+
+TASKS = 500
+
+
+def seed(rows):
+    """Completa `rows` filas de progreso insertándolas en la base de datos."""
+    from django.contrib.auth import get_user_model
+
+    from tasks.models import BlockTask, StudyBlock, StudyTopic
+    from users.assignment import insert_missing_progress
+    from users.models import Student
+
+    User = get_user_model()
+    if not BlockTask.objects.exists():
+        topic = StudyTopic.objects.create(name="Benchmark export")
+        block = StudyBlock.objects.create(topic=topic, number=1, title="Bloque export")
+        BlockTask.objects.bulk_create(
+            BlockTask(block=block, title=f"Tarea {i}", instructions="-", order=i) for i in range(1, TASKS + 1)
+        )
+    students = -(-rows // TASKS) - Student.objects.count()
+    offset = User.objects.count()
+    users = User.objects.bulk_create(User(username=f"bench_export_{offset + i}") for i in range(students))
+    new = Student.objects.bulk_create(Student(user=u, full_name=u.username) for u in users)
+    insert_missing_progress(Student.objects.filter(pk__in=[s.pk for s in new]), BlockTask.objects.all())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--format", choices=["csv", "ndjson"], default="csv")
+    args = parser.parse_args()
+
+    with test_database():
+        from django.urls import reverse
+        from rest_framework.test import APIClient
+
+        from users.models import StudentTaskProgress
+        from users.views import StudentTaskProgressViewSet
+
+        client = APIClient()
+        print(f"{'filas':>10} {'MB pico':>9} {'segundos':>9} {'MB enviados':>12}")
+        with mock.patch.object(StudentTaskProgressViewSet, "throttle_classes", []):
+            for rows in sorted(args.rows):
+                seed(rows)
+                total = StudentTaskProgress.objects.count()
+                results, sent = {}, 0
+                tracemalloc.start()
+                with timer(results, "export"):
+                    res = client.get(reverse("student-task-progress-export"), {"as": args.format})
+                    for chunk in res.streaming_content:
+                        sent += len(chunk)
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                print(f"{total:>10} {peak / 2**20:>9.1f} {results['export']:>9.1f} {sent / 2**20:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
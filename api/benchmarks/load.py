@@ -0,0 +1,256 @@
+"""
+Carga sobre las rutas reales de la API, en proceso y con hilos en paralelo.
+
+    python -m benchmarks.load --topics 100 --students 5000 --requests 300 --concurrency 8
+    python -m benchmarks.load --existing            # datos de `manage.py seed_benchmark`
+    python -m benchmarks.load --baseline benchmarks/results/sqlite-abc1234.json
+
+Sin `--existing` se crea una base temporal (SQLite, o Postgres con
+`DB_ENGINE=postgres`) con el generador de `benchmarks.dataset`. Para cada
+endpoint se reportan p50/p95/p99 de latencia, peticiones por segundo y
+consultas por petición (de la cabecera `Server-Timing`), y el resultado se
+guarda en JSON para compararlo entre commits.
+"""
+
+import argparse
+import datetime
+import json
+import math
+import platform
+import random
+import re
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from pathlib import Path
+from unittest import mock
+
+from . import setup, test_database
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+QUERIES_RE = re.compile(r'desc="(\d+) queries"')
+
+# (nombre, ruta, función que arma los parámetros con los ids del conjunto de datos)
+ENDPOINTS = [
+    ("study-topics.list", "study-topics-list", None, lambda ids, rng: {}),
+    ("study-topics.list?expand", "study-topics-list", None, lambda ids, rng: {"expand": "blocks"}),
+    ("study-topics.retrieve", "study-topics-detail", "topics", lambda ids, rng: {}),
+    ("study-blocks.list", "study-blocks-list", None, lambda ids, rng: {"topic": rng.choice(ids["topics"])}),
+    ("study-blocks.retrieve", "study-blocks-detail", "blocks", lambda ids, rng: {}),
+    ("block-tasks.list", "block-tasks-list", None, lambda ids, rng: {"block__topic": rng.choice(ids["topics"])}),
+    ("block-tasks.list?cursor", "block-tasks-list", None, lambda ids, rng: {"pagination": "cursor"}),
+    ("block-tasks.list?search", "block-tasks-list", None, lambda ids, rng: {"search": rng.choice(ids["words"])}),
+    ("block-tasks.retrieve", "block-tasks-detail", "tasks", lambda ids, rng: {}),
+    ("students.list", "students-list", None, lambda ids, rng: {}),
+    ("students.summary", "students-summary", "students", lambda ids, rng: {}),
+    (
+        "student-task-progress.list",
+        "student-task-progress-list",
+        None,
+        lambda ids, rng: {"student": rng.choice(ids["students"])},
+    ),
+    ("student-task-progress.retrieve", "student-task-progress-detail", "progress", lambda ids, rng: {}),
+]
+
+
+def dataset_ids(limit=5000):
+    """Ids de muestra para los detalles y filtros (los primeros `limit` de cada tabla)."""
+    from tasks.models import BlockTask, StudyBlock, StudyTopic
+    from users.models import Student, StudentTaskProgress
+
+    from .dataset import WORDS
+
+    def sample(model):
+        return list(model.objects.order_by("pk").values_list("pk", flat=True)[:limit])
+
+    return {
+        "topics": sample(StudyTopic),
+        "blocks": sample(StudyBlock),
+        "tasks": sample(BlockTask),
+        "students": sample(Student),
+        "progress": sample(StudentTaskProgress),
+        "words": WORDS,
+    }
+
+
+def dataset_counts():
+    from tasks.models import BlockTask, StudyBlock, StudyTopic
+    from users.models import Student, StudentTaskProgress
+
+    return {
+        "topics": StudyTopic.objects.count(),
+        "blocks": StudyBlock.objects.count(),
+        "tasks": BlockTask.objects.count(),
+        "students": Student.objects.count(),
+        "progress": StudentTaskProgress.objects.count(),
+    }
+
+
+def percentile(values, p):
+    """Percentil por rango más cercano sobre `values` ordenados."""
+    if not values:
+        return None
+    return values[min(len(values) - 1, max(math.ceil(p / 100 * len(values)) - 1, 0))]
+
+
+def run_endpoint(name, route, detail, params, ids, requests, concurrency, seed):
+    from django.db import connections
+    from django.test import Client
+    from django.urls import reverse
+
+    rng = random.Random(f"{seed}:{name}")
+    calls = []
+    for _ in range(requests):
+        args = [rng.choice(ids[detail])] if detail else []
+        calls.append((reverse(route, args=args), params(ids, rng)))
+
+    latencies, queries, errors = [], [], 0
+    lock = threading.Lock()
+
+    def worker(chunk):
+        nonlocal errors
+        client = Client()
+        try:
+            for url, query in chunk:
+                start = time.perf_counter()
+                res = client.get(url, query)
+                elapsed = time.perf_counter() - start
+                match = QUERIES_RE.search(res.get("Server-Timing", ""))
+                with lock:
+                    latencies.append(elapsed)
+                    if match:
+                        queries.append(int(match.group(1)))
+                    errors += res.status_code >= 400
+        finally:
+            # Cada hilo abre su propia conexión; se cierra para poder borrar la base temporal.
+            connections.close_all()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(worker, [calls[i::concurrency] for i in range(concurrency)]))
+    wall = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / wall, 1),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 2),
+        "queries_per_request": round(sum(queries) / len(queries), 2) if queries else None,
+    }
+
+
+def run(args):
+    from django.db import connection
+    from django.test import override_settings
+    from rest_framework.views import APIView
+
+    ids = dataset_ids()
+    overrides = {"SERVER_TIMING": True, "QUERY_BUDGET_MODE": "off", "DEBUG": False}
+    if not args.cache:
+        overrides["RESPONSE_CACHE_TIMEOUT"] = 0
+
+    results = {}
+    with override_settings(**overrides), mock.patch.object(APIView, "throttle_classes", []):
+        for name, route, detail, params in ENDPOINTS:
+            if args.endpoints and name not in args.endpoints:
+                continue
+            if detail and not ids[detail]:
+                continue
+            if args.warmup:
+                run_endpoint(name, route, detail, params, ids, args.warmup, 1, args.seed)
+            results[name] = run_endpoint(name, route, detail, params, ids, args.requests, args.concurrency, args.seed)
+            row = results[name]
+            print(
+                f"{name:<32} {row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f} "
+                f"{row['rps']:>8.1f} {row['queries_per_request'] or 0:>8.1f} {row['errors']:>6}"
+            )
+
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            "vendor": connection.vendor,
+            "database_version": ".".join(map(str, connection.get_database_version())),
+            "python": platform.python_version(),
+            "django": __import__("django").get_version(),
+            "dataset": dataset_counts(),
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "cache": args.cache,
+        },
+        "endpoints": results,
+    }
+
+
+def compare(baseline, current):
+    """Imprime la variación de p50/p95 y consultas por petición respecto de `baseline`."""
+    print(f"\nComparación con {baseline['meta'].get('commit')} ({baseline['meta'].get('vendor')}):")
+    print(f"{'endpoint':<32} {'p50 %':>8} {'p95 %':>8} {'consultas':>10}")
+    for name, row in current["endpoints"].items():
+        base = baseline["endpoints"].get(name)
+        if not base:
+            print(f"{name:<32} {'(nuevo)':>8}")
+            continue
+
+        def delta(key):
+            return f"{(row[key] - base[key]) / base[key] * 100:+.0f}" if base[key] else "-"
+
+        queries = (row["queries_per_request"] or 0) - (base["queries_per_request"] or 0)
+        print(f"{name:<32} {delta('p50_ms'):>8} {delta('p95_ms'):>8} {queries:>+10.1f}")
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--topics", type=int, default=100)
+    parser.add_argument("--students", type=int, default=5000)
+    parser.add_argument("--existing", action="store_true", help="Usa la base configurada sin generar datos.")
+    parser.add_argument("--requests", type=int, default=300, help="Peticiones medidas por endpoint.")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--cache", action="store_true", help="Mantiene la caché de respuestas activa.")
+    parser.add_argument("--endpoints", nargs="+", help="Solo estos endpoints (por nombre).")
+    parser.add_argument("--output", type=Path, help="Archivo JSON (por defecto results/<motor>-<commit>.json).")
+    parser.add_argument("--baseline", type=Path, help="Resultado anterior con el que comparar.")
+    args = parser.parse_args()
+
+    if args.existing:
+        setup()
+        context = nullcontext()
+    else:
+        context = test_database()
+    with context:
+        if not args.existing:
+            from .dataset import generate
+
+            generate(topics=args.topics, students=args.students, seed=args.seed, log=print)
+        print(
+            f"{'endpoint':<32} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'req/s':>8} {'consultas':>8} {'errores':>6}"
+        )
+        report = run(args)
+
+    output = args.output or RESULTS_DIR / f"{report['meta']['vendor']}-{report['meta']['commit'] or 'local'}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    print(f"\nResultados en {output}")
+    if args.baseline:
+        compare(json.loads(args.baseline.read_text(encoding="utf-8")), report)
+
+
+if __name__ == "__main__":
+    main()
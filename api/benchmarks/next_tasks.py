@@ -0,0 +1,124 @@
+"""
+Latencia de las siguientes tareas de un estudiante (`/api/students/{id}/next-tasks/`).
+
+    python -m benchmarks.next_tasks --topics 100 --students 1000 --progress 1000   # 10k tareas, 1M filas
+    python -m benchmarks.next_tasks --queries 500 --limit 5
+
+Genera el conjunto de `benchmarks.dataset` y agrega estudiantes "avanzados"
+que ya completaron la mayor parte del catálogo en el orden recomendado (el
+peor caso: el anti-join descarta casi todas las tareas antes de encontrar
+las pendientes). Mide la consulta sola y el endpoint completo para
+estudiantes al azar y para los avanzados, con p50/p95/p99 frente al
+objetivo de 10 ms, y muestra el plan de la consulta.
+"""
+
+import argparse
+import random
+import time
+from unittest import mock
+
+from . import test_database
+from .load import percentile
+
+TARGET_MS = 10
+
+
+def add_advanced_students(count, completed_ratio):
+    """Estudiantes con las primeras `completed_ratio` tareas recomendadas ya completadas."""
+    from django.contrib.auth import get_user_model
+    from django.utils import timezone
+
+    from tasks.models import BlockTask
+    from users import rollups
+    from users.models import Student, StudentTaskProgress
+
+    ordered = list(
+        BlockTask.objects.filter(status="available", block__is_published=True, block__topic__is_active=True)
+        .order_by("block__number", "order", "block__topic_id")
+        .values_list("pk", flat=True)
+    )
+    done = ordered[: int(len(ordered) * completed_ratio)]
+    now = timezone.now()
+    users = get_user_model().objects.bulk_create(
+        get_user_model()(username=f"bench_next_{i}", password="!") for i in range(count)
+    )
+    students = Student.objects.bulk_create(Student(user=user, full_name=user.username) for user in users)
+    for student in students:
+        StudentTaskProgress.objects.bulk_create(
+            (
+                StudentTaskProgress(student=student, task_id=task_id, status="completed", started_at=now,
+                                    completed_at=now)
+                for task_id in done
+            ),
+            batch_size=5000,
+        )
+    rollups.mark_dirty(student.pk for student in students)
+    return [student.pk for student in students]
+
+
+def measure(func, ids, queries, rng):
+    latencies = []
+    for _ in range(queries):
+        student_id = rng.choice(ids)
+        start = time.perf_counter()
+        func(student_id)
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    return [percentile(latencies, p) * 1000 for p in (50, 95, 99)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--topics", type=int, default=100)
+    parser.add_argument("--blocks", type=int, default=10)
+    parser.add_argument("--tasks", type=int, default=10)
+    parser.add_argument("--students", type=int, default=1000)
+    parser.add_argument("--progress", type=int, default=1000, help="Filas de progreso por estudiante.")
+    parser.add_argument("--advanced", type=int, default=10, help="Estudiantes con casi todo completado.")
+    parser.add_argument("--completed", type=float, default=0.9, help="Fracción completada por los avanzados.")
+    parser.add_argument("--queries", type=int, default=300)
+    parser.add_argument("--limit", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    with test_database() as connection:
+        from django.urls import reverse
+        from rest_framework.test import APIClient
+
+        from users.models import Student, StudentTaskProgress
+        from users.recommendations import next_tasks
+        from users.views import StudentViewSet
+
+        from .dataset import generate
+
+        generate(
+            topics=args.topics, blocks=args.blocks, tasks=args.tasks, students=args.students,
+            progress=args.progress, seed=args.seed, log=print,
+        )
+        advanced = add_advanced_students(args.advanced, args.completed)
+        print(f"{StudentTaskProgress.objects.count()} filas de progreso.")
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+        regular = list(Student.objects.exclude(pk__in=advanced).values_list("pk", flat=True))
+        print("\nPlan:")
+        print(next_tasks(advanced[0], args.limit).explain())
+
+        client = APIClient()
+        runs = {
+            "consulta": lambda pk: list(next_tasks(pk, args.limit)),
+            "endpoint": lambda pk: client.get(reverse("students-next-tasks", args=[pk]), {"limit": args.limit}),
+        }
+        rng = random.Random(args.seed)
+        print(f"\n{'':<10} {'estudiantes':<12} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+        with mock.patch.object(StudentViewSet, "throttle_classes", []):
+            for name, func in runs.items():
+                for label, ids in (("al azar", regular), ("avanzados", advanced)):
+                    func(ids[0])  # Calentamiento.
+                    p50, p95, p99 = measure(func, ids, args.queries, rng)
+                    mark = "" if p99 <= TARGET_MS else f"  > {TARGET_MS} ms"
+                    print(f"{name:<10} {label:<12} {p50:>8.2f} {p95:>8.2f} {p99:>8.2f}{mark}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Latencia de `?search=` en `/api/block-tasks/` con el índice de texto completo
+frente al `icontains` de `SearchFilter`.
+
+    python -m benchmarks.search --tasks 100000 --queries 50
+"""
+
+import argparse
+import random
+from unittest import mock
+
+from . import test_database, timer
+
+SYLLABLES = "ma tri ces vec to res in te gra les de ri va das li mi se gra fos ar bo con jun fun cio nes".split()
+# Vocabulario sintético amplio: cada término coincide con una fracción pequeña de las tareas.
+WORDS = sorted({a + b + c for a in SYLLABLES for b in SYLLABLES for c in SYLLABLES})[:3000]
+
+
+def seed(tasks, per_block=100):
+    from tasks.models import BlockTask, StudyBlock, StudyTopic
+
+    rng = random.Random(7)
+    topic = StudyTopic.objects.create(name="Benchmark búsqueda")
+    blocks = StudyBlock.objects.bulk_create(
+        StudyBlock(topic=topic, number=n, title=" ".join(rng.sample(WORDS, 2)))
+        for n in range(1, tasks // per_block + 2)
+    )
+    BlockTask.objects.bulk_create(
+        (
+            BlockTask(
+                block=blocks[i // per_block],
+                title=" ".join(rng.sample(WORDS, 3)),
+                instructions=" ".join(rng.choices(WORDS, k=40)),
+                order=i % per_block + 1,
+            )
+            for i in range(tasks)
+        ),
+        batch_size=2000,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=50)
+    args = parser.parse_args()
+
+    with test_database():
+        from django.test import override_settings
+        from django.urls import reverse
+        from rest_framework.filters import SearchFilter
+        from rest_framework.test import APIClient
+
+        from common.search import FullTextSearchFilter
+        from tasks.views import BlockTaskViewSet
+
+        seed(args.tasks)
+        client = APIClient()
+        url = reverse("block-tasks-list")
+        terms = [random.Random(i).choice(WORDS) for i in range(args.queries)]
+        results = {}
+
+        # Sin throttling ni caché de respuestas: se mide la consulta en cada petición.
+        with mock.patch.object(BlockTaskViewSet, "throttle_classes", []), override_settings(
+            RESPONSE_CACHE_TIMEOUT=0
+        ):
+            with timer(results, "fts"):
+                for term in terms:
+                    client.get(url, {"search": term})
+            backends = [
+                SearchFilter if backend is FullTextSearchFilter else backend
+                for backend in BlockTaskViewSet.filter_backends
+            ]
+            with mock.patch.object(BlockTaskViewSet, "filter_backends", backends):
+                with timer(results, "icontains"):
+                    for term in terms:
+                        client.get(url, {"search": term})
+
+        print(f"tareas: {args.tasks}, búsquedas: {args.queries}")
+        print(f"texto completo : {1000 * results['fts'] / args.queries:>8.1f} ms/petición")
+        print(f"icontains      : {1000 * results['icontains'] / args.queries:>8.1f} ms/petición")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Serialización de listados: `ModelSerializer` frente a `ValuesPlan`, con cada renderer.
+
+    python -m benchmarks.serializers --rows 1000 10000 --repeat 5
+
+Para cada tamaño se crean `rows` tareas y `rows` filas de progreso, y se
+mide (mejor de `--repeat`) lo que cuesta pasar de la consulta a los bytes
+de la respuesta en los listados de tareas y de progreso:
+
+- `serializer`: instancias con `select_related` y `get_serializer(many=True)`.
+- `values`: filas de `.values()` y `ValuesPlan.represent_many()`.
+
+cada uno renderizado con el `JSONRenderer` de DRF y con `FastJSONRenderer`
+(orjson, si está instalado). Se comprueba además que los bytes coincidan.
+"""
+
+import argparse
+import time
+
+from . import test_database
+
+TASKS_PER_BLOCK = 100
+
+
+def seed(rows):
+    """Deja exactamente `rows` tareas y `rows` filas de progreso."""
+    from django.contrib.auth import get_user_model
+
+    from tasks.models import BlockTask, StudyBlock, StudyTopic
+    from users.models import Student, StudentTaskProgress
+
+    User = get_user_model()
+    StudentTaskProgress.objects.all().delete()
+    StudyTopic.objects.all().delete()
+    topic = StudyTopic.objects.create(name="Benchmark serializers")
+    blocks = StudyBlock.objects.bulk_create(
+        StudyBlock(topic=topic, number=n, title=f"Bloque {n}") for n in range(1, -(-rows // TASKS_PER_BLOCK) + 1)
+    )
+    BlockTask.objects.bulk_create(
+        BlockTask(
+            block=blocks[i // TASKS_PER_BLOCK],
+            title=f"Tarea {i}",
+            instructions="Leer el capítulo y resolver los ejercicios impares.",
+            resources={"links": [f"https://example.com/{i}"], "nivel": i % 3} if i % 2 else None,
+            order=i % TASKS_PER_BLOCK + 1,
+        )
+        for i in range(rows)
+    )
+    user, _ = User.objects.get_or_create(username="bench_serializers")
+    student, _ = Student.objects.get_or_create(user=user, defaults={"full_name": "Benchmark"})
+    StudentTaskProgress.objects.bulk_create(
+        StudentTaskProgress(student=student, task=task, notes="Nota de seguimiento")
+        for task in BlockTask.objects.only("pk")
+    )
+
+
+def best_of(repeat, func):
+    times, result = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def measure(viewset_class, repeat):
+    """Segundos por variante para el listado completo de `viewset_class`."""
+    from rest_framework.renderers import JSONRenderer
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+
+    from common.renderers import FastJSONRenderer
+
+    view = viewset_class(action="list", format_kwarg=None)
+    view.request = Request(APIRequestFactory().get("/"))
+    queryset = view.filter_queryset(view.get_queryset()).order_by("pk")
+    plan = view.get_values_plan(queryset)
+
+    builders = {
+        "serializer": lambda: view.get_serializer(list(queryset), many=True).data,
+        "values": lambda: plan.represent_many(view.values_queryset(queryset, plan)),
+    }
+    renderers = {"drf": JSONRenderer(), "fast": FastJSONRenderer()}
+    results, outputs = {}, set()
+    for name, build in builders.items():
+        for renderer_name, renderer in renderers.items():
+            seconds, body = best_of(repeat, lambda: renderer.render(build()))
+            results[f"{name}+{renderer_name}"] = seconds
+            outputs.add(body)
+    return results, len(outputs) == 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with test_database():
+        from common import renderers
+        from tasks.views import BlockTaskViewSet
+        from users.views import StudentTaskProgressViewSet
+
+        if renderers.orjson is None:
+            print("orjson no está instalado: `fast` usa el encoder de DRF.")
+        variants = ["serializer+drf", "serializer+fast", "values+drf", "values+fast"]
+        print(f"{'listado':<10} {'filas':>6} " + " ".join(f"{v:>16}" for v in variants) + f" {'mejora':>7} iguales")
+        for rows in sorted(args.rows):
+            seed(rows)
+            for label, viewset_class in (("tareas", BlockTaskViewSet), ("progreso", StudentTaskProgressViewSet)):
+                results, identical = measure(viewset_class, args.repeat)
+                cells = " ".join(f"{results[v] * 1000:>13.1f} ms" for v in variants)
+                speedup = results["serializer+drf"] / results["values+fast"]
+                print(f"{label:<10} {rows:>6} {cells} {speedup:>6.1f}x {'sí' if identical else 'NO'}")
+
+
+if __name__ == "__main__":
+    main()
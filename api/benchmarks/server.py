@@ -0,0 +1,270 @@
+"""
+Servidor de aplicaciones: `runserver` frente a gunicorn con workers de uvicorn.
+
+    python -m benchmarks.server --requests 500 --concurrency 32
+    python -m benchmarks.server --servers gunicorn --workers 4 --endpoints study-topics.list
+    python -m benchmarks.server --existing          # datos de `manage.py seed_benchmark`
+
+Cada servidor se levanta como proceso aparte sobre la misma base (una
+temporal generada con `benchmarks.dataset`, salvo con `--existing`), sin
+DEBUG, throttling ni caché de respuestas, y se carga por HTTP desde varios
+hilos con conexiones keep-alive. Se reportan por servidor y endpoint las
+peticiones por segundo y p50/p95/p99, y el resultado se guarda en
+`results/server-<commit>.json`.
+"""
+
+import argparse
+import datetime
+import http.client
+import importlib.util
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from pathlib import Path
+from urllib.parse import urlencode
+
+from . import setup, test_database
+from .load import ENDPOINTS, RESULTS_DIR, _git_commit, dataset_counts, dataset_ids, percentile
+
+API_DIR = Path(__file__).resolve().parent.parent
+
+# nombre -> (módulos requeridos, comando según puerto y workers)
+SERVERS = {
+    "runserver": ((), lambda port, workers: ["manage.py", "runserver", "--noreload", f"127.0.0.1:{port}"]),
+    "gunicorn": (
+        ("gunicorn", "uvicorn_worker"),
+        lambda port, workers: [
+            "-m", "gunicorn", "-c", "config/gunicorn.py", "--bind", f"127.0.0.1:{port}", "--workers", str(workers),
+            "config.asgi:application",
+        ],
+    ),
+}
+
+
+def server_env(connection, cache):
+    env = dict(
+        os.environ,
+        DJANGO_DEBUG="false",
+        DJANGO_ALLOWED_HOSTS="127.0.0.1",
+        THROTTLE_ANON_RATE="",
+        THROTTLE_USER_RATE="",
+        THROTTLE_LIST_RATE="",
+        THROTTLE_EXPORT_RATE="",
+        QUERY_BUDGET_MODE="off",
+        SERVER_TIMING="false",
+        GUNICORN_ACCESS_LOG="",
+    )
+    if not cache:
+        env["RESPONSE_CACHE_TIMEOUT"] = "0"
+    # La base (temporal o la configurada) que ya tiene los datos.
+    name = str(connection.settings_dict["NAME"])
+    env["SQLITE_PATH" if connection.vendor == "sqlite" else "DB_NAME"] = name
+    return env
+
+
+def start_server(name, port, workers, env, timeout=60):
+    _, command = SERVERS[name]
+    log = tempfile.TemporaryFile()
+    process = subprocess.Popen(
+        [sys.executable, *command(port, workers)], cwd=API_DIR, env=env, stdout=log, stderr=subprocess.STDOUT
+    )
+    process.log = log
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline and process.poll() is None:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+            conn.request("GET", "/api/health/")
+            if conn.getresponse().status == 200:
+                return process
+        except OSError:
+            pass
+        time.sleep(0.2)
+    log.seek(0)
+    output = log.read().decode(errors="replace")
+    stop_server(process)
+    raise RuntimeError(f"{name} no respondió en el puerto {port}:\n{output[-2000:]}")
+
+
+def stop_server(process):
+    process.terminate()
+    try:
+        process.wait(timeout=15)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+    process.log.close()
+
+
+def run_endpoint(port, name, route, detail, params, ids, requests, concurrency, seed):
+    from django.urls import reverse
+
+    rng = random.Random(f"{seed}:{name}")
+    calls = []
+    for _ in range(requests):
+        args = [rng.choice(ids[detail])] if detail else []
+        query = urlencode(params(ids, rng))
+        calls.append(reverse(route, args=args) + (f"?{query}" if query else ""))
+
+    latencies, errors = [], 0
+    lock = threading.Lock()
+
+    def worker(chunk):
+        nonlocal errors
+        # Una conexión por hilo; http.client la reabre si el servidor la cierra.
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+        try:
+            for url in chunk:
+                start = time.perf_counter()
+                try:
+                    conn.request("GET", url)
+                    res = conn.getresponse()
+                    res.read()
+                    failed = res.status >= 400
+                except (OSError, http.client.HTTPException):
+                    conn.close()
+                    failed = True
+                elapsed = time.perf_counter() - start
+                with lock:
+                    latencies.append(elapsed)
+                    errors += failed
+        finally:
+            conn.close()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(worker, [calls[i::concurrency] for i in range(concurrency)]))
+    wall = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / wall, 1),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+    }
+
+
+def run(args, connection):
+    from django.db import connections
+
+    ids = dataset_ids()
+    counts = dataset_counts()
+    connections.close_all()
+    env = server_env(connection, args.cache)
+
+    results = {}
+    for server in args.servers:
+        missing = [module for module in SERVERS[server][0] if importlib.util.find_spec(module) is None]
+        if missing:
+            print(f"\n{server}: se omite, falta {', '.join(missing)}.")
+            continue
+        print(f"\n{server}")
+        process = start_server(server, args.port, args.workers, env)
+        try:
+            results[server] = {}
+            for name, route, detail, params in ENDPOINTS:
+                if args.endpoints and name not in args.endpoints:
+                    continue
+                if detail and not ids[detail]:
+                    continue
+                if args.warmup:
+                    run_endpoint(args.port, name, route, detail, params, ids, args.warmup, 1, args.seed)
+                row = run_endpoint(
+                    args.port, name, route, detail, params, ids, args.requests, args.concurrency, args.seed
+                )
+                results[server][name] = row
+                print(
+                    f"{name:<32} {row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f} "
+                    f"{row['rps']:>8.1f} {row['errors']:>6}"
+                )
+        finally:
+            stop_server(process)
+
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            "vendor": connection.vendor,
+            "python": platform.python_version(),
+            "cpus": os.cpu_count(),
+            "workers": args.workers,
+            "dataset": counts,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "cache": args.cache,
+        },
+        "servers": results,
+    }
+
+
+def compare(report, baseline="runserver"):
+    """Peticiones por segundo de cada servidor respecto de `baseline`, por endpoint."""
+    base = report["servers"].get(baseline)
+    others = [name for name in report["servers"] if name != baseline]
+    if not base or not others:
+        return
+    print(f"\nreq/s respecto de {baseline}:")
+    for name, row in base.items():
+        ratios = [
+            f"{server} x{report['servers'][server][name]['rps'] / row['rps']:.2f}"
+            for server in others
+            if name in report["servers"][server] and row["rps"]
+        ]
+        print(f"{name:<32} {'  '.join(ratios)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--servers", nargs="+", choices=list(SERVERS), default=list(SERVERS))
+    parser.add_argument("--workers", type=int, default=max(2, os.cpu_count() or 1), help="Workers de gunicorn.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--topics", type=int, default=100)
+    parser.add_argument("--students", type=int, default=2000)
+    parser.add_argument("--existing", action="store_true", help="Usa la base configurada sin generar datos.")
+    parser.add_argument("--requests", type=int, default=500, help="Peticiones medidas por endpoint.")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--cache", action="store_true", help="Mantiene la caché de respuestas activa.")
+    parser.add_argument("--endpoints", nargs="+", help="Solo estos endpoints (por nombre).")
+    parser.add_argument("--output", type=Path, help="Archivo JSON (por defecto results/server-<commit>.json).")
+    args = parser.parse_args()
+
+    setup()
+    from django.db import connection
+
+    tmp = tempfile.TemporaryDirectory(prefix="taskmaster-bench-")
+    if args.existing:
+        context = nullcontext(connection)
+    else:
+        if connection.vendor == "sqlite":
+            # Los servidores son otros procesos: la base temporal tiene que ser un archivo.
+            connection.settings_dict["TEST"]["NAME"] = os.path.join(tmp.name, "bench.sqlite3")
+        context = test_database()
+    with tmp, context as connection:
+        if not args.existing:
+            from .dataset import generate
+
+            generate(topics=args.topics, students=args.students, seed=args.seed, log=print)
+        print(f"{'endpoint':<32} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'req/s':>8} {'errores':>6}")
+        report = run(args, connection)
+
+    output = args.output or RESULTS_DIR / f"server-{report['meta']['commit'] or 'local'}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    print(f"\nResultados en {output}")
+    compare(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Costo por petición de la sesión y el usuario, según el backend de sesiones.
+
+    python -m benchmarks.sessions --requests 2000 --expired 100000
+    CACHE_BACKEND=redis CACHE_LOCATION=redis://localhost:6379/1 python -m benchmarks.sessions
+
+Para cada backend ("db", "cached_db", "cache", "signed_cookies") inicia
+sesión y pide `/api/health/` (una vista sin consultas propias), reportando
+µs por petición y las consultas por petición a `django_session` y a
+`auth_user`. Con `--expired` crea además ese número de sesiones vencidas y
+compara el `DELETE` único de `clearsessions` con `prune_sessions` por tramos
+(tiempo total y el `DELETE` más largo, que es lo que bloquea la tabla). Usa
+la caché configurada (`CACHE_BACKEND`), así que con Redis incluye la red.
+"""
+
+import argparse
+import time
+from unittest import mock
+
+from . import test_database
+
+BACKENDS = ("db", "cached_db", "cache", "signed_cookies")
+
+
+def measure(engine, user, requests):
+    from django.db import connection
+    from django.test import override_settings
+    from django.test.utils import CaptureQueriesContext
+    from django.urls import reverse
+    from rest_framework.test import APIClient
+
+    url = reverse("heath")
+    with override_settings(SESSION_ENGINE=f"django.contrib.sessions.backends.{engine}"):
+        client = APIClient()
+        client.force_login(user)
+        client.get(url)  # Calentamiento.
+        elapsed = 0.0
+        with CaptureQueriesContext(connection) as queries:
+            for _ in range(requests):
+                start = time.perf_counter()
+                response = client.get(url)
+                elapsed += time.perf_counter() - start
+                assert response.status_code == 200, response.status_code
+    session = sum("django_session" in query["sql"] for query in queries)
+    users = sum("auth_user" in query["sql"] for query in queries)
+    return elapsed / requests * 1e6, session / requests, users / requests
+
+
+def create_expired(count, batch_size=5000):
+    from django.contrib.sessions.models import Session
+    from django.utils import timezone
+
+    expired = timezone.now() - timezone.timedelta(days=1)
+    Session.objects.bulk_create(
+        (Session(session_key=f"bench{i:027}", session_data="", expire_date=expired) for i in range(count)),
+        batch_size=batch_size,
+    )
+
+
+def compare_pruning(count, batch_size):
+    from django.contrib.sessions.models import Session
+    from django.core.management import call_command
+    from django.db import connection
+
+    from common import sessions
+
+    deletes = []
+
+    def time_deletes(execute, sql, params, many, context):
+        # La transacción más larga: cada DELETE corre en la suya (autocommit).
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            if sql.startswith("DELETE"):
+                deletes.append(time.perf_counter() - start)
+
+    Session.objects.all().delete()
+    results = {}
+    for name, prune in (
+        ("clearsessions", lambda: call_command("clearsessions")),
+        (f"prune_sessions ({batch_size}/tramo)", lambda: sessions.prune_expired(batch_size)),
+    ):
+        create_expired(count)
+        deletes.clear()
+        start = time.perf_counter()
+        with connection.execute_wrapper(time_deletes):
+            prune()
+        results[name] = (time.perf_counter() - start, max(deletes))
+        assert not Session.objects.exists()
+
+    print(f"\nSesiones vencidas: {count}")
+    print(f"{'limpieza':<28} {'total s':>8} {'DELETE más largo ms':>20}")
+    for name, (total, longest) in results.items():
+        print(f"{name:<28} {total:>8.2f} {longest * 1000:>20.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--expired", type=int, default=100000, help="Sesiones vencidas para la limpieza (0 la omite).")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    with test_database():
+        from django.contrib.auth import get_user_model
+        from django.core.cache import caches
+
+        from health.views import HealthStatusView
+
+        user = get_user_model().objects.create_user("bench_session", password="bench")
+        print(f"caché: {type(caches['default']).__name__}")
+        print(f"{'backend':<16} {'µs/petición':>12} {'sesión/petición':>16} {'usuario/petición':>17}")
+        with mock.patch.object(HealthStatusView, "throttle_classes", []):
+            for engine in BACKENDS:
+                micros, session, users = measure(engine, user, args.requests)
+                print(f"{engine:<16} {micros:>12.1f} {session:>16.2f} {users:>17.2f}")
+        if args.expired:
+            compare_pruning(args.expired, args.batch_size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Costo por petición del throttling: DRF (historial) frente a ventana deslizante.
+
+    python -m benchmarks.throttling --history 10 100 1000 10000 --requests 2000
+    CACHE_BACKEND=redis CACHE_LOCATION=redis://localhost:6379/1 python -m benchmarks.throttling
+
+Para cada tamaño de historial (peticiones previas del cliente dentro de la
+ventana, que en DRF es el largo de la lista guardada) se mide el tiempo de
+`allow_request()` de `AnonRateThrottle` de DRF y del de `common.throttling`,
+cuántas operaciones de caché hace por petición y cuántos bytes guarda por
+cliente. Usa la caché configurada (`CACHE_BACKEND`), así que con Redis
+incluye la red.
+"""
+
+import argparse
+import pickle
+import time
+
+from . import setup
+
+
+class CountingCache:
+    def __init__(self, backend):
+        self.backend = backend
+        self.operations = 0
+
+    def __getattr__(self, name):
+        method = getattr(self.backend, name)
+
+        def call(*args, **kwargs):
+            self.operations += 1
+            return method(*args, **kwargs)
+
+        return call
+
+
+def stored_bytes(cache, throttle):
+    """Bytes que ocupa en la caché el estado del cliente (historial o contadores)."""
+    key = throttle.key
+    window = int(throttle.now // throttle.duration)
+    values = cache.get_many([key, f"{key}:{window}", f"{key}:{window - 1}"]).values()
+    return sum(len(pickle.dumps(value)) for value in values)
+
+
+def measure(throttle_class, cache, history, requests):
+    from rest_framework.test import APIRequestFactory
+
+    cache.clear()
+    request = APIRequestFactory().get("/", REMOTE_ADDR="10.1.2.3")
+    request.user = None
+    # Un límite que no se alcanza: se mide el costo de contar, no el rechazo.
+    rate = f"{history + requests + 1}/day"
+    counting = CountingCache(cache)
+
+    class Throttle(throttle_class):
+        THROTTLE_RATES = {"anon": rate}
+
+    Throttle.cache = counting
+    for _ in range(max(history, 1)):
+        throttle = Throttle()
+        throttle.allow_request(request, None)
+    stored = stored_bytes(cache, throttle)
+    counting.operations = 0
+    start = time.perf_counter()
+    for _ in range(requests):
+        Throttle().allow_request(request, None)
+    seconds = time.perf_counter() - start
+    return seconds / requests * 1e6, counting.operations / requests, stored
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--history", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    setup()
+    from django.conf import settings
+    from django.core.cache import caches
+    from rest_framework import throttling as drf
+
+    from common import throttling
+
+    cache = caches[settings.THROTTLE_CACHE_ALIAS]
+    print(f"caché: {type(cache).__name__}")
+    print(f"{'historial':>10} {'throttle':<16} {'µs/petición':>12} {'ops/petición':>13} {'bytes guardados':>16}")
+    for history in sorted(args.history):
+        rows = {}
+        for name, throttle_class in (("drf", drf.AnonRateThrottle), ("ventana", throttling.AnonRateThrottle)):
+            rows[name] = measure(throttle_class, cache, history, args.requests)
+            micros, operations, stored = rows[name]
+            print(f"{history:>10} {name:<16} {micros:>12.1f} {operations:>13.1f} {stored:>16}")
+        print(f"{'':>10} {'mejora':<16} {rows['drf'][0] / rows['ventana'][0]:>11.1f}x")
+    cache.clear()
+
+
+if __name__ == "__main__":
+    main()
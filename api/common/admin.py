@@ -0,0 +1,17 @@
+from django.contrib import admin
+from rest_framework_api_key.admin import APIKeyModelAdmin
+from rest_framework_api_key.models import APIKey
+
+from .models import ServiceAPIKey
+
+# La API solo acepta `ServiceAPIKey`; el modelo de la librería no se usa.
+admin.site.unregister(APIKey)
+
+
+@admin.register(ServiceAPIKey)
+class ServiceAPIKeyAdmin(APIKeyModelAdmin):
+    list_display = (*APIKeyModelAdmin.list_display, "throttle_rate", "request_count", "last_used_at")
+    readonly_fields = ("request_count", "last_used_at")
+
+    def get_readonly_fields(self, request, obj=None):
+        return (*super().get_readonly_fields(request, obj), *self.readonly_fields)
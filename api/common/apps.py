@@ -0,0 +1,14 @@
+import atexit
+
+from django.apps import AppConfig
+from django.conf import settings
+
+
+class CommonConfig(AppConfig):
+    name = 'common'
+
+    def ready(self):
+        from . import authentication, schema  # noqa: F401
+
+        if settings.API_KEY_USAGE_FLUSH_AT_EXIT:
+            atexit.register(authentication.flush_usage_at_exit)
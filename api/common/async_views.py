@@ -0,0 +1,205 @@
+"""
+Lectura asíncrona (ASGI) de los listados más consultados.
+
+`async_list_routes()` reemplaza la vista de algunos listados del router por
+una vista `async def`. Los GET que solo usan la paginación por número de
+página, los filtros exactos de `filterset_fields` y los parámetros de
+`async_query_params` del viewset se resuelven con el ORM asíncrono
+(`aaggregate`, `acount`, `aiterator`) y la caché asíncrona, y el serializer
+(o el `ValuesPlan` de `ValuesListMixin`) corre en un hilo aparte para no
+frenar el event loop. Lo demás (otros métodos, búsqueda, orden, cursor,
+sufijos de formato, filtros inválidos) pasa a la vista síncrona del viewset. Las dos responden igual: mismo JSON,
+ETag, `X-Cache` y errores.
+
+El ORM asíncrono de Django todavía ejecuta cada consulta en un hilo, pero
+la petición solo lo ocupa mientras dura la consulta; bajo un servidor ASGI
+las esperas (caché, base de datos, clientes lentos) no retienen un hilo del
+worker.
+"""
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.paginator import InvalidPage
+from django.db import models
+from django.urls import URLPattern
+from django_filters.rest_framework import DjangoFilterBackend
+from django_filters.utils import get_model_field
+from rest_framework.exceptions import NotFound
+from rest_framework.response import Response
+
+from . import cache
+from .pagination import PrecountedPaginator
+from .views import CachedResponseMixin, ConditionalRequestMixin, ValuesListMixin
+
+
+class Unsupported(Exception):
+    """La petición necesita algo que solo resuelve la vista síncrona."""
+
+
+class AsyncListReader:
+    """Atiende un GET de `list` con una instancia del viewset, como lo haría `dispatch()`."""
+
+    def __init__(self, fallback, request, args, kwargs):
+        view = fallback.cls(**fallback.initkwargs)
+        view.action_map = fallback.actions
+        view.args, view.kwargs = args, kwargs
+        self.view = view
+        self.request = request
+        self.params = request.GET
+
+    def supports(self):
+        view = self.view
+        if self.request.method != "GET" or self.view.kwargs.get("format"):
+            return False
+        if getattr(view, "keyset_fields", None) and getattr(view, "pagination_mode", "page") != "page":
+            return False
+        if getattr(view, "pagination_count_mode", settings.PAGINATION_COUNT_MODE) != "exact":
+            return False
+        allowed = {
+            view.pagination_class.page_query_param,
+            *getattr(view, "filterset_fields", ()),
+            *getattr(view, "async_query_params", ()),
+        }
+        return set(self.params) <= allowed
+
+    async def filter_lookups(self):
+        """
+        Valores de `filterset_fields` ya validados. Los de una relación se
+        comprueban contra la tabla relacionada, como hace el `ModelChoiceFilter`.
+        """
+        model = self.view.queryset.model
+        filters = DjangoFilterBackend().get_filterset_class(self.view, self.view.queryset).base_filters
+        lookups = {}
+        for name in getattr(self.view, "filterset_fields", ()):
+            values = self.params.getlist(name)
+            if not any(values):
+                continue
+            if len(values) > 1:
+                raise Unsupported(name)
+            field = get_model_field(model, name)
+            try:
+                if field.is_relation:
+                    value = field.target_field.to_python(values[0])
+                    if not await field.related_model._default_manager.filter(pk=value).aexists():
+                        raise Unsupported(name)
+                else:
+                    value = filters[name].field.clean(values[0])
+            except ValidationError:
+                raise Unsupported(name)
+            if value not in (None, ""):
+                lookups[name] = value
+        return lookups
+
+    async def respond(self):
+        """Respuesta del viewset; `Unsupported` si hay que usar la vista síncrona."""
+        view = self.view
+        lookups = await self.filter_lookups()
+        request = view.initialize_request(self.request, *view.args, **view.kwargs)
+        view.request = request
+        view.headers = view.default_response_headers
+        try:
+            # Autenticación, permisos y throttling de DRF son síncronos (sesión, caché).
+            await sync_to_async(view.initial)(request, *view.args, **view.kwargs)
+            response = await self.list(request, lookups)
+        except Exception as exc:
+            response = view.handle_exception(exc)
+        return view.finalize_response(request, response, *view.args, **view.kwargs)
+
+    async def list(self, request, lookups):
+        view = self.view
+        dependencies = getattr(view, "cache_dependencies", ())
+        view._generations = await cache.aget_generations(dependencies) if dependencies else []
+
+        if isinstance(view, ConditionalRequestMixin) and view.conditional_enabled():
+            stats = await view.queryset.filter(**lookups).order_by().aaggregate(
+                last=models.Max(view.etag_field), count=models.Count("pk")
+            )
+            count = stats["count"]
+            etag = view._etag("list", stats["last"], count)
+            not_modified = view._check_preconditions(lambda: (etag, None))
+            if not_modified is not None:
+                return not_modified
+        else:
+            count = await view.get_queryset().filter(**lookups).acount()
+
+        if not self.cached():
+            return await self.page(request, lookups, count)
+        namespace = view.get_cache_namespace()
+        key = cache.response_cache_key(f"{namespace}:{view.action}", request, view._generations)
+        data = await cache.response_cache().aget(key)
+        if data is not None:
+            await cache.arecord("hits", namespace)
+            return Response(data, headers={"X-Cache": "HIT"})
+
+        await cache.arecord("misses", namespace)
+        response = await self.page(request, lookups, count)
+        if response.status_code == 200:
+            await cache.response_cache().aset(key, response.data, settings.RESPONSE_CACHE_TIMEOUT)
+        response["X-Cache"] = "MISS"
+        return response
+
+    def cached(self):
+        view = self.view
+        return (
+            isinstance(view, CachedResponseMixin) and bool(view.cache_dependencies)
+            and settings.RESPONSE_CACHE_TIMEOUT > 0
+        )
+
+    async def page(self, request, lookups, count):
+        view = self.view
+        queryset = view.get_queryset().filter(**lookups)
+        pagination = view.paginator
+        pagination.keyset = None
+        pagination.request = request
+        page_size = pagination.get_page_size(request)
+        paginator = PrecountedPaginator(queryset, page_size, count=count)
+        page_number = request.query_params.get(pagination.page_query_param) or 1
+        try:
+            number = paginator.validate_number(page_number)
+        except InvalidPage as exc:
+            raise NotFound(pagination.invalid_page_message.format(page_number=page_number, message=str(exc)))
+
+        bottom = (number - 1) * page_size
+        plan = view.get_values_plan(queryset) if isinstance(view, ValuesListMixin) else None
+        if plan is not None:
+            queryset = view.values_queryset(queryset, plan)
+        # `chunk_size` es lo que permite usar prefetch_related con aiterator().
+        rows = [row async for row in queryset[bottom : bottom + page_size].aiterator(chunk_size=page_size)]
+        pagination.page = paginator._get_page(rows, number, paginator)
+        data = await sync_to_async(self.serialize, thread_sensitive=False)(rows, plan)
+        return pagination.get_paginated_response(data)
+
+    def serialize(self, rows, plan=None):
+        if plan is not None:
+            return plan.represent_many(rows)
+        return self.view.get_serializer(rows, many=True).data
+
+
+def async_list_view(fallback):
+    """Vista `async def` para el listado de `fallback` (la vista del router)."""
+    sync_fallback = sync_to_async(fallback)
+
+    async def view(request, *args, **kwargs):
+        reader = AsyncListReader(fallback, request, args, kwargs)
+        if reader.supports():
+            try:
+                return await reader.respond()
+            except Unsupported:
+                pass
+        return await sync_fallback(request, *args, **kwargs)
+
+    # Lo que leen las métricas por endpoint, el esquema OpenAPI y el middleware CSRF.
+    view.cls, view.initkwargs, view.actions = fallback.cls, fallback.initkwargs, fallback.actions
+    view.csrf_exempt = True
+    return view
+
+
+def async_list_routes(patterns, names):
+    """Copia de `patterns` con las rutas llamadas `names` servidas por `async_list_view()`."""
+    return [
+        URLPattern(pattern.pattern, async_list_view(pattern.callback), pattern.default_args, pattern.name)
+        if isinstance(pattern, URLPattern) and pattern.name in names
+        else pattern
+        for pattern in patterns
+    ]
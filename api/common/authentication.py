@@ -0,0 +1,197 @@
+"""
+Autenticación con API key para clientes de servicio.
+
+Los clientes envían `Authorization: Api-Key <prefijo>.<secreto>` (claves de
+`ServiceAPIKey`, creadas en el admin o con `create_api_key`). No usan
+sesión, cookies ni CSRF.
+
+Verificar una clave cuesta una consulta y un hash; las ya verificadas se
+guardan en memoria del proceso, indexadas por un SHA-256 de la clave,
+durante `API_KEY_CACHE_TTL` segundos. Al revocar, vencer o borrar una
+clave (con `save()` o `delete()`, como hace el admin) cambia su generación
+en `CacheGeneration` (ver `common.cache`), que cada petición compara con
+una consulta por clave primaria: está en la base, así que todos los
+procesos descartan lo verificado aunque la caché sea local, y la clave
+revocada deja de valer en la petición siguiente. Un `update()` masivo no
+emite señales y debe llamar a `invalidate_verified_keys()`.
+
+El uso de cada clave (`request_count`, `last_used_at`) se acumula en
+memoria y se escribe con un `UPDATE` por clave cada
+`API_KEY_USAGE_FLUSH_SECONDS` segundos o `API_KEY_USAGE_FLUSH_REQUESTS`
+peticiones, y al terminar el proceso si `API_KEY_USAGE_FLUSH_AT_EXIT` está
+activo (ver `CommonConfig.ready()`).
+"""
+
+import hashlib
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.db import DatabaseError, transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+from rest_framework.authentication import BaseAuthentication
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_api_key.permissions import KeyParser
+
+from .cache import bump_generation, get_generations
+from .models import ServiceAPIKey
+
+
+class VerifiedKey:
+    """Lo que la petición necesita de una `ServiceAPIKey` ya verificada (`request.auth`)."""
+
+    def __init__(self, api_key):
+        self.id = api_key.pk
+        self.prefix = api_key.prefix
+        self.name = api_key.name
+        self.rate = api_key.throttle_rate or None
+        self.expiry_date = api_key.expiry_date
+
+    def has_expired(self):
+        return self.expiry_date is not None and self.expiry_date < timezone.now()
+
+
+class ServiceClient:
+    """`request.user` de una petición autenticada con API key: no es un usuario de Django."""
+
+    is_authenticated = True
+    is_anonymous = False
+    is_active = True
+    is_staff = False
+    is_superuser = False
+
+    def __init__(self, key):
+        self.key = key
+        # Identifica al cliente en los throttles por usuario.
+        self.pk = self.id = f"api-key:{key.prefix}"
+        self.username = key.name
+
+    def __str__(self):
+        return f"API key {self.key.name}"
+
+    def has_perm(self, perm, obj=None):
+        return False
+
+    def has_perms(self, perm_list, obj=None):
+        return False
+
+
+class KeyCache:
+    """Claves verificadas en este proceso: SHA-256 de la clave -> (VerifiedKey, vence, generación)."""
+
+    def __init__(self):
+        self._entries = {}
+
+    def get(self, raw_key):
+        digest = hashlib.sha256(raw_key.encode()).hexdigest()
+        (generation,) = get_generations([ServiceAPIKey])
+        entry = self._entries.get(digest)
+        if entry is not None:
+            key, expires, entry_generation = entry
+            if expires > time.monotonic() and entry_generation == generation and not key.has_expired():
+                return key
+            self._entries.pop(digest, None)
+
+        try:
+            api_key = ServiceAPIKey.objects.get_from_key(raw_key)
+        except ServiceAPIKey.DoesNotExist:
+            return None
+        if api_key.has_expired:
+            return None
+        key = VerifiedKey(api_key)
+        self._entries[digest] = (key, time.monotonic() + settings.API_KEY_CACHE_TTL, generation)
+        return key
+
+    def clear(self):
+        self._entries.clear()
+
+
+class UsageCounter:
+    """Peticiones por clave pendientes de escribir en la base de datos."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = Counter()
+        self._last_used = {}
+        self._pending = 0
+        self._flushed_at = time.monotonic()
+
+    def record(self, key_id):
+        with self._lock:
+            self._counts[key_id] += 1
+            self._last_used[key_id] = timezone.now()
+            self._pending += 1
+            due = (
+                self._pending >= settings.API_KEY_USAGE_FLUSH_REQUESTS
+                or time.monotonic() - self._flushed_at >= settings.API_KEY_USAGE_FLUSH_SECONDS
+            )
+        if due:
+            self.flush()
+
+    def reset(self):
+        """Descarta lo pendiente sin escribirlo."""
+        with self._lock:
+            self._counts, self._last_used, self._pending = Counter(), {}, 0
+
+    def flush(self):
+        with self._lock:
+            counts, last_used = self._counts, self._last_used
+            self._counts, self._last_used, self._pending = Counter(), {}, 0
+            self._flushed_at = time.monotonic()
+        for key_id, count in counts.items():
+            ServiceAPIKey.objects.filter(pk=key_id).update(
+                request_count=F("request_count") + count, last_used_at=last_used[key_id]
+            )
+
+
+verified_keys = KeyCache()
+usage = UsageCounter()
+
+
+def flush_usage_at_exit():
+    try:
+        usage.flush()
+    except DatabaseError:
+        pass
+
+
+class APIKeyAuthentication(BaseAuthentication):
+    """
+    Va antes que la sesión: sin cabecera `Api-Key` no hace nada y sigue la
+    siguiente clase. No define `authenticate_header`, así que las peticiones
+    sin credenciales siguen respondiendo 403 como con la sesión.
+    """
+
+    key_parser = KeyParser()
+
+    def authenticate(self, request):
+        raw_key = self.key_parser.get(request)
+        if not raw_key:
+            return None
+        key = verified_keys.get(raw_key)
+        if key is None:
+            raise AuthenticationFailed("API key inválida, revocada o vencida.")
+        usage.record(key.id)
+        return ServiceClient(key), key
+
+
+def invalidate_verified_keys():
+    """Descarta las claves verificadas en todos los procesos."""
+    verified_keys.clear()
+    bump_generation(ServiceAPIKey)
+
+
+@receiver(post_save, sender=ServiceAPIKey, dispatch_uid="api_keys_saved")
+def _api_key_saved(sender, instance, created, **kwargs):
+    # Los contadores de uso se escriben con `update()` y no pasan por aquí.
+    if not created:
+        transaction.on_commit(invalidate_verified_keys)
+
+
+@receiver(post_delete, sender=ServiceAPIKey, dispatch_uid="api_keys_deleted")
+def _api_key_deleted(sender, instance, **kwargs):
+    transaction.on_commit(invalidate_verified_keys)
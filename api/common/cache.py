@@ -0,0 +1,119 @@
+"""
+Caché de respuestas con invalidación por generaciones.
+
+Cada modelo registrado con `track_generations()` tiene una generación que
+cambia en `post_save`/`post_delete`. Las claves de caché incluyen las
+generaciones de los modelos de los que depende la vista, así que una
+escritura deja obsoletas las entradas anteriores sin tener que borrarlas;
+expiran solas con `RESPONSE_CACHE_TIMEOUT`.
+"""
+
+import hashlib
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models.signals import post_delete, post_save
+
+from .models import CacheGeneration
+
+METRICS = ("hits", "misses")
+
+# Vistas que ya usaron la caché en este proceso, para reportar sus métricas.
+_cached_views = set()
+
+
+def response_cache():
+    return caches[settings.RESPONSE_CACHE_ALIAS]
+
+
+def generation_name(model):
+    return model._meta.label_lower
+
+
+def bump_generation(*models):
+    """Invalida las respuestas que dependen de `models`."""
+    CacheGeneration.objects.bulk_create(
+        [CacheGeneration(name=generation_name(model), value=uuid4().hex) for model in models],
+        update_conflicts=True,
+        unique_fields=["name"],
+        update_fields=["value"],
+    )
+
+
+def get_generations(models):
+    """Generación actual de cada modelo, en el orden recibido, con una sola consulta."""
+    names = [generation_name(model) for model in models]
+    values = dict(CacheGeneration.objects.filter(name__in=names).values_list("name", "value"))
+    return [values.get(name, "0") for name in names]
+
+
+async def aget_generations(models):
+    """Igual que `get_generations()`, con el ORM asíncrono."""
+    names = [generation_name(model) for model in models]
+    rows = CacheGeneration.objects.filter(name__in=names).values_list("name", "value")
+    values = {name: value async for name, value in rows}
+    return [values.get(name, "0") for name in names]
+
+
+def _bump_on_write(sender, raw=False, **kwargs):
+    if not raw:
+        bump_generation(sender)
+
+
+def track_generations(*models):
+    """Conecta las señales que versionan `models`; llamar desde `AppConfig.ready()`."""
+    for model in models:
+        uid = f"cache-generation:{generation_name(model)}"
+        post_save.connect(_bump_on_write, sender=model, dispatch_uid=uid)
+        post_delete.connect(_bump_on_write, sender=model, dispatch_uid=uid)
+
+
+def response_cache_key(namespace, request, generations):
+    """
+    Clave según el esquema y el host, la ruta, los parámetros (ordenados), el
+    formato y las generaciones. Las respuestas paginadas llevan enlaces
+    absolutos (`next`, `previous`): no se comparten entre hosts.
+    """
+    params = sorted((key, value) for key in request.query_params for value in request.query_params.getlist(key))
+    fmt = getattr(request.accepted_renderer, "format", "")
+    origin = (request.scheme, request.get_host())
+    digest = hashlib.sha1(repr((origin, request.path, params, fmt)).encode()).hexdigest()
+    return f"response:{namespace}:{digest}:{'.'.join(generations)}"
+
+
+def _metric_key(metric, namespace):
+    return f"response-metrics:{metric}:{namespace}"
+
+
+def record(metric, namespace):
+    _cached_views.add(namespace)
+    cache, key = response_cache(), _metric_key(metric, namespace)
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
+
+
+async def arecord(metric, namespace):
+    _cached_views.add(namespace)
+    cache, key = response_cache(), _metric_key(metric, namespace)
+    try:
+        await cache.aincr(key)
+    except ValueError:
+        if not await cache.aadd(key, 1, timeout=None):
+            await cache.aincr(key)
+
+
+def metrics():
+    """Aciertos y fallos por vista desde el arranque (o desde que se vació la caché)."""
+    keys = {(metric, namespace): _metric_key(metric, namespace) for namespace in _cached_views for metric in METRICS}
+    values = response_cache().get_many(keys.values())
+    result = {}
+    for (metric, namespace), key in sorted(keys.items(), key=lambda item: item[0][::-1]):
+        result.setdefault(namespace, {})[metric] = values.get(key, 0)
+    for counters in result.values():
+        total = counters["hits"] + counters["misses"]
+        counters["hit_ratio"] = round(counters["hits"] / total, 3) if total else None
+    return result
@@ -0,0 +1,22 @@
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from common.models import ServiceAPIKey
+
+
+class Command(BaseCommand):
+    help = "Crea una API key de servicio y la muestra (solo esta vez)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("name", help="Nombre del cliente (p. ej. lms-moodle).")
+        parser.add_argument("--rate", default="", help="Límite propio de la clave, p. ej. 600/min.")
+
+    def handle(self, *args, name, rate, **options):
+        api_key = ServiceAPIKey(name=name, throttle_rate=rate)
+        try:
+            api_key.full_clean(exclude=["id", "prefix", "hashed_key"])
+        except ValidationError as exc:
+            raise CommandError(exc)
+        _, key = ServiceAPIKey.objects.create_key(name=name, throttle_rate=rate)
+        self.stdout.write(self.style.SUCCESS(f"API key de {name}: {key}"))
+        self.stdout.write("Guárdala ahora: no se puede volver a mostrar.")
@@ -0,0 +1,34 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from common import sessions
+
+
+class Command(BaseCommand):
+    help = "Borra por tramos las sesiones vencidas de la base de datos."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.SESSION_PRUNE_BATCH_SIZE,
+            help="Sesiones borradas por transacción.",
+        )
+        parser.add_argument("--pause", type=float, default=0, help="Segundos de espera entre tramos.")
+        parser.add_argument(
+            "--every",
+            type=int,
+            default=0,
+            help="Repite la limpieza cada tantos segundos, sin terminar.",
+        )
+
+    def handle(self, *args, batch_size, pause, every, **options):
+        while True:
+            start = time.perf_counter()
+            deleted = sessions.prune_expired(batch_size, pause=pause)
+            self.stdout.write(f"{deleted} sesiones vencidas borradas en {time.perf_counter() - start:.1f}s.")
+            if not every:
+                return
+            time.sleep(every)
@@ -0,0 +1,29 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from common import sync
+
+
+class Command(BaseCommand):
+    help = "Borra por tramos las bajas de más de TOMBSTONE_RETENTION_DAYS días."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=5000, help="Bajas borradas por transacción.")
+        parser.add_argument(
+            "--every",
+            type=int,
+            default=0,
+            help="Repite la limpieza cada tantos segundos, sin terminar.",
+        )
+
+    def handle(self, *args, batch_size, every, **options):
+        while True:
+            deleted = sync.prune(batch_size)
+            self.stdout.write(
+                self.style.SUCCESS(f"{deleted} bajas borradas (retención: {settings.TOMBSTONE_RETENTION_DAYS} días).")
+            )
+            if not every:
+                return
+            time.sleep(every)
@@ -0,0 +1,42 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from benchmarks import dataset
+
+
+class Command(BaseCommand):
+    help = "Genera el conjunto de datos reproducible de los benchmarks (inserciones en bloque)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--topics", type=int, default=500)
+        parser.add_argument("--blocks", type=int, default=10, help="Bloques por tema.")
+        parser.add_argument("--tasks", type=int, default=10, help="Tareas por bloque.")
+        parser.add_argument("--students", type=int, default=50000)
+        parser.add_argument("--progress", type=int, default=20, help="Tareas con progreso por estudiante.")
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            help="Borra antes los datos de una generación anterior.",
+        )
+
+    def handle(self, *args, reset, **options):
+        if reset:
+            dataset.reset()
+        elif dataset.exists():
+            raise CommandError("Ya hay datos de benchmark; usa --reset para regenerarlos.")
+        start = time.perf_counter()
+        counts = dataset.generate(
+            topics=options["topics"],
+            blocks=options["blocks"],
+            tasks=options["tasks"],
+            students=options["students"],
+            progress=options["progress"],
+            seed=options["seed"],
+            batch_size=options["batch_size"],
+            log=self.stdout.write,
+        )
+        summary = ", ".join(f"{name}: {value}" for name, value in counts.items())
+        self.stdout.write(self.style.SUCCESS(f"Datos generados en {time.perf_counter() - start:.1f}s ({summary})."))
@@ -0,0 +1,55 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from .routers import choose_replica, replica_reads
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Elige una réplica de lectura para cada petición segura de clientes que
+    no escribieron hace poco, y marca con una cookie a los que escriben
+    (ver `common.routers`). Sin `DATABASE_REPLICAS` no hace nada.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def replica_for(self, request):
+        """La réplica de toda la petición, o None si debe leer de `default`."""
+        if request.method in SAFE_METHODS and settings.REPLICA_STICKY_COOKIE not in request.COOKIES:
+            return choose_replica()
+        return None
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not settings.DATABASE_REPLICAS:
+            return self.get_response(request)
+        with replica_reads(self.replica_for(request)):
+            response = self.get_response(request)
+        return self.stick_to_primary(request, response)
+
+    async def __acall__(self, request):
+        if not settings.DATABASE_REPLICAS:
+            return await self.get_response(request)
+        with replica_reads(self.replica_for(request)):
+            response = await self.get_response(request)
+        return self.stick_to_primary(request, response)
+
+    def stick_to_primary(self, request, response):
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            response.set_cookie(
+                settings.REPLICA_STICKY_COOKIE,
+                "1",
+                max_age=settings.REPLICA_STICKY_SECONDS,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
@@ -0,0 +1,25 @@
+# Generated by Django 6.0.1 on 2026-10-18 20:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CacheGeneration',
+            fields=[
+                ('name', models.CharField(max_length=100, primary_key=True, serialize=False)),
+                ('value', models.CharField(max_length=32)),
+            ],
+            options={
+                'verbose_name': 'Generación de caché',
+                'verbose_name_plural': 'Generaciones de caché',
+            },
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 6.0.1 on 2026-10-18 21:15
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ServiceAPIKey',
+            fields=[
+                ('id', models.CharField(editable=False, max_length=150, primary_key=True, serialize=False, unique=True)),
+                ('prefix', models.CharField(editable=False, max_length=8, unique=True)),
+                ('hashed_key', models.CharField(editable=False, max_length=150)),
+                ('created', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('name', models.CharField(default=None, help_text='A free-form name for the API key. Need not be unique. 50 characters max.', max_length=50)),
+                ('revoked', models.BooleanField(blank=True, default=False, help_text='If the API key is revoked, clients cannot use it anymore. (This cannot be undone.)')),
+                ('expiry_date', models.DateTimeField(blank=True, help_text='Once API key expires, clients cannot use it anymore.', null=True, verbose_name='Expires')),
+                ('throttle_rate', models.CharField(blank=True, help_text='Límite propio de la clave (p. ej. 600/min); vacío usa el alcance api-key.', max_length=20, validators=[django.core.validators.RegexValidator('^\\d+/[smhd]', 'Formato <número>/<sec|min|hour|day>.')])),
+                ('request_count', models.PositiveBigIntegerField(default=0, editable=False)),
+                ('last_used_at', models.DateTimeField(blank=True, editable=False, null=True)),
+            ],
+            options={
+                'verbose_name': 'API key de servicio',
+                'verbose_name_plural': 'API keys de servicio',
+                'ordering': ('-created',),
+                'abstract': False,
+            },
+        ),
+    ]
@@ -0,0 +1,71 @@
+from django.core.validators import RegexValidator
+from django.db import models
+from rest_framework_api_key.models import AbstractAPIKey
+
+
+class CacheGeneration(models.Model):
+    """
+    Versión de un modelo para invalidar la caché de respuestas.
+
+    Vive en la base de datos para que el cambio se confirme o se revierta
+    junto con la escritura que lo provoca y sea visible en todos los procesos.
+    Es un valor aleatorio y no un contador: tras un rollback no puede volver a
+    generarse una versión ya usada por otra transacción.
+    """
+
+    name = models.CharField(max_length=100, primary_key=True)
+    value = models.CharField(max_length=32)
+
+    class Meta:
+        verbose_name = "Generación de caché"
+        verbose_name_plural = "Generaciones de caché"
+
+    def __str__(self) -> str:
+        return f"{self.name}={self.value}"
+
+
+class ServiceAPIKey(AbstractAPIKey):
+    """
+    API key de un cliente de servicio (integraciones con el LMS).
+
+    La clave se muestra una sola vez al crearla; se guarda su hash. Los
+    contadores de uso se acumulan en memoria y se escriben por lotes (ver
+    `common.authentication`), así que pueden ir unos segundos atrasados.
+    """
+
+    throttle_rate = models.CharField(
+        max_length=20,
+        blank=True,
+        validators=[RegexValidator(r"^\d+/[smhd]", "Formato <número>/<sec|min|hour|day>.")],
+        help_text="Límite propio de la clave (p. ej. 600/min); vacío usa el alcance api-key.",
+    )
+    request_count = models.PositiveBigIntegerField(default=0, editable=False)
+    last_used_at = models.DateTimeField(blank=True, null=True, editable=False)
+
+    class Meta(AbstractAPIKey.Meta):
+        verbose_name = "API key de servicio"
+        verbose_name_plural = "API keys de servicio"
+
+
+class Tombstone(models.Model):
+    """
+    Baja de una fila de un modelo sincronizable (ver `common.sync`).
+
+    La escriben triggers de la base en la misma transacción que el borrado;
+    `model` es la etiqueta del modelo (`tasks.blocktask`).
+    """
+
+    model = models.CharField(max_length=100)
+    object_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField()
+
+    class Meta:
+        verbose_name = "Baja"
+        verbose_name_plural = "Bajas"
+        indexes = [
+            models.Index(fields=["model", "deleted_at"], name="tombstone_model_deleted_idx"),
+            models.Index(fields=["deleted_at"], name="tombstone_deleted_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.model}#{self.object_id}"
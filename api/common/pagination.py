@@ -0,0 +1,250 @@
+import base64
+import binascii
+import json
+from functools import partial
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def estimate_count(queryset):
+    """Filas estimadas por el planner de Postgres; None si no hay estimación."""
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Usa la estimación del planner cuando la tabla es grande.
+
+    Por debajo de `PAGINATION_ESTIMATE_THRESHOLD` filas estimadas se hace el
+    COUNT(*) exacto, que en ese rango es barato.
+    """
+
+    @cached_property
+    def count(self):
+        estimate = estimate_count(self.object_list)
+        if estimate is None or estimate < settings.PAGINATION_ESTIMATE_THRESHOLD:
+            return super().count
+        return estimate
+
+
+class PrecountedPaginator(Paginator):
+    """Paginator con el total ya calculado por la vista (p. ej. junto con su ETag)."""
+
+    def __init__(self, object_list, per_page, *args, count, **kwargs):
+        super().__init__(object_list, per_page, *args, **kwargs)
+        self.__dict__["count"] = count
+
+
+class UncountedPaginator(Paginator):
+    """Paginator sin COUNT(*): pide una fila extra para saber si hay otra página."""
+
+    _num_pages = None
+
+    @property
+    def count(self):
+        return None
+
+    @property
+    def num_pages(self):
+        return self._num_pages
+
+    def validate_number(self, number):
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger(self.error_messages["invalid_page"])
+        if number < 1:
+            raise EmptyPage(self.error_messages["min_page"])
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom : bottom + self.per_page + 1])
+        if not rows and number > 1:
+            raise EmptyPage(self.error_messages["no_results"])
+        self._num_pages = number + 1 if len(rows) > self.per_page else number
+        return self._get_page(rows[: self.per_page], number, self)
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginación por cursor sobre una clave compuesta única (keyset).
+
+    La vista declara `keyset_fields`, p. ej. `("student", "task")`, que debe
+    coincidir con un índice único; cada página filtra `clave > cursor` y
+    ordena por esa clave, así que la página N cuesta lo mismo que la primera.
+    """
+
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Cursor inválido."
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = api_settings.PAGE_SIZE
+        self.request = request
+        opts = queryset.model._meta
+        self.fields = [opts.get_field(name) for name in view.keyset_fields]
+
+        position, reverse = self.decode_cursor(request)
+        # Se ordena por la columna (`block_id`) y no por la relación, que
+        # arrastraría el Meta.ordering del modelo relacionado.
+        ordering = [f"-{f.attname}" if reverse else f.attname for f in self.fields]
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(self._after(position, reverse))
+
+        rows = list(queryset[: self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+        if reverse:
+            rows.reverse()
+
+        self.has_next = (has_more if not reverse else True) and bool(rows)
+        self.has_previous = (has_more if reverse else position is not None) and bool(rows)
+        self.first_key = self.get_key(rows[0]) if rows else None
+        self.last_key = self.get_key(rows[-1]) if rows else None
+        return rows
+
+    def _after(self, position, reverse):
+        """`(f1, f2, ...) > (v1, v2, ...)` expresado con Q (o `<` en reversa)."""
+        lookup = "lt" if reverse else "gt"
+        first = self.fields[0]
+        condition = Q()
+        for index, field in enumerate(self.fields):
+            equal = {f.attname: position[i] for i, f in enumerate(self.fields[:index])}
+            condition |= Q(**equal, **{f"{field.attname}__{lookup}": position[index]})
+        # El rango sobre la primera columna ayuda al planner a usar el índice.
+        return Q(**{f"{first.attname}__{lookup}e": position[0]}) & condition
+
+    def get_key(self, row):
+        if isinstance(row, dict):
+            return [row.get(f.attname, row.get(f.name)) for f in self.fields]
+        return [getattr(row, f.attname) for f in self.fields]
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            data = json.loads(base64.urlsafe_b64decode(encoded.encode("ascii")))
+            position, reverse = data["k"], bool(data.get("r"))
+        except (binascii.Error, UnicodeError, ValueError, TypeError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list) or len(position) != len(self.fields):
+            raise NotFound(self.invalid_cursor_message)
+        # Los valores llegan del cliente: se validan aquí y no al filtrar (sería un 500).
+        try:
+            position = [field.to_python(value) for field, value in zip(self.fields, position)]
+        except (ValidationError, ValueError, TypeError):
+            raise NotFound(self.invalid_cursor_message)
+        if None in position:
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def encode_cursor(self, key, reverse):
+        data = json.dumps({"k": key, "r": int(reverse)}, separators=(",", ":"))
+        encoded = base64.urlsafe_b64encode(data.encode("utf-8")).decode("ascii")
+        url = remove_query_param(self.request.build_absolute_uri(), "page")
+        return replace_query_param(url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        return self.encode_cursor(self.last_key, False) if self.has_next else None
+
+    def get_previous_link(self):
+        return self.encode_cursor(self.first_key, True) if self.has_previous else None
+
+    def get_paginated_response(self, data):
+        return Response({
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+
+class StandardPagination(PageNumberPagination):
+    """
+    Paginación por defecto de la API.
+
+    Por número de página, con el conteo configurable mediante
+    `PAGINATION_COUNT_MODE` (`exact`, `estimate` o `none`). Las vistas que
+    declaran `keyset_fields` aceptan además paginación por cursor, elegida
+    con `pagination_mode = "cursor"` en la vista o con `?pagination=cursor`
+    (o simplemente enviando `?cursor=`).
+    """
+
+    mode_query_param = "pagination"
+    paginator_classes = {
+        "exact": Paginator,
+        "estimate": EstimatedCountPaginator,
+        "none": UncountedPaginator,
+    }
+
+    def get_mode(self, request, view):
+        if not getattr(view, "keyset_fields", None):
+            return "page"
+        if KeysetPagination.cursor_query_param in request.query_params:
+            return "cursor"
+        mode = request.query_params.get(self.mode_query_param)
+        if mode in ("page", "cursor"):
+            return mode
+        return getattr(view, "pagination_mode", "page")
+
+    def get_count_mode(self, request, view):
+        """Modo de conteo de la petición; None si se pagina por cursor."""
+        if self.get_mode(request, view) == "cursor":
+            return None
+        return getattr(view, "pagination_count_mode", settings.PAGINATION_COUNT_MODE)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        count_mode = self.get_count_mode(request, view)
+        if count_mode is None:
+            self.keyset = KeysetPagination()
+            return self.keyset.paginate_queryset(queryset, request, view)
+
+        known_count = getattr(view, "known_count", None)
+        if count_mode == "exact" and known_count is not None:
+            self.django_paginator_class = partial(PrecountedPaginator, count=known_count)
+        else:
+            self.django_paginator_class = self.paginator_classes.get(count_mode, Paginator)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema["properties"]["count"]["nullable"] = True
+        return response_schema
@@ -0,0 +1,33 @@
+import json
+
+from rest_framework.parsers import BaseParser
+
+
+class NDJSONParser(BaseParser):
+    """
+    Parser de JSON delimitado por líneas (`application/x-ndjson`).
+
+    Devuelve un generador que lee el cuerpo línea a línea, de modo que la
+    vista puede procesar el stream por lotes sin cargarlo completo. Las
+    líneas que no son JSON válido se entregan como `None` para que quien
+    consume las reporte como error de esa fila.
+    """
+
+    media_type = "application/x-ndjson"
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", "utf-8")
+        return self._iter_rows(stream, encoding)
+
+    def _iter_rows(self, stream, encoding):
+        if stream is None:
+            return
+        for line in stream:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line.decode(encoding))
+            except (UnicodeDecodeError, ValueError):
+                yield None
@@ -0,0 +1,37 @@
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # orjson es opcional.
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    `JSONRenderer` que codifica con orjson cuando está instalado.
+
+    Produce los mismos bytes que el renderer de DRF con la configuración por
+    defecto (compacto, UTF-8, `\\u2028`/`\\u2029` escapados): las fechas,
+    decimales y demás tipos que no son de JSON pasan por el `JSONEncoder` de
+    DRF. Con indentación, `ensure_ascii`, JSON no estricto o cualquier valor
+    que orjson rechace (claves no `str`, enteros de más de 64 bits), se usa
+    el renderer de DRF. Las diferencias conocidas son el exponente de los
+    floats muy chicos (`1e-07` frente a `1e-7`) y NaN/infinito, que orjson
+    escribe como `null` en vez de fallar; la API no devuelve ninguno.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None or not (self.compact and self.strict) or self.ensure_ascii:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(
+                data,
+                default=self.encoder_class().default,
+                option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS,
+            )
+        except TypeError:
+            # JSONEncodeError (que es un TypeError): lo decide el encoder de DRF.
+            return super().render(data, accepted_media_type, renderer_context)
+        return ret.replace("\u2028".encode(), b"\\u2028").replace("\u2029".encode(), b"\\u2029")
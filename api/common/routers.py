@@ -0,0 +1,63 @@
+"""
+Enrutamiento de lecturas a las réplicas de `DATABASE_REPLICAS`.
+
+`ReplicaRoutingMiddleware` elige una réplica al azar para cada petición de
+lectura (GET, HEAD, OPTIONS) y `ReplicaRouter` manda a ella todas sus
+consultas de lectura: las páginas y totales de una misma respuesta salen de
+la misma réplica aunque tengan retrasos distintos. Las escrituras, las
+generaciones de la caché (`CacheGeneration`, que deben reflejar la última
+escritura) y todo lo que ocurre fuera de esas peticiones (comandos, tareas
+en segundo plano, pruebas) usan `default`. Tras una
+escritura el cliente recibe la cookie `REPLICA_STICKY_COOKIE` y durante
+`REPLICA_STICKY_SECONDS` sus lecturas también van a `default`, para que
+vea lo que acaba de escribir aunque las réplicas tengan retraso.
+"""
+
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+_replica = ContextVar("replica", default=None)
+
+# Modelos que siempre se leen de `default`.
+PRIMARY_MODELS = {"common.cachegeneration"}
+
+
+def choose_replica():
+    """Una réplica al azar, o None si no hay."""
+    return random.choice(settings.DATABASE_REPLICAS) if settings.DATABASE_REPLICAS else None
+
+
+@contextmanager
+def replica_reads(alias):
+    """Dentro del bloque, las lecturas usan la réplica `alias` (None: `default`)."""
+    token = _replica.set(alias)
+    try:
+        yield
+    finally:
+        _replica.reset(token)
+
+
+def replica_alias():
+    """Réplica de las lecturas en curso, o None si corresponde `default`."""
+    return _replica.get()
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if model._meta.label_lower in PRIMARY_MODELS:
+            return None
+        return replica_alias()
+
+    def db_for_write(self, model, **hints):
+        # Sin esto, un objeto leído de una réplica se guardaría en ella.
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Las réplicas tienen los mismos datos que `default`.
+        databases = {"default", *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
@@ -0,0 +1,262 @@
+"""
+Búsqueda de texto completo para `?search=`.
+
+Cada `SearchIndex` describe las columnas indexadas de una tabla (con su peso)
+y las columnas de tablas relacionadas que también se buscan, como el título
+del bloque en las tareas. El índice lo mantienen triggers de la base de
+datos, así que se actualiza con cualquier escritura (ORM, `bulk_create`,
+`update()` o SQL). El backend depende del motor:
+
+- Postgres: columna `search_vector tsvector` con índice GIN, ranking con
+  `ts_rank`. La configuración `taskmaster_unaccent` es `simple` con
+  `unaccent` delante (extensión `unaccent`).
+- SQLite: tabla virtual FTS5 `<tabla>_fts`, ranking con `bm25`, con
+  `remove_diacritics`.
+
+En los dos motores "geometria" encuentra "Geometría".
+
+Los términos se buscan como prefijos y todos deben aparecer (AND). Las
+vistas sin `search_index`, o un motor sin backend, siguen usando el
+`icontains` de `SearchFilter`.
+"""
+
+import re
+
+from django.db import connections
+from django.db.models import FloatField
+from django.db.models.expressions import RawSQL
+from rest_framework.filters import SearchFilter
+
+WORD_RE = re.compile(r"\w+")
+
+# Peso relativo de cada categoría en el ranking de FTS5 (Postgres usa los suyos).
+BM25_WEIGHTS = {"A": 10.0, "B": 4.0, "C": 2.0, "D": 1.0}
+
+
+class Related:
+    """Columna de otra tabla, unida por `fk`, que se indexa junto con la fila."""
+
+    def __init__(self, name, table, fk, column, weight):
+        self.name, self.table, self.fk, self.column, self.weight = name, table, fk, column, weight
+
+
+class SearchIndex:
+    def __init__(self, table, columns, related=()):
+        self.table = table
+        self.columns = dict(columns)
+        self.related = tuple(related)
+
+    @property
+    def weights(self):
+        return [*self.columns.values(), *(rel.weight for rel in self.related)]
+
+
+def search_words(terms):
+    """Palabras de los términos, sin signos que el motor interpretaría como sintaxis."""
+    return [word for term in terms for word in WORD_RE.findall(term)]
+
+
+class PostgresSearchBackend:
+    config = "taskmaster_unaccent"
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def setup_sql(self):
+        """La configuración de texto de los índices; la comparten todas las tablas."""
+        return [
+            "CREATE EXTENSION IF NOT EXISTS unaccent",
+            f"DO $$ BEGIN IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = '{self.config}') THEN "
+            f"CREATE TEXT SEARCH CONFIGURATION {self.config} (COPY = simple); "
+            f"ALTER TEXT SEARCH CONFIGURATION {self.config} ALTER MAPPING FOR hword, hword_part, word "
+            f"WITH unaccent, simple; END IF; END $$",
+        ]
+
+    def _document(self, index, row):
+        qn = self.connection.ops.quote_name
+        parts = [
+            f"setweight(to_tsvector('{self.config}', coalesce({row}.{qn(column)}, '')), '{weight}')"
+            for column, weight in index.columns.items()
+        ]
+        parts += [
+            f"setweight(to_tsvector('{self.config}', coalesce((SELECT {qn(rel.column)} FROM {qn(rel.table)} "
+            f"WHERE id = {row}.{qn(rel.fk)}), '')), '{rel.weight}')"
+            for rel in index.related
+        ]
+        return " || ".join(parts)
+
+    def install_sql(self, index):
+        qn = self.connection.ops.quote_name
+        table, function = qn(index.table), qn(f"{index.table}_search_update")
+        statements = [
+            f"ALTER TABLE {table} ADD COLUMN search_vector tsvector",
+            f"CREATE INDEX {qn(index.table + '_search_gin')} ON {table} USING gin (search_vector)",
+            f"CREATE FUNCTION {function}() RETURNS trigger AS $$ BEGIN "
+            f"NEW.search_vector := {self._document(index, 'NEW')}; RETURN NEW; END $$ LANGUAGE plpgsql",
+            f"CREATE TRIGGER {qn(index.table + '_search')} BEFORE INSERT OR UPDATE ON {table} "
+            f"FOR EACH ROW EXECUTE FUNCTION {function}()",
+        ]
+        for rel in index.related:
+            # Un cambio en la tabla relacionada recalcula las filas que la usan.
+            name = f"{index.table}_search_{rel.name}"
+            statements += [
+                f"CREATE FUNCTION {qn(name)}() RETURNS trigger AS $$ BEGIN "
+                f"UPDATE {table} SET search_vector = NULL WHERE {qn(rel.fk)} = NEW.id; RETURN NULL; END $$ "
+                f"LANGUAGE plpgsql",
+                f"CREATE TRIGGER {qn(name)} AFTER UPDATE OF {qn(rel.column)} ON {qn(rel.table)} "
+                f"FOR EACH ROW WHEN (OLD.{qn(rel.column)} IS DISTINCT FROM NEW.{qn(rel.column)}) "
+                f"EXECUTE FUNCTION {qn(name)}()",
+            ]
+        statements.append(f"UPDATE {table} SET search_vector = NULL")
+        return statements
+
+    def uninstall_sql(self, index):
+        qn = self.connection.ops.quote_name
+        statements = [
+            f"DROP TRIGGER IF EXISTS {qn(f'{index.table}_search_{rel.name}')} ON {qn(rel.table)}"
+            for rel in index.related
+        ]
+        statements += [
+            f"DROP FUNCTION IF EXISTS {qn(f'{index.table}_search_{rel.name}')}()" for rel in index.related
+        ]
+        statements += [
+            f"DROP TRIGGER IF EXISTS {qn(index.table + '_search')} ON {qn(index.table)}",
+            f"DROP FUNCTION IF EXISTS {qn(index.table + '_search_update')}()",
+            f"ALTER TABLE {qn(index.table)} DROP COLUMN IF EXISTS search_vector",
+        ]
+        return statements
+
+    def search(self, queryset, index, words):
+        qn = self.connection.ops.quote_name
+        query = " & ".join(f"{word}:*" for word in words)
+        tsquery = f"to_tsquery('{self.config}', %s)"
+        table = qn(index.table)
+        return queryset.filter(
+            pk__in=RawSQL(f"SELECT id FROM {table} WHERE search_vector @@ {tsquery}", [query])
+        ).annotate(
+            search_rank=RawSQL(f"ts_rank({table}.search_vector, {tsquery})", [query], output_field=FloatField())
+        )
+
+
+class SQLiteSearchBackend:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def setup_sql(self):
+        return []
+
+    def install_sql(self, index):
+        qn = self.connection.ops.quote_name
+        table, fts = qn(index.table), qn(f"{index.table}_fts")
+        names = [*index.columns, *(rel.name for rel in index.related)]
+        columns = ", ".join(qn(name) for name in names)
+        values = [f"NEW.{qn(column)}" for column in index.columns] + [
+            f"(SELECT {qn(rel.column)} FROM {qn(rel.table)} WHERE id = NEW.{qn(rel.fk)})" for rel in index.related
+        ]
+        insert = f"INSERT INTO {fts} (rowid, {columns}) VALUES (NEW.id, {', '.join(values)});"
+        delete = f"DELETE FROM {fts} WHERE rowid = OLD.id;"
+        statements = [
+            f"CREATE VIRTUAL TABLE {fts} USING fts5({columns}, tokenize='unicode61 remove_diacritics 2')",
+            f"CREATE TRIGGER {qn(index.table + '_fts_insert')} AFTER INSERT ON {table} BEGIN {insert} END",
+            f"CREATE TRIGGER {qn(index.table + '_fts_update')} AFTER UPDATE ON {table} BEGIN {delete} {insert} END",
+            f"CREATE TRIGGER {qn(index.table + '_fts_delete')} AFTER DELETE ON {table} BEGIN {delete} END",
+        ]
+        for rel in index.related:
+            statements.append(
+                f"CREATE TRIGGER {qn(f'{index.table}_fts_{rel.name}')} AFTER UPDATE OF {qn(rel.column)} "
+                f"ON {qn(rel.table)} BEGIN UPDATE {fts} SET {qn(rel.name)} = NEW.{qn(rel.column)} "
+                f"WHERE rowid IN (SELECT id FROM {table} WHERE {qn(rel.fk)} = NEW.id); END"
+            )
+        backfill = [qn(column) for column in index.columns] + [
+            f"(SELECT {qn(rel.column)} FROM {qn(rel.table)} WHERE id = {table}.{qn(rel.fk)})"
+            for rel in index.related
+        ]
+        statements.append(f"INSERT INTO {fts} (rowid, {columns}) SELECT id, {', '.join(backfill)} FROM {table}")
+        return statements
+
+    def uninstall_sql(self, index):
+        qn = self.connection.ops.quote_name
+        triggers = ["_fts_insert", "_fts_update", "_fts_delete", *(f"_fts_{rel.name}" for rel in index.related)]
+        return [f"DROP TRIGGER IF EXISTS {qn(index.table + suffix)}" for suffix in triggers] + [
+            f"DROP TABLE IF EXISTS {qn(index.table + '_fts')}"
+        ]
+
+    def search(self, queryset, index, words):
+        qn = self.connection.ops.quote_name
+        fts = qn(f"{index.table}_fts")
+        query = " AND ".join(f'"{word}"*' for word in words)
+        weights = ", ".join(str(BM25_WEIGHTS[weight]) for weight in index.weights)
+        # bm25() es menor cuanto más relevante; se invierte para ordenar igual
+        # que en Postgres.
+        rank = f"-bm25({fts}, {weights})"
+        if queryset.query.group_by is None:
+            # Un JOIN con la tabla FTS calcula bm25() una sola vez por coincidencia.
+            return queryset.extra(
+                select={"search_rank": rank},
+                tables=[f"{index.table}_fts"],
+                where=[f"{fts} MATCH %s", f"{fts}.rowid = {qn(index.table)}.id"],
+                params=[query],
+            )
+        # Con GROUP BY (listados anotados) SQLite no admite bm25() en el JOIN:
+        # se filtra con una subconsulta y el ranking se calcula por fila.
+        return queryset.filter(
+            pk__in=RawSQL(f"SELECT rowid FROM {fts} WHERE {fts} MATCH %s", [query])
+        ).annotate(
+            search_rank=RawSQL(
+                f"SELECT {rank} FROM {fts} WHERE {fts} MATCH %s AND {fts}.rowid = {qn(index.table)}.id",
+                [query],
+                output_field=FloatField(),
+            )
+        )
+
+
+BACKENDS = {
+    "postgresql": PostgresSearchBackend,
+    "sqlite": SQLiteSearchBackend,
+}
+
+
+def get_backend(connection):
+    backend = BACKENDS.get(connection.vendor)
+    return backend(connection) if backend else None
+
+
+def install(schema_editor, indexes):
+    """
+    Crea índices y triggers con el SQL actual. Una migración nueva guarda una
+    copia de ese SQL (como `tasks/migrations/0002_search_index.py`) en lugar de
+    llamar a esta función, que cambia con el código.
+    """
+    backend = get_backend(schema_editor.connection)
+    if backend:
+        for sql in backend.setup_sql():
+            schema_editor.execute(sql, params=None)
+        for index in indexes:
+            for sql in backend.install_sql(index):
+                schema_editor.execute(sql, params=None)
+
+
+def uninstall(schema_editor, indexes):
+    backend = get_backend(schema_editor.connection)
+    if backend:
+        for index in reversed(indexes):
+            for sql in backend.uninstall_sql(index):
+                schema_editor.execute(sql, params=None)
+
+
+class FullTextSearchFilter(SearchFilter):
+    """
+    `SearchFilter` que usa el índice de texto completo de la vista
+    (`search_index`) y ordena por relevancia, salvo que se pida `?ordering=`.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        index = getattr(view, "search_index", None)
+        backend = get_backend(connections[queryset.db]) if index else None
+        if backend is None:
+            return super().filter_queryset(request, queryset, view)
+
+        words = search_words(self.get_search_terms(request))
+        if not words:
+            return queryset
+        return backend.search(queryset, index, words).order_by("-search_rank", "pk")
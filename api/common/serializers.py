@@ -0,0 +1,168 @@
+from django.core.exceptions import FieldDoesNotExist
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.settings import api_settings
+
+
+def parse_field_list(value):
+    """Convierte `"id, title,,status"` en `{"id", "title", "status"}`."""
+    return {name.strip() for name in (value or "").split(",") if name.strip()}
+
+
+class SparseFieldsetsMixin:
+    """
+    Permite pedir un subconjunto de campos con `?fields=` y `?omit=`.
+
+    Solo aplica al serializer raíz (o al hijo directo de un `many=True`) y en
+    métodos de lectura, para no alterar la validación de escrituras. Los
+    campos descartados quedan en `omitted_fields` para que la vista pueda
+    podar la consulta.
+    """
+
+    def get_fields(self):
+        # Lo que añade `expand` se poda igual que el resto de campos.
+        fields = self.get_expanded_fields(super().get_fields())
+        self.omitted_fields = {}
+        request = self.context.get("request")
+        if request is None or request.method not in SAFE_METHODS or not self._is_top_level():
+            return fields
+
+        requested = parse_field_list(request.query_params.get("fields"))
+        omitted = parse_field_list(request.query_params.get("omit"))
+        for name in list(fields):
+            if (requested and name not in requested) or name in omitted:
+                self.omitted_fields[name] = fields.pop(name)
+        return fields
+
+    def get_expanded_fields(self, fields):
+        """Campos que dependen de `expand`; por defecto, ninguno."""
+        return fields
+
+    def _is_top_level(self):
+        parent = self.parent
+        return parent is None or (isinstance(parent, serializers.ListSerializer) and parent.parent is None)
+
+
+
+class UnsupportedField(Exception):
+    """Campo que `ValuesPlan` no sabe reproducir sin instancias del modelo."""
+
+
+def _converter(field):
+    """Función que lleva el valor de `.values()` a lo que devuelve `field.to_representation`."""
+    if isinstance(field, (serializers.RelatedField, serializers.ManyRelatedField, serializers.SerializerMethodField)):
+        raise UnsupportedField(field.field_name)
+    # Atajos exactos para los tipos más comunes; el resto usa el método del campo.
+    if type(field) is serializers.IntegerField:
+        return int
+    if type(field) is serializers.CharField:
+        return str
+    if type(field) is serializers.DateTimeField:
+        return _datetime_converter(field)
+    return field.to_representation
+
+
+def _datetime_converter(field):
+    """
+    `DateTimeField.to_representation` con la zona horaria resuelta una sola
+    vez: el plan vive lo que dura la petición, y la zona activa no cambia.
+    """
+    output_format = getattr(field, "format", api_settings.DATETIME_FORMAT)
+    field_timezone = field.timezone if hasattr(field, "timezone") else field.default_timezone()
+    if output_format is None or output_format.lower() != ISO_8601 or field_timezone is None:
+        return field.to_representation
+
+    def convert(value):
+        if isinstance(value, str) or timezone.is_naive(value):
+            return field.to_representation(value)
+        value = value.astimezone(field_timezone).isoformat()
+        return value[:-6] + "Z" if value.endswith("+00:00") else value
+
+    return convert
+
+
+def _model_field(model, source, annotations):
+    """Último campo del modelo en `source` (`"task.block"`), o None si es una anotación."""
+    if source in annotations:
+        return None
+    field = None
+    for part in source.split("."):
+        if model is None:
+            raise UnsupportedField(source)
+        try:
+            field = model._meta.get_field(part)
+        except FieldDoesNotExist:
+            raise UnsupportedField(source)
+        if not field.concrete or field.many_to_many:
+            raise UnsupportedField(source)
+        model = field.related_model
+    return field
+
+
+class ValuesPlan:
+    """
+    `serializer.data` de un `ModelSerializer` de solo lectura a partir de filas de `.values()`.
+
+    El plan se compila desde los campos del serializer (ya podados por
+    `?fields=`/`?omit=`): la ruta del ORM y el conversor de cada campo, y
+    un subplan por cada serializer anidado de una relación directa (FK o
+    uno a uno). Produce los mismos diccionarios que DRF sin crear
+    instancias ni recorrer `get_attribute()` campo por campo. Si algún
+    campo no se puede reproducir así (propiedades, métodos, relaciones
+    inversas o muchos a muchos), el constructor lanza `UnsupportedField`.
+    """
+
+    def __init__(self, serializer, model, annotations=(), prefix=""):
+        self.fields = []
+        self.paths = []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            if not field.source or field.source == "*":
+                raise UnsupportedField(name)
+            model_field = _model_field(model, field.source, annotations if not prefix else ())
+            path = prefix + field.source.replace(".", "__")
+            nested = None
+            if isinstance(field, serializers.BaseSerializer):
+                if isinstance(field, serializers.ListSerializer) or model_field is None or not model_field.is_relation:
+                    raise UnsupportedField(name)
+                nested = ValuesPlan(field, model_field.related_model, prefix=f"{path}__")
+                convert = None
+            elif model_field is not None and model_field.is_relation:
+                # En una relación, `.values()` trae la clave: solo sirve si el campo muestra la clave.
+                if not isinstance(field, serializers.PrimaryKeyRelatedField) or field.pk_field is not None:
+                    raise UnsupportedField(name)
+                convert = None
+            else:
+                convert = _converter(field)
+            self._add_paths(path, *(nested.paths if nested else ()))
+            self.fields.append((name, path, nested, convert))
+
+    def _add_paths(self, *paths):
+        for path in paths:
+            if path not in self.paths:
+                self.paths.append(path)
+
+    def represent(self, row):
+        result = {}
+        for name, path, nested, convert in self.fields:
+            value = row[path]
+            if value is None:
+                result[name] = None
+            elif nested is not None:
+                result[name] = nested.represent(row)
+            else:
+                result[name] = value if convert is None else convert(value)
+        return result
+
+    def represent_many(self, rows):
+        return [self.represent(row) for row in rows]
+
+
+def values_plan(serializer, queryset):
+    """`ValuesPlan` del serializer para `queryset`, o None si tiene campos que solo DRF sabe representar."""
+    try:
+        return ValuesPlan(serializer, queryset.model, queryset.query.annotations)
+    except UnsupportedField:
+        return None
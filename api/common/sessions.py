@@ -0,0 +1,34 @@
+"""
+Limpieza de sesiones vencidas.
+
+`clearsessions` de Django borra todas las filas vencidas de
+`django_session` con un único `DELETE`: con muchas filas es una transacción
+larga que bloquea la tabla mientras las peticiones autenticadas la leen.
+`prune_expired()` borra por tramos de `batch_size` claves, cada uno en su
+propia transacción. Se ejecuta con el comando `prune_sessions` (con
+`--every` queda corriendo como tarea periódica).
+
+Siempre limpia la tabla, aunque `SESSION_BACKEND` no la use: al pasar de
+"db" a "cache" o "signed_cookies" quedan las filas anteriores.
+"""
+
+import time
+
+from django.contrib.sessions.models import Session
+from django.utils import timezone
+
+
+def prune_expired(batch_size, now=None, pause=0):
+    """Borra las sesiones vencidas antes de `now` y devuelve cuántas borró."""
+    now = now or timezone.now()
+    expired = Session.objects.filter(expire_date__lt=now)
+    deleted = 0
+    while True:
+        keys = list(expired.values_list("pk", flat=True)[:batch_size])
+        if not keys:
+            return deleted
+        deleted += Session.objects.filter(pk__in=keys).delete()[0]
+        if len(keys) < batch_size:
+            return deleted
+        if pause:
+            time.sleep(pause)
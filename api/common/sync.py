@@ -0,0 +1,254 @@
+"""
+Sincronización incremental de los listados: `?updated_since=` y bajas.
+
+Un cliente que guarda una copia local (p. ej. en IndexedDB) la carga entera
+una vez y después pide solo lo que cambió:
+
+- `GET /api/<recurso>/?updated_since=<timestamp>` devuelve las filas con
+  `updated_at` igual o posterior (índice sobre `updated_at`), con los
+  mismos filtros, campos y paginación que el listado.
+- `GET /api/<recurso>/deleted/?updated_since=<timestamp>` devuelve los ids
+  borrados desde entonces. Las bajas las registran triggers de la base en
+  `Tombstone`, en la misma transacción, así que también quedan las de
+  `queryset.delete()` y los borrados en cascada.
+
+Ambas respuestas (y el listado completo) traen `X-Sync-Timestamp`, el valor
+a enviar como `updated_since` la próxima vez. Una escritura que se confirma
+después de leer puede tener un `updated_at` anterior (se calcula antes del
+`COMMIT`), así que la marca no es la hora de la petición sino `watermark()`:
+en PostgreSQL, el inicio de la transacción abierta más vieja (y, si se lee
+de una réplica, lo último que aplicó), menos `DELTA_SYNC_OVERLAP_SECONDS`
+para el desfase entre los relojes de la aplicación y la base. Lo que se
+confirme después vuelve a llegar en la siguiente sincronización en lugar de
+perderse; por eso algunas filas pueden repetirse y el cliente las aplica por
+id. Las peticiones con `updated_since` (listados y `deleted/`) leen siempre
+de `default`: una réplica atrasada no vería lo que la marca ya dio por leído.
+
+Las bajas se conservan `TOMBSTONE_RETENTION_DAYS` días (`prune_tombstones`);
+un `updated_since` anterior responde 410 y el cliente vuelve a cargar todo.
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connections
+from django.utils import timezone
+from rest_framework import fields, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import APIException, ValidationError
+from rest_framework.filters import BaseFilterBackend
+from rest_framework.response import Response
+
+from .models import Tombstone
+from .routers import replica_alias, replica_reads
+
+SINCE_PARAM = "updated_since"
+SYNC_HEADER = "X-Sync-Timestamp"
+# Acciones que responden con `X-Sync-Timestamp`.
+SYNC_ACTIONS = {"list", "deleted"}
+
+LOG = Tombstone._meta.db_table
+COLUMNS = "model, object_id, deleted_at"
+
+_datetime = fields.DateTimeField()
+
+
+class SyncExpired(APIException):
+    status_code = status.HTTP_410_GONE
+    default_detail = "Las bajas desde esa fecha ya se borraron: vuelve a cargar el listado completo."
+    default_code = "sync_expired"
+
+
+def parse_since(request):
+    """`updated_since` de la petición como datetime con zona, o None."""
+    raw = request.query_params.get(SINCE_PARAM)
+    if not raw:
+        return None
+    try:
+        return _datetime.run_validation(raw)
+    except ValidationError as exc:
+        raise ValidationError({SINCE_PARAM: exc.detail})
+
+
+class UpdatedSinceFilter(BaseFilterBackend):
+    """Filtra por `sync_field` >= `?updated_since=` en las vistas que lo declaran."""
+
+    def filter_queryset(self, request, queryset, view):
+        field = getattr(view, "sync_field", None)
+        since = parse_since(request) if field else None
+        if since is None:
+            return queryset
+        return queryset.filter(**{f"{field}__gte": since})
+
+    def get_schema_operation_parameters(self, view):
+        if not getattr(view, "sync_field", None):
+            return []
+        return [
+            {
+                "name": SINCE_PARAM,
+                "required": False,
+                "in": "query",
+                "description": "Solo filas modificadas desde este instante (ISO 8601).",
+                "schema": {"type": "string", "format": "date-time"},
+            }
+        ]
+
+
+class PostgresTombstones:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def install_sql(self, tables):
+        qn = self.connection.ops.quote_name
+        function = qn(f"{LOG}_record")
+        sql = [
+            f"CREATE OR REPLACE FUNCTION {function}() RETURNS trigger AS $$ BEGIN "
+            f"INSERT INTO {qn(LOG)} ({COLUMNS}) VALUES (TG_ARGV[0], OLD.id, clock_timestamp()); "
+            f"RETURN NULL; END $$ LANGUAGE plpgsql"
+        ]
+        for label, table in tables:
+            sql.append(
+                f"CREATE TRIGGER {qn(table + '_tombstone')} AFTER DELETE ON {qn(table)} "
+                f"FOR EACH ROW EXECUTE FUNCTION {function}('{label}')"
+            )
+        return sql
+
+    def uninstall_sql(self, tables):
+        qn = self.connection.ops.quote_name
+        # La función la comparten las tablas de todas las apps: se deja.
+        return [f"DROP TRIGGER IF EXISTS {qn(table + '_tombstone')} ON {qn(table)}" for _, table in tables]
+
+
+class SQLiteTombstones:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def install_sql(self, tables):
+        qn = self.connection.ops.quote_name
+        # Mismo formato que guarda Django para un DateTimeField en UTC.
+        now = "strftime('%Y-%m-%d %H:%M:%f', 'now')"
+        return [
+            f"CREATE TRIGGER {qn(table + '_tombstone')} AFTER DELETE ON {qn(table)} "
+            f"BEGIN INSERT INTO {qn(LOG)} ({COLUMNS}) VALUES ('{label}', OLD.id, {now}); END"
+            for label, table in tables
+        ]
+
+    def uninstall_sql(self, tables):
+        qn = self.connection.ops.quote_name
+        return [f"DROP TRIGGER IF EXISTS {qn(table + '_tombstone')}" for _, table in tables]
+
+
+BACKENDS = {
+    "postgresql": PostgresTombstones,
+    "sqlite": SQLiteTombstones,
+}
+
+
+def _tables(models):
+    return [(model._meta.label_lower, model._meta.db_table) for model in models]
+
+
+def install(schema_editor, models):
+    """Crea los triggers de bajas de `models`; para usar desde una migración con `RunPython`."""
+    backend = BACKENDS.get(schema_editor.connection.vendor)
+    if backend:
+        for sql in backend(schema_editor.connection).install_sql(_tables(models)):
+            schema_editor.execute(sql, params=None)
+
+
+def uninstall(schema_editor, models):
+    backend = BACKENDS.get(schema_editor.connection.vendor)
+    if backend:
+        for sql in backend(schema_editor.connection).uninstall_sql(_tables(models)):
+            schema_editor.execute(sql, params=None)
+
+
+def _select_one(alias, sql):
+    with connections[alias].cursor() as cursor:
+        cursor.execute(sql)
+        return cursor.fetchone()[0]
+
+
+def watermark():
+    """
+    Instante desde el que hay que volver a pedir cambios: todo lo confirmado
+    con un `updated_at` anterior ya es visible para las lecturas en curso.
+    """
+    mark = timezone.now()
+    if connections["default"].vendor == "postgresql":
+        # Las transacciones abiertas (también las de otros workers) pueden
+        # confirmar filas con un `updated_at` anterior a su inicio.
+        oldest = _select_one(
+            "default",
+            "SELECT min(xact_start) FROM pg_stat_activity "
+            "WHERE datname = current_database() AND backend_type = 'client backend'",
+        )
+        mark = min(mark, oldest or mark)
+    replica = replica_alias()
+    if replica and connections[replica].vendor == "postgresql":
+        # La réplica tiene aplicado todo lo confirmado hasta aquí.
+        replayed = _select_one(replica, "SELECT pg_last_xact_replay_timestamp()")
+        mark = min(mark, replayed or mark)
+    return mark - timedelta(seconds=settings.DELTA_SYNC_OVERLAP_SECONDS)
+
+
+def retention_start():
+    """Las bajas anteriores a este instante ya pueden haberse borrado."""
+    return timezone.now() - timedelta(days=settings.TOMBSTONE_RETENTION_DAYS)
+
+
+def deleted_ids(model, since):
+    """Ids de `model` borrados desde `since`, en orden de baja."""
+    if since < retention_start():
+        raise SyncExpired()
+    return list(
+        Tombstone.objects.filter(model=model._meta.label_lower, deleted_at__gte=since)
+        .order_by("deleted_at", "pk")
+        .values_list("object_id", flat=True)
+    )
+
+
+def prune(batch_size):
+    """Borra por tramos las bajas anteriores a la retención y devuelve cuántas."""
+    old = Tombstone.objects.filter(deleted_at__lt=retention_start())
+    deleted = 0
+    while True:
+        pks = list(old.values_list("pk", flat=True)[:batch_size])
+        if not pks:
+            return deleted
+        deleted += Tombstone.objects.filter(pk__in=pks).delete()[0]
+
+
+class DeltaSyncMixin:
+    """
+    `?updated_since=` en el listado (ver `UpdatedSinceFilter`), la acción
+    `deleted` y la cabecera `X-Sync-Timestamp`. La tabla de la vista necesita
+    los triggers de `install()`.
+    """
+
+    sync_field = "updated_at"
+
+    def dispatch(self, request, *args, **kwargs):
+        if not request.GET.get(SINCE_PARAM):
+            return super().dispatch(request, *args, **kwargs)
+        with replica_reads(None):
+            return super().dispatch(request, *args, **kwargs)
+
+    def initial(self, request, *args, **kwargs):
+        # Antes de cualquier consulta: lo que se confirme después vuelve a llegar.
+        self.sync_timestamp = watermark()
+        super().initial(request, *args, **kwargs)
+
+    @action(detail=False, methods=["get"])
+    def deleted(self, request, *args, **kwargs):
+        """Ids borrados desde `?updated_since=` (obligatorio), en orden de baja."""
+        since = parse_since(request)
+        if since is None:
+            raise ValidationError({SINCE_PARAM: ["Este parámetro es obligatorio."]})
+        return Response({"ids": deleted_ids(self.queryset.model, since)})
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        timestamp = getattr(self, "sync_timestamp", None)
+        if timestamp is not None and self.action in SYNC_ACTIONS and response.status_code in (200, 304):
+            response[SYNC_HEADER] = _datetime.to_representation(timestamp)
+        return super().finalize_response(request, response, *args, **kwargs)
@@ -0,0 +1,112 @@
+"""
+Throttling por ventana deslizante sobre una caché compartida.
+
+Los throttles de DRF guardan por cliente la lista de marcas de tiempo de
+sus peticiones y la reescriben completa en cada una (crece con el límite),
+y con la caché `locmem` cada proceso lleva su propia cuenta. Estos guardan
+por cliente dos contadores enteros, el de la ventana actual y el de la
+anterior, en la caché `THROTTLE_CACHE_ALIAS` (Redis en producción, para que
+todos los workers compartan la cuenta). Cada petición hace un `incr`
+atómico y un `get`, con memoria fija por cliente sea cual sea el límite.
+
+La cuenta de la ventana deslizante se estima como
+`anterior × (parte de la ventana anterior que sigue dentro) + actual`.
+Las peticiones rechazadas también cuentan, así que un cliente que insiste
+sigue limitado.
+"""
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework import throttling
+
+from .authentication import VerifiedKey
+
+
+class SlidingWindowMixin:
+    """Reemplaza el historial de `SimpleRateThrottle` por dos contadores de ventana fija."""
+
+    @property
+    def cache(self):
+        return caches[settings.THROTTLE_CACHE_ALIAS]
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.now = self.timer()
+        window, offset = divmod(self.now, self.duration)
+        self.current = self.increment(f"{self.key}:{int(window)}")
+        self.previous = self.cache.get(f"{self.key}:{int(window) - 1}", 0)
+        self.elapsed = offset / self.duration
+        return self.previous * (1 - self.elapsed) + self.current <= self.num_requests
+
+    def increment(self, key):
+        try:
+            return self.cache.incr(key)
+        except ValueError:
+            # Primera petición de la ventana; la clave vive también durante la siguiente.
+            if self.cache.add(key, 1, 2 * self.duration):
+                return 1
+            return self.cache.incr(key)
+
+    def wait(self):
+        """Segundos hasta que una petición más entre en el límite."""
+        allowed = self.num_requests - 1
+        if self.current <= allowed and self.previous:
+            # Alcanza con que se desplace lo suficiente la ventana anterior.
+            fraction = 1 - (allowed - self.current) / self.previous
+            return max(fraction - self.elapsed, 0) * self.duration
+        # Hay que esperar a la ventana siguiente, donde la actual pasa a ser la anterior.
+        fraction = 1 - allowed / self.current
+        return (1 - self.elapsed + fraction) * self.duration
+
+
+class AnonRateThrottle(SlidingWindowMixin, throttling.AnonRateThrottle):
+    pass
+
+
+class UserRateThrottle(SlidingWindowMixin, throttling.UserRateThrottle):
+    def get_cache_key(self, request, view):
+        # Las API keys tienen su propio límite (`APIKeyRateThrottle`).
+        if isinstance(request.auth, VerifiedKey):
+            return None
+        return super().get_cache_key(request, view)
+
+
+class APIKeyRateThrottle(SlidingWindowMixin, throttling.SimpleRateThrottle):
+    """Límite por API key: el `throttle_rate` de la clave o, si no tiene, el alcance `api-key`."""
+
+    scope = "api-key"
+
+    def __init__(self):
+        # La tasa depende de la clave de cada petición.
+        pass
+
+    def allow_request(self, request, view):
+        if not isinstance(request.auth, VerifiedKey):
+            return True
+        self.rate = request.auth.rate or self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        return super().allow_request(request, view)
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {"scope": self.scope, "ident": request.auth.prefix}
+
+
+class ActionRateThrottle(SlidingWindowMixin, throttling.ScopedRateThrottle):
+    """
+    Límite propio por acción del viewset, para los endpoints caros: la vista
+    declara `throttle_scopes = {"list": "topics-list", ...}` y cada alcance
+    tiene su tasa en `DEFAULT_THROTTLE_RATES`. Las demás acciones no se limitan.
+    """
+
+    def allow_request(self, request, view):
+        self.scope = getattr(view, "throttle_scopes", {}).get(getattr(view, "action", None))
+        if not self.scope:
+            return True
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        return super().allow_request(request, view)
@@ -0,0 +1,278 @@
+import hashlib
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db import models
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework import serializers, status
+from rest_framework.exceptions import APIException
+from rest_framework.response import Response
+
+from . import cache
+from .serializers import values_plan
+
+# Columnas que vale la pena no leer cuando el cliente no las pide.
+DEFERRABLE_FIELD_TYPES = (models.TextField, models.JSONField, models.BinaryField)
+
+
+def _dependency_generations(view):
+    """Generaciones de `cache_dependencies`, consultadas una vez por petición."""
+    if not hasattr(view, "_generations"):
+        dependencies = getattr(view, "cache_dependencies", ())
+        view._generations = cache.get_generations(dependencies) if dependencies else []
+    return view._generations
+
+
+def _select_related_paths(tree, prefix=""):
+    for name, children in tree.items():
+        path = f"{prefix}{name}"
+        yield path
+        yield from _select_related_paths(children, f"{path}__")
+
+
+class SparseFieldsetsViewMixin:
+    """
+    Lleva a la consulta el conjunto de campos elegido con `?fields=`/`?omit=`.
+
+    Las columnas de texto largo o JSON que el serializer descartó se difieren
+    con `.defer()`, y los `select_related` que solo alimentaban un serializer
+    anidado descartado se quitan del queryset.
+    """
+
+    def get_omitted_fields(self):
+        """Campos del serializer que la petición actual dejó fuera."""
+        if self.request is None or self.request.method not in ("GET", "HEAD"):
+            return {}
+        if not hasattr(self, "_omitted_fields"):
+            serializer = self.get_serializer()
+            serializer.fields  # Construye los campos y calcula los descartados.
+            self._omitted_fields = getattr(serializer, "omitted_fields", {})
+        return self._omitted_fields
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        omitted = self.get_omitted_fields()
+        if not omitted:
+            return queryset
+
+        opts = queryset.model._meta
+        deferred, dropped_relations = [], set()
+        for name, field in omitted.items():
+            # Los campos descartados nunca se enlazan, así que `source` puede ser None.
+            source = field.source or name
+            if source == "*":
+                continue
+            try:
+                model_field = opts.get_field(source.split(".")[0])
+            except FieldDoesNotExist:
+                continue
+            if isinstance(field, serializers.BaseSerializer) and model_field.is_relation:
+                dropped_relations.add(model_field.name)
+            elif isinstance(model_field, DEFERRABLE_FIELD_TYPES):
+                deferred.append(model_field.name)
+
+        if deferred:
+            queryset = queryset.defer(*deferred)
+        if dropped_relations and isinstance(queryset.query.select_related, dict):
+            keep = [
+                path
+                for path in _select_related_paths(queryset.query.select_related)
+                if path.split("__")[0] not in dropped_relations
+            ]
+            queryset = queryset.select_related(None)
+            if keep:
+                queryset = queryset.select_related(*keep)
+        return queryset
+
+
+class ValuesListMixin:
+    """
+    Listado de solo lectura armado desde `.values()` con un `ValuesPlan`.
+
+    Evita instanciar los modelos y pasar cada fila por el serializer: los
+    diccionarios salen de un plan compilado una vez por petición, con el
+    mismo JSON que daría `get_serializer(many=True).data`. Si el serializer
+    (con el `?fields=`/`?omit=` pedido) tiene campos que el plan no cubre, el
+    listado usa el serializer como siempre.
+    """
+
+    def get_values_plan(self, queryset):
+        if not hasattr(self, "_values_plan"):
+            self._values_plan = values_plan(self.get_serializer(), queryset)
+        return self._values_plan
+
+    def values_queryset(self, queryset, plan):
+        # Las columnas de la clave del cursor también se leen aunque no se muestren.
+        paths = [*plan.paths, *(f for f in getattr(self, "keyset_fields", ()) if f not in plan.paths)]
+        return queryset.prefetch_related(None).values(*paths)
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        plan = self.get_values_plan(queryset)
+        if plan is None:
+            page = self.paginate_queryset(queryset)
+            if page is not None:
+                return self.get_paginated_response(self.get_serializer(page, many=True).data)
+            return Response(self.get_serializer(queryset, many=True).data)
+
+        rows = self.values_queryset(queryset, plan)
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(plan.represent_many(page))
+        return Response(plan.represent_many(rows))
+
+
+class CachedResponseMixin:
+    """
+    Guarda en caché las respuestas de `list` y `retrieve`.
+
+    La clave incluye los parámetros de la petición y la generación de cada
+    modelo de `cache_dependencies`, de modo que cualquier escritura sobre
+    ellos invalida las respuestas previas. Responde con `X-Cache: HIT|MISS`.
+    """
+
+    cache_dependencies = ()
+
+    def get_cache_namespace(self):
+        return getattr(self, "basename", None) or type(self).__name__
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        if not self.cache_dependencies or settings.RESPONSE_CACHE_TIMEOUT <= 0:
+            return handler(request, *args, **kwargs)
+        namespace = self.get_cache_namespace()
+        generations = _dependency_generations(self)
+        key = cache.response_cache_key(f"{namespace}:{self.action}", request, generations)
+        data = cache.response_cache().get(key)
+        if data is not None:
+            cache.record("hits", namespace)
+            return Response(data, headers={"X-Cache": "HIT"})
+
+        cache.record("misses", namespace)
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            cache.response_cache().set(key, response.data, settings.RESPONSE_CACHE_TIMEOUT)
+        response["X-Cache"] = "MISS"
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(super().retrieve, request, *args, **kwargs)
+
+
+class PreconditionFailed(APIException):
+    status_code = status.HTTP_412_PRECONDITION_FAILED
+    default_detail = "El recurso cambió desde que se leyó."
+    default_code = "precondition_failed"
+
+
+class ConditionalRequestMixin:
+    """
+    ETag y Last-Modified a partir de `etag_field` (por defecto `updated_at`).
+
+    El ETag del listado sale de `MAX(updated_at)` y `COUNT(*)` del queryset
+    filtrado, en la misma consulta que usa la paginación para su total; el
+    del detalle, del `updated_at` de la fila. Si la vista tiene
+    `cache_dependencies`, sus generaciones también forman parte del ETag
+    porque la respuesta anida datos de esos modelos; en ese caso no se envía
+    Last-Modified, que no reflejaría esos cambios (tampoco en listados, donde
+    no refleja las bajas).
+
+    `If-None-Match`/`If-Modified-Since` responden 304 sin serializar nada e
+    `If-Match`/`If-Unmodified-Since` en PUT/PATCH responden 412 si el objeto
+    cambió desde que el cliente lo leyó.
+    """
+
+    etag_field = "updated_at"
+
+    def conditional_enabled(self):
+        if not self.etag_field:
+            return False
+        try:
+            self.queryset.model._meta.get_field(self.etag_field)
+        except FieldDoesNotExist:
+            return False
+        return True
+
+    def _validator_queryset(self):
+        # El queryset declarado, sin las anotaciones ni prefetch de get_queryset().
+        return self.filter_queryset(self.queryset.all()).order_by()
+
+    def _etag(self, *parts):
+        parts = (self.queryset.model._meta.label_lower, *parts, *_dependency_generations(self))
+        return '"%s"' % hashlib.sha1(repr(parts).encode()).hexdigest()
+
+    def get_list_validators(self):
+        # El COUNT solo es barato si la paginación ya iba a pagarlo: con cursor
+        # o sin conteo exacto el listado no lleva ETag.
+        get_count_mode = getattr(self.paginator, "get_count_mode", None)
+        if get_count_mode is not None and get_count_mode(self.request, self) != "exact":
+            return None, None
+        stats = self._validator_queryset().aggregate(
+            last=models.Max(self.etag_field), count=models.Count("pk")
+        )
+        # La paginación reutiliza este total en lugar de repetir el COUNT.
+        self.known_count = stats["count"]
+        return self._etag("list", stats["last"], stats["count"]), None
+
+    def get_detail_validators(self):
+        lookup = self.kwargs[self.lookup_url_kwarg or self.lookup_field]
+        try:
+            updated_at = (
+                self._validator_queryset()
+                .filter(**{self.lookup_field: lookup})
+                .values_list(self.etag_field, flat=True)
+                .first()
+            )
+        except (TypeError, ValueError, ValidationError):
+            updated_at = None
+        if updated_at is None:
+            # Lo resuelve `get_object()` (404).
+            return None, None
+        last_modified = None if getattr(self, "cache_dependencies", ()) else updated_at
+        return self._etag("detail", lookup, updated_at), last_modified
+
+    def _check_preconditions(self, get_validators):
+        """Respuesta 304/412 de Django si las cabeceras condicionales lo piden, o None."""
+        etag, last_modified = get_validators()
+        self._validators = (etag, last_modified)
+        if etag is None:
+            return None
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        return get_conditional_response(self.request, etag=etag, last_modified=timestamp)
+
+    def _conditional_get(self, get_validators, handler, request, *args, **kwargs):
+        if not self.conditional_enabled():
+            return handler(request, *args, **kwargs)
+        response = self._check_preconditions(get_validators)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self._conditional_get(self.get_list_validators, super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._conditional_get(self.get_detail_validators, super().retrieve, request, *args, **kwargs)
+
+    def get_object(self):
+        if self.request.method in ("PUT", "PATCH") and self.conditional_enabled():
+            if self._check_preconditions(self.get_detail_validators) is not None:
+                raise PreconditionFailed()
+        return super().get_object()
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        validators = getattr(self, "_validators", None)
+        if validators and response.status_code in (200, 304):
+            if request.method in ("PUT", "PATCH"):
+                # La escritura cambió la fila y quizá las generaciones.
+                self.__dict__.pop("_generations", None)
+                validators = self.get_detail_validators()
+            etag, last_modified = validators
+            if etag is not None:
+                response["ETag"] = etag
+            if last_modified is not None:
+                response["Last-Modified"] = http_date(last_modified.timestamp())
+        return super().finalize_response(request, response, *args, **kwargs)
@@ -0,0 +1,34 @@
+"""
+Configuración de gunicorn para producción:
+
+    gunicorn -c config/gunicorn.py config.asgi:application
+
+Un proceso maestro con `WEB_CONCURRENCY` workers de uvicorn; por defecto,
+uno por CPU disponible para el proceso (mínimo 2). Cada worker atiende
+muchas conexiones con su event loop, así que no aplica la regla de
+2×CPU+1 de los workers síncronos. Si el contenedor limita la CPU por cuota
+(`--cpus`), conviene fijar `WEB_CONCURRENCY` a mano. Los workers se
+reciclan cada `GUNICORN_MAX_REQUESTS` peticiones, con algo de azar para
+que no reinicien todos a la vez.
+"""
+
+import os
+
+
+def available_cpus():
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+bind = os.getenv("GUNICORN_BIND", f"0.0.0.0:{os.getenv('PORT', '8000')}")
+workers = int(os.getenv("WEB_CONCURRENCY", max(2, available_cpus())))
+worker_class = "uvicorn_worker.UvicornWorker"
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "30"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "2000"))
+max_requests_jitter = max_requests // 10
+accesslog = os.getenv("GUNICORN_ACCESS_LOG", "-") or None
+errorlog = "-"
@@ -11,8 +11,11 @@ https://docs.djangoproject.com/en/6.0/ref/settings/
 """
 
 import os
+import sys
 from pathlib import Path
 
+from corsheaders.defaults import default_headers
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -40,13 +43,17 @@ INSTALLED_APPS = [
     'django.contrib.staticfiles',
     'corsheaders',
     'rest_framework',
+    'rest_framework_api_key',
     'drf_spectacular',
     'django_filters',
+    'common',
     'users',
     'tasks',
 ]
 
 MIDDLEWARE = [
+    'health.middleware.QueryMetricsMiddleware',
+    'common.middleware.ReplicaRoutingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
@@ -97,10 +104,47 @@ else:
     DATABASES = {
         'default': {
             'ENGINE': 'django.db.backends.sqlite3',
-            'NAME': BASE_DIR / 'db.sqlite3',
+            'NAME': os.getenv('SQLITE_PATH', BASE_DIR / 'db.sqlite3'),
         }
     }
 
+# Conexiones persistentes: `DB_CONN_MAX_AGE` segundos que se reutiliza cada
+# conexión (0, por defecto, abre una por petición) y `DB_CONN_HEALTH_CHECKS`
+# comprueba antes de reutilizarla que siga viva. Con `DB_POOL=true` (solo
+# Postgres, psycopg 3) cada proceso mantiene un pool de entre
+# `DB_POOL_MIN_SIZE` y `DB_POOL_MAX_SIZE` conexiones; es lo indicado bajo
+# ASGI, donde cada petición corre en un hilo distinto, y no se combina con
+# `DB_CONN_MAX_AGE`. El total es `DB_POOL_MAX_SIZE` × workers.
+DATABASES['default']['CONN_MAX_AGE'] = int(os.getenv('DB_CONN_MAX_AGE', '0'))
+DATABASES['default']['CONN_HEALTH_CHECKS'] = os.getenv('DB_CONN_HEALTH_CHECKS', 'False').lower() == 'true'
+if DB_ENGINE == 'postgres' and os.getenv('DB_POOL', 'False').lower() == 'true':
+    DATABASES['default']['OPTIONS'] = {
+        'pool': {
+            'min_size': int(os.getenv('DB_POOL_MIN_SIZE', '2')),
+            'max_size': int(os.getenv('DB_POOL_MAX_SIZE', '10')),
+            'timeout': int(os.getenv('DB_POOL_TIMEOUT', '10')),
+        },
+    }
+
+# Réplicas de lectura: `DB_REPLICA_HOSTS` ("host[:puerto],...", Postgres) o
+# `SQLITE_REPLICA_PATHS` (archivos, para pruebas locales) crean los alias
+# `replica1`, `replica2`, ... con la configuración de `default`. Las
+# peticiones GET/HEAD/OPTIONS leen de ellas (common.routers), salvo los
+# clientes que escribieron en los últimos `REPLICA_STICKY_SECONDS`.
+DATABASE_REPLICAS = []
+if DB_ENGINE == 'postgres':
+    _hosts = [host.strip().partition(':') for host in os.getenv('DB_REPLICA_HOSTS', '').split(',') if host.strip()]
+    _replicas = [{'HOST': host, 'PORT': port or DATABASES['default']['PORT']} for host, _, port in _hosts]
+else:
+    _replicas = [{'NAME': path.strip()} for path in os.getenv('SQLITE_REPLICA_PATHS', '').split(',') if path.strip()]
+for _index, _replica in enumerate(_replicas, start=1):
+    # En las pruebas las réplicas apuntan a la base de prueba de `default`.
+    DATABASES[f'replica{_index}'] = {**DATABASES['default'], **_replica, 'TEST': {'MIRROR': 'default'}}
+    DATABASE_REPLICAS.append(f'replica{_index}')
+DATABASE_ROUTERS = ['common.routers.ReplicaRouter']
+REPLICA_STICKY_SECONDS = int(os.getenv('REPLICA_STICKY_SECONDS', '10'))
+REPLICA_STICKY_COOKIE = 'primary_reads'
+
 
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
@@ -140,6 +184,9 @@ USE_TZ = True
 # https://docs.djangoproject.com/en/6.0/howto/static-files/
 
 STATIC_URL = 'static/'
+# Destino de `collectstatic` (lo hace la imagen de Docker); en producción los
+# sirve el proxy, no la aplicación.
+STATIC_ROOT = BASE_DIR / 'staticfiles'
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/6.0/ref/settings/#default-auto-field
@@ -147,10 +194,15 @@ STATIC_URL = 'static/'
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 
+# Límite por cliente de cada listado caro (topics, block-tasks, progreso).
+LIST_THROTTLE_RATE = os.getenv('THROTTLE_LIST_RATE', '120/min') or None
+
 # Django REST Framework Configuration
 REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    # Clientes de servicio con `Authorization: Api-Key ...` (sin sesión ni CSRF), o sesión.
     'DEFAULT_AUTHENTICATION_CLASSES': [
+        'common.authentication.APIKeyAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
@@ -158,21 +210,155 @@ REST_FRAMEWORK = {
     ],
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend',
-        'rest_framework.filters.SearchFilter',
+        'common.search.FullTextSearchFilter',
+        'common.sync.UpdatedSinceFilter',
         'rest_framework.filters.OrderingFilter',
     ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    # Con orjson instalado el JSON se codifica con él (mismos bytes).
+    'DEFAULT_RENDERER_CLASSES': [
+        'common.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PAGINATION_CLASS': 'common.pagination.StandardPagination',
     'PAGE_SIZE': 20,
+    # Ventana deslizante con contadores en la caché `THROTTLE_CACHE_ALIAS` (ver common.throttling).
     'DEFAULT_THROTTLE_CLASSES': [
-        'rest_framework.throttling.AnonRateThrottle',
-        'rest_framework.throttling.UserRateThrottle'
+        'common.throttling.AnonRateThrottle',
+        'common.throttling.UserRateThrottle',
+        'common.throttling.ActionRateThrottle',
+        'common.throttling.APIKeyRateThrottle',
     ],
+    # Un valor vacío desactiva el límite (p. ej. en `benchmarks.server`). Los
+    # alcances por acción (`throttle_scopes` de cada viewset) tienen su propia
+    # cuenta por cliente, además de `anon`/`user`.
     'DEFAULT_THROTTLE_RATES': {
-        'anon': '100/hour',
-        'user': '1000/hour'
+        'anon': os.getenv('THROTTLE_ANON_RATE', '100/hour') or None,
+        'user': os.getenv('THROTTLE_USER_RATE', '1000/hour') or None,
+        'topics-list': LIST_THROTTLE_RATE,
+        'block-tasks-list': LIST_THROTTLE_RATE,
+        'progress-list': LIST_THROTTLE_RATE,
+        'exports': os.getenv('THROTTLE_EXPORT_RATE', '10/min') or None,
+        # API keys sin `throttle_rate` propio (reemplaza a `user` para ellas).
+        'api-key': os.getenv('API_KEY_DEFAULT_RATE', '6000/hour') or None,
     }
 }
 
+# Conteo de la paginación por número de página: "exact" (COUNT(*)),
+# "estimate" (estimación del planner de Postgres para tablas grandes) o "none".
+PAGINATION_COUNT_MODE = os.getenv('PAGINATION_COUNT_MODE', 'exact').lower()
+PAGINATION_ESTIMATE_THRESHOLD = int(os.getenv('PAGINATION_ESTIMATE_THRESHOLD', '10000'))
+
+# Filas por lote en los endpoints de escritura masiva.
+BULK_BATCH_SIZE = int(os.getenv('BULK_BATCH_SIZE', '500'))
+
+# Filas leídas por vuelta del cursor (y por fragmento HTTP) en las exportaciones.
+EXPORT_CHUNK_SIZE = int(os.getenv('EXPORT_CHUNK_SIZE', '2000'))
+
+# Asignación masiva de temas/bloques: por encima del umbral de estudiantes
+# se ejecuta en segundo plano, procesando la cohorte por tramos.
+ASSIGNMENT_ASYNC_THRESHOLD = int(os.getenv('ASSIGNMENT_ASYNC_THRESHOLD', '1000'))
+ASSIGNMENT_CHUNK_SIZE = int(os.getenv('ASSIGNMENT_CHUNK_SIZE', '500'))
+
+# Cambios de progreso (users.changes): cambios por respuesta de
+# `/api/changes/` (y máximo de `?limit=`), cada cuánto consulta el stream SSE
+# los nuevos, cada cuánto manda un comentario para mantener viva la conexión
+# y cuánto dura cada conexión antes de que el cliente reconecte con
+# `Last-Event-ID`. `prune_progress_changes` borra los de más de
+# `PROGRESS_CHANGES_RETENTION_DAYS` días.
+PROGRESS_CHANGES_PAGE_SIZE = int(os.getenv('PROGRESS_CHANGES_PAGE_SIZE', '100'))
+PROGRESS_CHANGES_MAX_PAGE_SIZE = 1000
+PROGRESS_CHANGES_POLL_SECONDS = float(os.getenv('PROGRESS_CHANGES_POLL_SECONDS', '1'))
+PROGRESS_CHANGES_HEARTBEAT_SECONDS = float(os.getenv('PROGRESS_CHANGES_HEARTBEAT_SECONDS', '15'))
+PROGRESS_CHANGES_STREAM_SECONDS = float(os.getenv('PROGRESS_CHANGES_STREAM_SECONDS', '300'))
+PROGRESS_CHANGES_RETENTION_DAYS = int(os.getenv('PROGRESS_CHANGES_RETENTION_DAYS', '7'))
+
+# Sincronización incremental (common.sync): `X-Sync-Timestamp` queda este
+# margen antes de la hora de la petición, para no perder escrituras que se
+# confirman durante la lectura. `prune_tombstones` borra las bajas de más de
+# `TOMBSTONE_RETENTION_DAYS` días; un `updated_since` anterior responde 410.
+DELTA_SYNC_OVERLAP_SECONDS = float(os.getenv('DELTA_SYNC_OVERLAP_SECONDS', '5'))
+TOMBSTONE_RETENTION_DAYS = int(os.getenv('TOMBSTONE_RETENTION_DAYS', '30'))
+
+# Caché: "locmem" (por defecto, también en pruebas), "file" (CACHE_LOCATION es
+# un directorio) o "redis" (CACHE_LOCATION es la URL del servidor, requiere el
+# paquete `redis`).
+CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'locmem').lower()
+CACHE_BACKENDS = {
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+    'file': 'django.core.cache.backends.filebased.FileBasedCache',
+    'redis': 'django.core.cache.backends.redis.RedisCache',
+}
+CACHES = {
+    'default': {
+        'BACKEND': CACHE_BACKENDS[CACHE_BACKEND],
+        'LOCATION': os.getenv('CACHE_LOCATION', 'taskmaster'),
+    }
+}
+
+# Sesiones: "db" (por defecto, un SELECT a `django_session` por petición
+# autenticada), "cached_db" (lee de la caché y escribe en ambas), "cache"
+# (solo caché: se pierden si la caché se vacía) o "signed_cookies" (la sesión
+# viaja firmada en la cookie, sin almacenamiento). Las de caché necesitan una
+# caché compartida (redis) con varios workers. Las filas vencidas de "db" y
+# "cached_db" se borran por tramos con `prune_sessions`.
+SESSION_BACKEND = os.getenv('SESSION_BACKEND', 'db').lower()
+SESSION_ENGINES = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'cache': 'django.contrib.sessions.backends.cache',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+}
+SESSION_ENGINE = SESSION_ENGINES[SESSION_BACKEND]
+SESSION_CACHE_ALIAS = 'default'
+SESSION_COOKIE_AGE = int(os.getenv('SESSION_COOKIE_AGE', str(60 * 60 * 24 * 14)))
+SESSION_PRUNE_BATCH_SIZE = int(os.getenv('SESSION_PRUNE_BATCH_SIZE', '1000'))
+
+# API keys de servicio (common.authentication): segundos que una clave
+# verificada se reutiliza en memoria sin consultar la base, y cada cuánto se
+# escriben los contadores de uso (lo primero que ocurra).
+API_KEY_CACHE_TTL = int(os.getenv('API_KEY_CACHE_TTL', '60'))
+API_KEY_USAGE_FLUSH_SECONDS = int(os.getenv('API_KEY_USAGE_FLUSH_SECONDS', '30'))
+API_KEY_USAGE_FLUSH_REQUESTS = int(os.getenv('API_KEY_USAGE_FLUSH_REQUESTS', '500'))
+# Escribe los contadores pendientes al terminar el proceso. No en `manage.py
+# test`: al salir la base de pruebas ya no existe y escribiría en la real.
+API_KEY_USAGE_FLUSH_AT_EXIT = os.getenv(
+    'API_KEY_USAGE_FLUSH_AT_EXIT', 'false' if sys.argv[1:2] == ['test'] else 'true'
+).lower() == 'true'
+
+# Contadores del throttling. Con varios workers tiene que ser una caché
+# compartida (redis); con `locmem` cada proceso lleva su propia cuenta.
+THROTTLE_CACHE_ALIAS = 'default'
+
+# Caché de respuestas de los endpoints del catálogo (segundos; 0 la desactiva).
+RESPONSE_CACHE_ALIAS = 'default'
+RESPONSE_CACHE_TIMEOUT = int(os.getenv('RESPONSE_CACHE_TIMEOUT', '300'))
+
+# Métricas por endpoint (`/api/health/metrics/`). `SERVER_TIMING` agrega la
+# cabecera `Server-Timing` con consultas y tiempos; `QUERY_BUDGET_MODE`
+# ("off", "log" o "raise") decide qué hacer cuando una acción supera su
+# máximo de consultas en `QUERY_BUDGETS` (`<basename>.<acción>`).
+SERVER_TIMING = os.getenv('SERVER_TIMING', str(DEBUG)).lower() == 'true'
+QUERY_BUDGET_MODE = os.getenv('QUERY_BUDGET_MODE', 'log').lower()
+# Los máximos dejan margen para la sesión y el usuario de las peticiones
+# autenticadas (2 consultas).
+QUERY_BUDGETS = {
+    'study-topics.list': 7,
+    'study-topics.retrieve': 7,
+    'study-blocks.list': 6,
+    'study-blocks.retrieve': 6,
+    'block-tasks.list': 5,
+    'block-tasks.retrieve': 5,
+    'students.list': 4,
+    'students.retrieve': 4,
+    'students.summary': 6,
+    'students.next_tasks': 4,
+    'changes.list': 5,
+    'student-task-progress.list': 5,
+    'student-task-progress.retrieve': 5,
+    'assignment-jobs.list': 3,
+    'users.list': 4,
+}
+
 # DRF Spectacular Configuration (OpenAPI/Swagger)
 SPECTACULAR_SETTINGS = {
     'TITLE': 'TaskMaster API',
@@ -189,5 +375,9 @@ CORS_ALLOWED_ORIGINS = [
     "http://localhost:5173",
 ]
 
+# Cabeceras de peticiones condicionales (ETag) visibles para el frontend.
+CORS_ALLOW_HEADERS = (*default_headers, "if-match", "if-none-match")
+CORS_EXPOSE_HEADERS = ["ETag", "Last-Modified", "X-Cache", "Server-Timing"]
+
 # Si usas credenciales (cookies/session) desde el frontend, habilita:
 # CORS_ALLOW_CREDENTIALS = True
@@ -19,14 +19,19 @@ from django.urls import path, include
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView, SpectacularRedocView
 from rest_framework.routers import DefaultRouter
 
+from common.async_views import async_list_routes
 from tasks.urls import router as tasks_router
 from users.urls import router as users_router
+from users.views import progress_change_stream
 
 # Router unificado para exponer todos los endpoints bajo /api/
 api_router = DefaultRouter()
 api_router.registry.extend(tasks_router.registry)
 api_router.registry.extend(users_router.registry)
 
+# Listados de más tráfico: bajo ASGI sus GET se resuelven con vistas asíncronas.
+ASYNC_LIST_ROUTES = {"study-topics-list", "block-tasks-list", "student-task-progress-list"}
+
 urlpatterns = [
     # Admin
     path('admin/', admin.site.urls),
@@ -38,5 +43,6 @@ urlpatterns = [
     
     # API Endpoints
     path('api/health/', include('health.urls')),
-    path('api/', include(api_router.urls)),
+    path('api/changes/stream/', progress_change_stream, name='changes-stream'),
+    path('api/', include(async_list_routes(api_router.urls, ASYNC_LIST_ROUTES))),
 ]
@@ -0,0 +1,85 @@
+"""
+Métricas por endpoint: consultas SQL, tiempo de base de datos, tiempo de
+render, tamaño de la respuesta y duración total.
+
+Los contadores viven en memoria del proceso (como los clientes de
+Prometheus sin modo multiproceso): con varios workers cada uno expone los
+suyos y Prometheus los suma por instancia.
+"""
+
+import threading
+import time
+from collections import defaultdict
+
+METRICS = (
+    ("requests_total", "counter", "Peticiones atendidas."),
+    ("db_queries_total", "counter", "Consultas SQL ejecutadas."),
+    ("db_queries_max", "gauge", "Máximo de consultas SQL en una sola petición."),
+    ("db_seconds_total", "counter", "Tiempo total en la base de datos."),
+    ("render_seconds_total", "counter", "Tiempo total renderizando la respuesta (JSON)."),
+    ("response_bytes_total", "counter", "Bytes de respuesta enviados."),
+    ("request_seconds_total", "counter", "Duración total de las peticiones."),
+    ("query_budget_exceeded_total", "counter", "Peticiones que superaron su presupuesto de consultas."),
+)
+PREFIX = "taskmaster_"
+
+
+class QueryCollector:
+    """Envoltorio para `connection.execute_wrapper` que cuenta y cronometra las consultas."""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.seconds += time.perf_counter() - start
+            self.count += 1
+
+
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._series = defaultdict(lambda: dict.fromkeys([name for name, _, _ in METRICS], 0))
+
+    def observe(self, endpoint, method, queries, db_seconds, render_seconds, size, seconds, over_budget=False):
+        with self._lock:
+            series = self._series[(endpoint, method)]
+            series["requests_total"] += 1
+            series["db_queries_total"] += queries
+            series["db_queries_max"] = max(series["db_queries_max"], queries)
+            series["db_seconds_total"] += db_seconds
+            series["render_seconds_total"] += render_seconds
+            series["response_bytes_total"] += size
+            series["request_seconds_total"] += seconds
+            series["query_budget_exceeded_total"] += int(over_budget)
+
+    def snapshot(self):
+        with self._lock:
+            return {key: dict(series) for key, series in self._series.items()}
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+
+    def prometheus(self):
+        """Texto en el formato de exposición de Prometheus (0.0.4)."""
+        snapshot = sorted(self.snapshot().items())
+        lines = []
+        for name, kind, help_text in METRICS:
+            lines += [f"# HELP {PREFIX}{name} {help_text}", f"# TYPE {PREFIX}{name} {kind}"]
+            for (endpoint, method), series in snapshot:
+                value = series[name]
+                value = f"{value:.6f}" if isinstance(value, float) else value
+                lines.append(f'{PREFIX}{name}{{endpoint="{_escape(endpoint)}",method="{method}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+registry = Registry()
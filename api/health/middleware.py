@@ -0,0 +1,136 @@
+import logging
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+from .metrics import QueryCollector, registry
+
+logger = logging.getLogger(__name__)
+
+# Colector de la petición en curso. Las vistas asíncronas consultan desde
+# los hilos de `sync_to_async`, que heredan el contexto pero no las
+# conexiones del hilo que atiende la petición.
+_collector = ContextVar("query_collector", default=None)
+
+
+def _collect(execute, sql, params, many, context):
+    collector = _collector.get()
+    if collector is None:
+        return execute(sql, params, many, context)
+    return collector(execute, sql, params, many, context)
+
+
+def install_query_hook(connection, **kwargs):
+    """Deja `_collect` como primer envoltorio de la conexión, una sola vez."""
+    if _collect not in connection.execute_wrappers:
+        # Al principio: `execute_wrapper()` quita el último de la lista al salir.
+        connection.execute_wrappers.insert(0, _collect)
+
+
+connection_created.connect(install_query_hook, dispatch_uid="health.install_query_hook")
+
+
+class QueryBudgetExceeded(Exception):
+    """Una acción ejecutó más consultas que las permitidas en `QUERY_BUDGETS`."""
+
+
+def endpoint_name(request):
+    """`<basename>.<acción>` para los viewsets (p. ej. `study-topics.list`); si no, el nombre de la ruta."""
+    match = request.resolver_match
+    if match is None:
+        return None
+    actions = getattr(match.func, "actions", None)
+    if actions:
+        method = request.method.lower()
+        return f"{match.func.initkwargs.get('basename')}.{actions.get(method, method)}"
+    return match.view_name or match._func_path
+
+
+class QueryMetricsMiddleware:
+    """
+    Mide cada petición resuelta, bajo WSGI o ASGI: consultas y tiempo SQL
+    (con un `execute_wrapper` en cada conexión), tiempo de render de la
+    respuesta y tamaño. El render es solo el paso de `response.data` a JSON:
+    el serializer (o el `ValuesPlan`) corre dentro de la vista y sus
+    consultas perezosas se mezclan con las de la base, así que queda en el
+    tiempo total.
+
+    Los valores se acumulan por endpoint en `health.metrics.registry`, se
+    envían en la cabecera `Server-Timing` (si `SERVER_TIMING` está activo)
+    y se comparan con `QUERY_BUDGETS` según `QUERY_BUDGET_MODE`: `off`,
+    `log` (advertencia en el log) o `raise` (la petición falla; útil en
+    pruebas). En las respuestas en streaming solo se cuentan las consultas
+    hechas antes de empezar a enviar el cuerpo.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        # Las conexiones abiertas antes de cargar este módulo no pasaron por la señal.
+        for connection in connections.all(initialized_only=True):
+            install_query_hook(connection)
+        collector = QueryCollector()
+        token = _collector.set(collector)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _collector.reset(token)
+        return self.observe(request, response, collector, time.perf_counter() - start)
+
+    async def __acall__(self, request):
+        collector = QueryCollector()
+        token = _collector.set(collector)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _collector.reset(token)
+        return self.observe(request, response, collector, time.perf_counter() - start)
+
+    def observe(self, request, response, collector, seconds):
+        endpoint = endpoint_name(request)
+        if endpoint is None:
+            return response
+        render_seconds = getattr(request, "_render_seconds", 0.0)
+        size = 0 if response.streaming else len(response.content)
+        budget = settings.QUERY_BUDGETS.get(endpoint) if settings.QUERY_BUDGET_MODE != "off" else None
+        over_budget = budget is not None and collector.count > budget
+        registry.observe(
+            endpoint, request.method, collector.count, collector.seconds, render_seconds, size, seconds, over_budget
+        )
+
+        if settings.SERVER_TIMING:
+            response["Server-Timing"] = (
+                f'db;dur={collector.seconds * 1000:.1f};desc="{collector.count} queries", '
+                f"render;dur={render_seconds * 1000:.1f}, total;dur={seconds * 1000:.1f}"
+            )
+        if over_budget:
+            message = f"{endpoint}: {collector.count} consultas (presupuesto {budget})"
+            if settings.QUERY_BUDGET_MODE == "raise":
+                raise QueryBudgetExceeded(message)
+            if settings.QUERY_BUDGET_MODE == "log":
+                logger.warning(message)
+        return response
+
+    def process_template_response(self, request, response):
+        # Las respuestas de DRF se renderizan (JSON) después de la vista.
+        start = time.perf_counter()
+
+        def done(rendered):
+            request._render_seconds = time.perf_counter() - start
+
+        response.add_post_render_callback(done)
+        return response
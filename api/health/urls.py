@@ -1,7 +1,9 @@
 from django.urls import path
 
-from .views import HealthStatusView
+from .views import CacheMetricsView, HealthStatusView, MetricsView
 
 urlpatterns = [
     path("", HealthStatusView.as_view(), name="heath"),
+    path("cache/", CacheMetricsView.as_view(), name="health-cache"),
+    path("metrics/", MetricsView.as_view(), name="health-metrics"),
 ]
@@ -1,7 +1,12 @@
+from django.http import HttpResponse
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.permissions import AllowAny
 
+from common import cache
+
+from .metrics import registry
+
 
 class HealthStatusView(APIView):
     permission_classes = [AllowAny]
@@ -11,3 +16,21 @@ class HealthStatusView(APIView):
             "status": "ok",
             "service": "taskmaster-api",
         })
+
+
+class CacheMetricsView(APIView):
+    """Aciertos y fallos de la caché de respuestas por endpoint."""
+
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        return Response(cache.metrics())
+
+
+class MetricsView(APIView):
+    """Métricas por endpoint en formato de texto de Prometheus."""
+
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        return HttpResponse(registry.prometheus(), content_type="text/plain; version=0.0.4; charset=utf-8")
@@ -3,3 +3,10 @@ from django.apps import AppConfig
 
 class TasksConfig(AppConfig):
     name = 'tasks'
+
+    def ready(self):
+        from common.cache import track_generations
+
+        from .models import BlockTask, StudyBlock, StudyTopic
+
+        track_generations(StudyTopic, StudyBlock, BlockTask)
@@ -0,0 +1,384 @@
+"""
+Importación masiva de planes de estudio (temas → bloques → tareas).
+
+El documento se lee tema a tema, sin cargarlo completo:
+
+- JSON: una lista de temas, o temas concatenados / uno por línea (NDJSON).
+- YAML: un tema (o una lista de temas) por documento `---`.
+- CSV: una fila por tarea con columnas `topic.name`, `block.number`,
+  `task.order`, etc.; las filas consecutivas del mismo tema forman un tema.
+
+Cada tema se resuelve por claves naturales (`name`, `(topic, number)` y
+`(block, order)`) con una consulta por nivel, y se escribe con
+`bulk_create`/`bulk_update` en una transacción propia. Con `dry_run` solo
+se calcula la diferencia con la base de datos.
+"""
+
+import codecs
+import csv
+import json
+
+import yaml
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+
+from common.cache import bump_generation
+from .models import BlockTask, StudyBlock, StudyTopic
+
+TOPIC_FIELDS = ("description", "difficulty", "is_active")
+BLOCK_FIELDS = ("title", "description", "estimated_minutes", "is_published")
+TASK_FIELDS = ("title", "instructions", "resources", "estimated_minutes", "status")
+
+EXTENSIONS = {".json": "json", ".ndjson": "json", ".yaml": "yaml", ".yml": "yaml", ".csv": "csv"}
+
+BATCH_SIZE = 1000
+
+
+class CurriculumError(ValueError):
+    """El documento no se puede leer (sintaxis o estructura)."""
+
+
+# Lectura ---------------------------------------------------------------
+
+
+def _text_chunks(stream, size=64 * 1024):
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    while True:
+        chunk = stream.read(size)
+        if not chunk:
+            tail = decoder.decode(b"", final=True)
+            if tail:
+                yield tail
+            return
+        yield decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+
+
+def _text_lines(stream):
+    pending = ""
+    for chunk in _text_chunks(stream):
+        lines = (pending + chunk).split("\n")
+        pending = lines.pop()
+        for line in lines:
+            yield line + "\n"
+    if pending:
+        yield pending
+
+
+def iter_json(stream):
+    """Objetos de una lista JSON o de JSON concatenado, de a uno."""
+    decoder = json.JSONDecoder()
+    chunks = _text_chunks(stream)
+    buffer, in_array, eof, needed = "", None, False, 0
+
+    while True:
+        buffer = buffer.lstrip(" \t\r\n,") if in_array else buffer.lstrip()
+        if in_array is None and buffer:
+            in_array = buffer[0] == "["
+            buffer = buffer[1:] if in_array else buffer
+            continue
+        if in_array and buffer.startswith("]"):
+            return
+        if buffer and len(buffer) >= needed:
+            try:
+                obj, end = decoder.raw_decode(buffer)
+            except json.JSONDecodeError as exc:
+                if eof:
+                    raise CurriculumError(f"JSON inválido: {exc}") from exc
+                # Se vuelve a intentar cuando el buffer haya duplicado su tamaño,
+                # para no reanalizar un tema grande por cada fragmento leído.
+                needed = 2 * len(buffer)
+            else:
+                yield obj
+                buffer, needed = buffer[end:], 0
+                continue
+        elif not buffer and eof:
+            if in_array:
+                raise CurriculumError("JSON inválido: falta el `]` final.")
+            return
+
+        chunk = next(chunks, None)
+        if chunk is None:
+            eof, needed = True, 0
+        else:
+            buffer += chunk
+
+
+def iter_yaml(stream):
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    try:
+        for document in yaml.load_all(stream, Loader=loader):
+            if isinstance(document, list):
+                yield from document
+            elif document is not None:
+                yield document
+    except yaml.YAMLError as exc:
+        raise CurriculumError(f"YAML inválido: {exc}") from exc
+
+
+def _csv_value(name, value):
+    if name in ("is_active", "is_published"):
+        return value.strip().lower() in ("1", "true", "t", "yes", "si", "sí")
+    if name == "resources":
+        try:
+            return json.loads(value)
+        except ValueError:
+            return value
+    return value
+
+
+def iter_csv(stream):
+    """Arma un tema por cada grupo de filas consecutivas con el mismo `topic.name`."""
+    topic = None
+    for row in csv.DictReader(_text_lines(stream)):
+        parts = {"topic": {}, "block": {}, "task": {}}
+        for key, value in row.items():
+            level, _, name = (key or "").partition(".")
+            if level in parts and name and value not in (None, ""):
+                parts[level][name] = _csv_value(name, value)
+
+        if topic is None or parts["topic"].get("name") != topic.get("name"):
+            if topic is not None:
+                yield topic
+            topic = {**parts["topic"], "blocks": []}
+        if "number" in parts["block"]:
+            blocks = topic["blocks"]
+            if not blocks or blocks[-1].get("number") != parts["block"]["number"]:
+                blocks.append({**parts["block"], "tasks": []})
+            if parts["task"]:
+                blocks[-1]["tasks"].append(parts["task"])
+    if topic is not None:
+        yield topic
+
+
+READERS = {"json": iter_json, "yaml": iter_yaml, "csv": iter_csv}
+
+
+# Validación --------------------------------------------------------------
+
+
+def _clean(model, data, fields, path, errors, keys=(), required=()):
+    """Valida `data` con los campos del modelo; devuelve los valores limpios."""
+    if not isinstance(data, dict):
+        errors[path or "."] = ["Se esperaba un objeto."]
+        return None
+    unknown = set(data) - {*fields, *keys, "blocks", "tasks"}
+    if unknown:
+        errors[path or "."] = [f"Campos desconocidos: {', '.join(sorted(unknown))}."]
+
+    values = {}
+    for name in (*keys, *fields):
+        if name not in data:
+            if name in keys or name in required:
+                errors[f"{path}{name}"] = ["Este campo es obligatorio."]
+            continue
+        try:
+            values[name] = model._meta.get_field(name).clean(data[name], None)
+        except ValidationError as exc:
+            errors[f"{path}{name}"] = exc.messages
+    return values
+
+
+def _children(data, name, path, errors):
+    items = (data.get(name) or []) if isinstance(data, dict) else []
+    if not isinstance(items, list):
+        errors[f"{path}{name}"] = ["Se esperaba una lista."]
+        return []
+    return items
+
+
+def clean_topic(data):
+    """Devuelve `(tema, bloques, errores)` con los valores ya validados."""
+    errors = {}
+    topic = _clean(StudyTopic, data, TOPIC_FIELDS, "", errors, keys=("name",))
+    blocks = {}
+    for i, block_data in enumerate(_children(data, "blocks", "", errors)):
+        path = f"blocks[{i}]."
+        block = _clean(StudyBlock, block_data, BLOCK_FIELDS, path, errors, keys=("number",), required=("title",))
+        if block is None or "number" not in block:
+            continue
+        if block["number"] in blocks:
+            errors[f"{path}number"] = [f"Bloque {block['number']} repetido."]
+            continue
+        tasks = {}
+        for j, task_data in enumerate(_children(block_data, "tasks", path, errors)):
+            task_path = f"{path}tasks[{j}]."
+            task = _clean(
+                BlockTask, task_data, TASK_FIELDS, task_path, errors,
+                keys=("order",), required=("title", "instructions"),
+            )
+            if task is None or "order" not in task:
+                continue
+            if task["order"] in tasks:
+                errors[f"{task_path}order"] = [f"Tarea {task['order']} repetida en el bloque."]
+                continue
+            tasks[task.pop("order")] = task
+        blocks[block.pop("number")] = (block, tasks)
+    return topic, blocks, errors
+
+
+# Diferencia y escritura ------------------------------------------------
+
+
+def _changes(obj, values):
+    return {name: [getattr(obj, name), value] for name, value in values.items() if getattr(obj, name) != value}
+
+
+class TopicImport:
+    """Plan de importación de un tema: qué crear y qué actualizar."""
+
+    def __init__(self, data):
+        self.name = data.get("name") if isinstance(data, dict) else None
+        values, self.blocks, self.errors = clean_topic(data)
+        self.values = values or {}
+        self.topic = None
+        self.created = False
+        self.block_numbers = {}
+        self.topic_changes = {}
+        self.new_blocks, self.changed_blocks, self.new_tasks, self.changed_tasks = [], [], [], []
+        self.unchanged = {"blocks": 0, "tasks": 0}
+        if not self.errors:
+            self._plan()
+
+    def _plan(self):
+        name = self.values.pop("name")
+        self.name = name
+        self.topic = StudyTopic.objects.filter(name=name).first()
+        if self.topic is None:
+            self.topic = StudyTopic(name=name, **self.values)
+            self.created = True
+            existing_blocks, existing_tasks = {}, {}
+        else:
+            self.topic_changes = _changes(self.topic, self.values)
+            existing_blocks = {block.number: block for block in StudyBlock.objects.filter(topic=self.topic)}
+            self.block_numbers = {block.pk: number for number, block in existing_blocks.items()}
+            existing_tasks = {
+                (task.block_id, task.order): task for task in BlockTask.objects.filter(block__topic=self.topic)
+            }
+
+        for number, (values, tasks) in sorted(self.blocks.items()):
+            block = existing_blocks.get(number)
+            if block is None:
+                block = StudyBlock(number=number, **values)
+                self.new_blocks.append(block)
+            elif changes := _changes(block, values):
+                self.changed_blocks.append((block, changes))
+            else:
+                self.unchanged["blocks"] += 1
+
+            for order, task_values in sorted(tasks.items()):
+                task = existing_tasks.get((block.pk, order)) if block.pk else None
+                if task is None:
+                    self.new_tasks.append((block, BlockTask(order=order, **task_values)))
+                elif changes := _changes(task, task_values):
+                    self.changed_tasks.append((task, changes))
+                else:
+                    self.unchanged["tasks"] += 1
+
+    @property
+    def status(self):
+        if self.errors:
+            return "invalid"
+        if self.created:
+            return "created"
+        if self.topic_changes or self.new_blocks or self.changed_blocks or self.new_tasks or self.changed_tasks:
+            return "updated"
+        return "unchanged"
+
+    def diff(self):
+        """Cambios legibles, en el orden en que se aplicarían."""
+        key = self.name
+        lines = []
+        if self.created:
+            lines.append({"action": "create", "kind": "topic", "key": key})
+        elif self.topic_changes:
+            lines.append({"action": "update", "kind": "topic", "key": key, "fields": self.topic_changes})
+        for block in self.new_blocks:
+            lines.append({"action": "create", "kind": "block", "key": f"{key}/{block.number}"})
+        for block, changes in self.changed_blocks:
+            lines.append({"action": "update", "kind": "block", "key": f"{key}/{block.number}", "fields": changes})
+        for block, task in self.new_tasks:
+            lines.append({"action": "create", "kind": "task", "key": f"{key}/{block.number}/{task.order}"})
+        for task, changes in self.changed_tasks:
+            number = self.block_numbers[task.block_id]
+            lines.append({"action": "update", "kind": "task", "key": f"{key}/{number}/{task.order}", "fields": changes})
+        return lines
+
+    def summary(self, dry_run=False):
+        result = {"topic": self.name, "status": self.status}
+        if self.errors:
+            result["errors"] = self.errors
+            return result
+        result["blocks"] = {
+            "created": len(self.new_blocks), "updated": len(self.changed_blocks), "unchanged": self.unchanged["blocks"]
+        }
+        result["tasks"] = {
+            "created": len(self.new_tasks), "updated": len(self.changed_tasks), "unchanged": self.unchanged["tasks"]
+        }
+        if dry_run:
+            result["changes"] = self.diff()
+        return result
+
+    def apply(self):
+        """Escribe el plan en una transacción."""
+        if self.status in ("invalid", "unchanged"):
+            return
+        with transaction.atomic():
+            # Dentro de la transacción, para que `updated_at` no quede antes de su inicio (ver `common.sync`).
+            now = timezone.now()
+            if self.created or self.topic_changes:
+                for name, (_, value) in self.topic_changes.items():
+                    setattr(self.topic, name, value)
+                self.topic.save()
+
+            for block in self.new_blocks:
+                block.topic = self.topic
+            StudyBlock.objects.bulk_create(self.new_blocks, batch_size=BATCH_SIZE)
+            self._bulk_update(StudyBlock, self.changed_blocks, now)
+
+            for block, task in self.new_tasks:
+                task.block = block
+            BlockTask.objects.bulk_create([task for _, task in self.new_tasks], batch_size=BATCH_SIZE)
+            self._bulk_update(BlockTask, self.changed_tasks, now)
+
+            # Las escrituras en bloque no emiten señales: se invalida a mano.
+            bump_generation(StudyTopic, StudyBlock, BlockTask)
+            self._refresh_rollups()
+
+    def _bulk_update(self, model, changed, now):
+        fields = {"updated_at"}
+        for obj, changes in changed:
+            for name, (_, value) in changes.items():
+                setattr(obj, name, value)
+            fields.update(changes)
+            obj.updated_at = now
+        if changed:
+            model.objects.bulk_update([obj for obj, _ in changed], sorted(fields), batch_size=BATCH_SIZE)
+
+    def _refresh_rollups(self):
+        from users import rollups
+        from users.models import StudentTaskProgress
+
+        tasks = [task.pk for task, changes in self.changed_tasks if "estimated_minutes" in changes]
+        if tasks:
+            students = StudentTaskProgress.objects.filter(task_id__in=tasks).values_list("student_id", flat=True)
+            rollups.mark_dirty(students=set(students), tasks=tasks)
+
+
+def import_curriculum(documents, dry_run=False):
+    """
+    Importa los temas de `documents` (la salida de uno de `READERS`).
+
+    Devuelve un resumen por tema. Los temas con errores de validación se
+    omiten sin afectar a los demás; un documento ilegible lanza
+    `CurriculumError`.
+    """
+    results = []
+    totals = {"created": 0, "updated": 0, "unchanged": 0, "invalid": 0}
+    for data in documents:
+        plan = TopicImport(data)
+        if not dry_run:
+            plan.apply()
+        results.append(plan.summary(dry_run=dry_run))
+        totals[plan.status] += 1
+    return {"dry_run": dry_run, "totals": totals, "topics": results}
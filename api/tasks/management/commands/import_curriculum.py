@@ -0,0 +1,63 @@
+import os
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks import curriculum
+
+
+class Command(BaseCommand):
+    help = "Importa temas, bloques y tareas desde un documento JSON, YAML o CSV."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Archivo a importar (`-` para leer de la entrada estándar).")
+        parser.add_argument(
+            "--format",
+            choices=sorted(curriculum.READERS),
+            help="Formato del documento; por defecto se deduce de la extensión.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Muestra los cambios sin escribir nada.",
+        )
+
+    def handle(self, *args, path, format, dry_run, **options):
+        fmt = format or curriculum.EXTENSIONS.get(os.path.splitext(path)[1].lower())
+        if fmt is None:
+            raise CommandError("No se pudo deducir el formato; usa --format.")
+
+        try:
+            if path == "-":
+                report = curriculum.import_curriculum(curriculum.READERS[fmt](sys.stdin.buffer), dry_run=dry_run)
+            else:
+                with open(path, "rb") as stream:
+                    report = curriculum.import_curriculum(curriculum.READERS[fmt](stream), dry_run=dry_run)
+        except (OSError, curriculum.CurriculumError) as exc:
+            raise CommandError(str(exc))
+
+        for topic in report["topics"]:
+            self._write_topic(topic)
+        totals = ", ".join(f"{status}: {count}" for status, count in report["totals"].items())
+        prefix = "Simulación" if dry_run else "Importación"
+        self.stdout.write(self.style.SUCCESS(f"{prefix} terminada ({totals})."))
+        if report["totals"]["invalid"]:
+            raise CommandError(f"{report['totals']['invalid']} temas con errores no se importaron.")
+
+    def _write_topic(self, topic):
+        if topic["status"] == "invalid":
+            self.stderr.write(self.style.ERROR(f"{topic['topic']}: inválido"))
+            for path, messages in topic["errors"].items():
+                self.stderr.write(f"  {path}: {' '.join(messages)}")
+            return
+        counts = " · ".join(
+            f"{kind} +{topic[kind]['created']} ~{topic[kind]['updated']} ={topic[kind]['unchanged']}"
+            for kind in ("blocks", "tasks")
+        )
+        self.stdout.write(f"{topic['topic']}: {topic['status']} ({counts})")
+        for change in topic.get("changes", ()):
+            sign = "+" if change["action"] == "create" else "~"
+            fields = "".join(
+                f"\n      {name}: {old!r} → {new!r}" for name, (old, new) in change.get("fields", {}).items()
+            )
+            self.stdout.write(f"  {sign} {change['kind']} {change['key']}{fields}")
@@ -0,0 +1,143 @@
+# Generated by Django 6.0.1 on 2026-10-18 21:00
+
+from django.db import migrations
+
+# Copia del SQL que generaba `common.search` para `tasks.search.INDEXES` al
+# crear la migración (Postgres con la configuración `simple`). Se guarda aquí
+# para que la migración no cambie cuando cambie ese código.
+INSTALL = {
+    'postgresql': [
+        'ALTER TABLE tasks_studytopic ADD COLUMN search_vector tsvector',
+        'CREATE INDEX tasks_studytopic_search_gin ON tasks_studytopic USING gin (search_vector)',
+        'CREATE FUNCTION tasks_studytopic_search_update() RETURNS trigger AS $$ BEGIN NEW.search_vector := '
+            "setweight(to_tsvector('simple', coalesce(NEW.name, '')), 'A') || setweight(to_tsvector('simple', "
+            "coalesce(NEW.description, '')), 'B'); RETURN NEW; END $$ LANGUAGE plpgsql",
+        'CREATE TRIGGER tasks_studytopic_search BEFORE INSERT OR UPDATE ON tasks_studytopic FOR EACH ROW EXECUTE '
+            'FUNCTION tasks_studytopic_search_update()',
+        'UPDATE tasks_studytopic SET search_vector = NULL',
+        'ALTER TABLE tasks_studyblock ADD COLUMN search_vector tsvector',
+        'CREATE INDEX tasks_studyblock_search_gin ON tasks_studyblock USING gin (search_vector)',
+        'CREATE FUNCTION tasks_studyblock_search_update() RETURNS trigger AS $$ BEGIN NEW.search_vector := '
+            "setweight(to_tsvector('simple', coalesce(NEW.title, '')), 'A') || setweight(to_tsvector('simple', "
+            "coalesce(NEW.description, '')), 'B') || setweight(to_tsvector('simple', coalesce((SELECT name FROM "
+            "tasks_studytopic WHERE id = NEW.topic_id), '')), 'C'); RETURN NEW; END $$ LANGUAGE plpgsql",
+        'CREATE TRIGGER tasks_studyblock_search BEFORE INSERT OR UPDATE ON tasks_studyblock FOR EACH ROW EXECUTE '
+            'FUNCTION tasks_studyblock_search_update()',
+        'CREATE FUNCTION tasks_studyblock_search_topic_name() RETURNS trigger AS $$ BEGIN UPDATE tasks_studyblock '
+            'SET search_vector = NULL WHERE topic_id = NEW.id; RETURN NULL; END $$ LANGUAGE plpgsql',
+        'CREATE TRIGGER tasks_studyblock_search_topic_name AFTER UPDATE OF name ON tasks_studytopic FOR EACH ROW '
+            'WHEN (OLD.name IS DISTINCT FROM NEW.name) EXECUTE FUNCTION tasks_studyblock_search_topic_name()',
+        'UPDATE tasks_studyblock SET search_vector = NULL',
+        'ALTER TABLE tasks_blocktask ADD COLUMN search_vector tsvector',
+        'CREATE INDEX tasks_blocktask_search_gin ON tasks_blocktask USING gin (search_vector)',
+        'CREATE FUNCTION tasks_blocktask_search_update() RETURNS trigger AS $$ BEGIN NEW.search_vector := '
+            "setweight(to_tsvector('simple', coalesce(NEW.title, '')), 'A') || setweight(to_tsvector('simple', "
+            "coalesce(NEW.instructions, '')), 'B') || setweight(to_tsvector('simple', coalesce((SELECT title FROM "
+            "tasks_studyblock WHERE id = NEW.block_id), '')), 'C'); RETURN NEW; END $$ LANGUAGE plpgsql",
+        'CREATE TRIGGER tasks_blocktask_search BEFORE INSERT OR UPDATE ON tasks_blocktask FOR EACH ROW EXECUTE '
+            'FUNCTION tasks_blocktask_search_update()',
+        'CREATE FUNCTION tasks_blocktask_search_block_title() RETURNS trigger AS $$ BEGIN UPDATE tasks_blocktask '
+            'SET search_vector = NULL WHERE block_id = NEW.id; RETURN NULL; END $$ LANGUAGE plpgsql',
+        'CREATE TRIGGER tasks_blocktask_search_block_title AFTER UPDATE OF title ON tasks_studyblock FOR EACH ROW '
+            'WHEN (OLD.title IS DISTINCT FROM NEW.title) EXECUTE FUNCTION tasks_blocktask_search_block_title()',
+        'UPDATE tasks_blocktask SET search_vector = NULL',
+    ],
+    'sqlite': [
+        "CREATE VIRTUAL TABLE tasks_studytopic_fts USING fts5(name, description, tokenize='unicode61 "
+            "remove_diacritics 2')",
+        'CREATE TRIGGER tasks_studytopic_fts_insert AFTER INSERT ON tasks_studytopic BEGIN INSERT INTO '
+            'tasks_studytopic_fts (rowid, name, description) VALUES (NEW.id, NEW.name, NEW.description); END',
+        'CREATE TRIGGER tasks_studytopic_fts_update AFTER UPDATE ON tasks_studytopic BEGIN DELETE FROM '
+            'tasks_studytopic_fts WHERE rowid = OLD.id; INSERT INTO tasks_studytopic_fts (rowid, name, description) '
+            'VALUES (NEW.id, NEW.name, NEW.description); END',
+        'CREATE TRIGGER tasks_studytopic_fts_delete AFTER DELETE ON tasks_studytopic BEGIN DELETE FROM '
+            'tasks_studytopic_fts WHERE rowid = OLD.id; END',
+        'INSERT INTO tasks_studytopic_fts (rowid, name, description) SELECT id, name, description FROM '
+            'tasks_studytopic',
+        "CREATE VIRTUAL TABLE tasks_studyblock_fts USING fts5(title, description, topic_name, tokenize='unicode61 "
+            "remove_diacritics 2')",
+        'CREATE TRIGGER tasks_studyblock_fts_insert AFTER INSERT ON tasks_studyblock BEGIN INSERT INTO '
+            'tasks_studyblock_fts (rowid, title, description, topic_name) VALUES (NEW.id, NEW.title, NEW.description, '
+            '(SELECT name FROM tasks_studytopic WHERE id = NEW.topic_id)); END',
+        'CREATE TRIGGER tasks_studyblock_fts_update AFTER UPDATE ON tasks_studyblock BEGIN DELETE FROM '
+            'tasks_studyblock_fts WHERE rowid = OLD.id; INSERT INTO tasks_studyblock_fts (rowid, title, description, '
+            'topic_name) VALUES (NEW.id, NEW.title, NEW.description, (SELECT name FROM tasks_studytopic WHERE id = '
+            'NEW.topic_id)); END',
+        'CREATE TRIGGER tasks_studyblock_fts_delete AFTER DELETE ON tasks_studyblock BEGIN DELETE FROM '
+            'tasks_studyblock_fts WHERE rowid = OLD.id; END',
+        'CREATE TRIGGER tasks_studyblock_fts_topic_name AFTER UPDATE OF name ON tasks_studytopic BEGIN UPDATE '
+            'tasks_studyblock_fts SET topic_name = NEW.name WHERE rowid IN (SELECT id FROM tasks_studyblock WHERE '
+            'topic_id = NEW.id); END',
+        'INSERT INTO tasks_studyblock_fts (rowid, title, description, topic_name) SELECT id, title, description, '
+            '(SELECT name FROM tasks_studytopic WHERE id = tasks_studyblock.topic_id) FROM tasks_studyblock',
+        'CREATE VIRTUAL TABLE tasks_blocktask_fts USING fts5(title, instructions, block_title, '
+            "tokenize='unicode61 remove_diacritics 2')",
+        'CREATE TRIGGER tasks_blocktask_fts_insert AFTER INSERT ON tasks_blocktask BEGIN INSERT INTO '
+            'tasks_blocktask_fts (rowid, title, instructions, block_title) VALUES (NEW.id, NEW.title, '
+            'NEW.instructions, (SELECT title FROM tasks_studyblock WHERE id = NEW.block_id)); END',
+        'CREATE TRIGGER tasks_blocktask_fts_update AFTER UPDATE ON tasks_blocktask BEGIN DELETE FROM '
+            'tasks_blocktask_fts WHERE rowid = OLD.id; INSERT INTO tasks_blocktask_fts (rowid, title, instructions, '
+            'block_title) VALUES (NEW.id, NEW.title, NEW.instructions, (SELECT title FROM tasks_studyblock WHERE id = '
+            'NEW.block_id)); END',
+        'CREATE TRIGGER tasks_blocktask_fts_delete AFTER DELETE ON tasks_blocktask BEGIN DELETE FROM '
+            'tasks_blocktask_fts WHERE rowid = OLD.id; END',
+        'CREATE TRIGGER tasks_blocktask_fts_block_title AFTER UPDATE OF title ON tasks_studyblock BEGIN UPDATE '
+            'tasks_blocktask_fts SET block_title = NEW.title WHERE rowid IN (SELECT id FROM tasks_blocktask WHERE '
+            'block_id = NEW.id); END',
+        'INSERT INTO tasks_blocktask_fts (rowid, title, instructions, block_title) SELECT id, title, '
+            'instructions, (SELECT title FROM tasks_studyblock WHERE id = tasks_blocktask.block_id) FROM '
+            'tasks_blocktask',
+    ],
+}
+
+UNINSTALL = {
+    'postgresql': [
+        'DROP TRIGGER IF EXISTS tasks_blocktask_search_block_title ON tasks_studyblock',
+        'DROP FUNCTION IF EXISTS tasks_blocktask_search_block_title()',
+        'DROP TRIGGER IF EXISTS tasks_blocktask_search ON tasks_blocktask',
+        'DROP FUNCTION IF EXISTS tasks_blocktask_search_update()',
+        'ALTER TABLE tasks_blocktask DROP COLUMN IF EXISTS search_vector',
+        'DROP TRIGGER IF EXISTS tasks_studyblock_search_topic_name ON tasks_studytopic',
+        'DROP FUNCTION IF EXISTS tasks_studyblock_search_topic_name()',
+        'DROP TRIGGER IF EXISTS tasks_studyblock_search ON tasks_studyblock',
+        'DROP FUNCTION IF EXISTS tasks_studyblock_search_update()',
+        'ALTER TABLE tasks_studyblock DROP COLUMN IF EXISTS search_vector',
+        'DROP TRIGGER IF EXISTS tasks_studytopic_search ON tasks_studytopic',
+        'DROP FUNCTION IF EXISTS tasks_studytopic_search_update()',
+        'ALTER TABLE tasks_studytopic DROP COLUMN IF EXISTS search_vector',
+    ],
+    'sqlite': [
+        'DROP TRIGGER IF EXISTS tasks_blocktask_fts_insert',
+        'DROP TRIGGER IF EXISTS tasks_blocktask_fts_update',
+        'DROP TRIGGER IF EXISTS tasks_blocktask_fts_delete',
+        'DROP TRIGGER IF EXISTS tasks_blocktask_fts_block_title',
+        'DROP TABLE IF EXISTS tasks_blocktask_fts',
+        'DROP TRIGGER IF EXISTS tasks_studyblock_fts_insert',
+        'DROP TRIGGER IF EXISTS tasks_studyblock_fts_update',
+        'DROP TRIGGER IF EXISTS tasks_studyblock_fts_delete',
+        'DROP TRIGGER IF EXISTS tasks_studyblock_fts_topic_name',
+        'DROP TABLE IF EXISTS tasks_studyblock_fts',
+        'DROP TRIGGER IF EXISTS tasks_studytopic_fts_insert',
+        'DROP TRIGGER IF EXISTS tasks_studytopic_fts_update',
+        'DROP TRIGGER IF EXISTS tasks_studytopic_fts_delete',
+        'DROP TABLE IF EXISTS tasks_studytopic_fts',
+    ],
+}
+
+
+def run(statements):
+    def operation(apps, schema_editor):
+        for sql in statements.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(sql, params=None)
+    return operation
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(run(INSTALL), run(UNINSTALL)),
+    ]
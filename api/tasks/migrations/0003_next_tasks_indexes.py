@@ -0,0 +1,21 @@
+# Generated by Django 6.0.1 on 2026-10-18 21:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0002_search_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='blocktask',
+            index=models.Index(condition=models.Q(('status', 'available')), fields=['block', 'order'], name='task_available_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studyblock',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['number', 'topic'], name='block_published_number_idx'),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 6.0.1 on 2026-10-18 21:33
+
+from django.db import migrations, models
+
+from common import sync
+
+SYNCED_MODELS = ("StudyTopic", "StudyBlock", "BlockTask")
+
+
+def _models(apps):
+    return [apps.get_model("tasks", name) for name in SYNCED_MODELS]
+
+
+def create_tombstone_triggers(apps, schema_editor):
+    sync.install(schema_editor, _models(apps))
+
+
+def drop_tombstone_triggers(apps, schema_editor):
+    sync.uninstall(schema_editor, _models(apps))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0003_tombstone'),
+        ('tasks', '0003_next_tasks_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='blocktask',
+            index=models.Index(fields=['updated_at'], name='task_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studyblock',
+            index=models.Index(fields=['updated_at'], name='block_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studytopic',
+            index=models.Index(fields=['updated_at'], name='topic_updated_idx'),
+        ),
+        migrations.RunPython(create_tombstone_triggers, drop_tombstone_triggers),
+    ]
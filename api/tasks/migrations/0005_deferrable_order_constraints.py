@@ -0,0 +1,30 @@
+# Generated by Django 6.0.1 on 2026-10-18 22:10
+
+from django.db import migrations
+
+from tasks.ordering import make_deferrable
+
+ORDERED_MODELS = ("StudyBlock", "BlockTask")
+
+
+def _models(apps):
+    return [apps.get_model("tasks", name) for name in ORDERED_MODELS]
+
+
+def make_order_constraints_deferrable(apps, schema_editor):
+    make_deferrable(schema_editor, _models(apps))
+
+
+def make_order_constraints_immediate(apps, schema_editor):
+    make_deferrable(schema_editor, _models(apps), deferrable=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0004_delta_sync'),
+    ]
+
+    operations = [
+        migrations.RunPython(make_order_constraints_deferrable, make_order_constraints_immediate),
+    ]
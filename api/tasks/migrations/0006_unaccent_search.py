@@ -0,0 +1,73 @@
+# Generated by Django 6.0.1 on 2026-10-18 22:20
+
+from django.db import migrations
+
+# Postgres pasa los índices de 0002 a la configuración sin acentos: basta con
+# redefinir las funciones de los triggers y recalcular `search_vector`. SQLite
+# ya quitaba los acentos (`remove_diacritics`) y no cambia. El SQL es una copia
+# fija, como en 0002.
+FORWARD = {
+    'postgresql': [
+        'CREATE EXTENSION IF NOT EXISTS unaccent',
+        "DO $$ BEGIN IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = 'taskmaster_unaccent') THEN CREATE "
+            'TEXT SEARCH CONFIGURATION taskmaster_unaccent (COPY = simple); ALTER TEXT SEARCH CONFIGURATION '
+            'taskmaster_unaccent ALTER MAPPING FOR hword, hword_part, word WITH unaccent, simple; END IF; END $$',
+        'CREATE OR REPLACE FUNCTION tasks_studytopic_search_update() RETURNS trigger AS $$ BEGIN '
+            "NEW.search_vector := setweight(to_tsvector('taskmaster_unaccent', coalesce(NEW.name, '')), 'A') || "
+            "setweight(to_tsvector('taskmaster_unaccent', coalesce(NEW.description, '')), 'B'); RETURN NEW; END $$ "
+            'LANGUAGE plpgsql',
+        'CREATE OR REPLACE FUNCTION tasks_studyblock_search_update() RETURNS trigger AS $$ BEGIN '
+            "NEW.search_vector := setweight(to_tsvector('taskmaster_unaccent', coalesce(NEW.title, '')), 'A') || "
+            "setweight(to_tsvector('taskmaster_unaccent', coalesce(NEW.description, '')), 'B') || "
+            "setweight(to_tsvector('taskmaster_unaccent', coalesce((SELECT name FROM tasks_studytopic WHERE id = "
+            "NEW.topic_id), '')), 'C'); RETURN NEW; END $$ LANGUAGE plpgsql",
+        'CREATE OR REPLACE FUNCTION tasks_blocktask_search_update() RETURNS trigger AS $$ BEGIN NEW.search_vector '
+            ":= setweight(to_tsvector('taskmaster_unaccent', coalesce(NEW.title, '')), 'A') || "
+            "setweight(to_tsvector('taskmaster_unaccent', coalesce(NEW.instructions, '')), 'B') || "
+            "setweight(to_tsvector('taskmaster_unaccent', coalesce((SELECT title FROM tasks_studyblock WHERE id = "
+            "NEW.block_id), '')), 'C'); RETURN NEW; END $$ LANGUAGE plpgsql",
+        'UPDATE tasks_studytopic SET search_vector = NULL',
+        'UPDATE tasks_studyblock SET search_vector = NULL',
+        'UPDATE tasks_blocktask SET search_vector = NULL',
+    ],
+}
+
+BACKWARD = {
+    'postgresql': [
+        'CREATE OR REPLACE FUNCTION tasks_studytopic_search_update() RETURNS trigger AS $$ BEGIN '
+            "NEW.search_vector := setweight(to_tsvector('simple', coalesce(NEW.name, '')), 'A') || "
+            "setweight(to_tsvector('simple', coalesce(NEW.description, '')), 'B'); RETURN NEW; END $$ LANGUAGE "
+            'plpgsql',
+        'CREATE OR REPLACE FUNCTION tasks_studyblock_search_update() RETURNS trigger AS $$ BEGIN '
+            "NEW.search_vector := setweight(to_tsvector('simple', coalesce(NEW.title, '')), 'A') || "
+            "setweight(to_tsvector('simple', coalesce(NEW.description, '')), 'B') || setweight(to_tsvector('simple', "
+            "coalesce((SELECT name FROM tasks_studytopic WHERE id = NEW.topic_id), '')), 'C'); RETURN NEW; END $$ "
+            'LANGUAGE plpgsql',
+        'CREATE OR REPLACE FUNCTION tasks_blocktask_search_update() RETURNS trigger AS $$ BEGIN NEW.search_vector '
+            ":= setweight(to_tsvector('simple', coalesce(NEW.title, '')), 'A') || setweight(to_tsvector('simple', "
+            "coalesce(NEW.instructions, '')), 'B') || setweight(to_tsvector('simple', coalesce((SELECT title FROM "
+            "tasks_studyblock WHERE id = NEW.block_id), '')), 'C'); RETURN NEW; END $$ LANGUAGE plpgsql",
+        'UPDATE tasks_studytopic SET search_vector = NULL',
+        'UPDATE tasks_studyblock SET search_vector = NULL',
+        'UPDATE tasks_blocktask SET search_vector = NULL',
+        'DROP TEXT SEARCH CONFIGURATION IF EXISTS taskmaster_unaccent',
+    ],
+}
+
+
+def run(statements):
+    def operation(apps, schema_editor):
+        for sql in statements.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(sql, params=None)
+    return operation
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0005_deferrable_order_constraints'),
+    ]
+
+    operations = [
+        migrations.RunPython(run(FORWARD), run(BACKWARD)),
+    ]
@@ -26,6 +26,10 @@ class StudyTopic(models.Model):
         verbose_name = "Tema de estudio"
         verbose_name_plural = "Temas de estudio"
         ordering = ["name"]
+        indexes = [
+            # Sincronización incremental (`?updated_since=`).
+            models.Index(fields=["updated_at"], name="topic_updated_idx"),
+        ]
 
     def __str__(self) -> str:
         return self.name
@@ -55,6 +59,13 @@ class StudyBlock(models.Model):
         unique_together = ("topic", "number")
         indexes = [
             models.Index(fields=["topic", "number"]),
+            # Siguientes tareas de un estudiante: bloques publicados en orden de número.
+            models.Index(
+                fields=["number", "topic"],
+                condition=models.Q(is_published=True),
+                name="block_published_number_idx",
+            ),
+            models.Index(fields=["updated_at"], name="block_updated_idx"),
         ]
 
     def __str__(self) -> str:
@@ -100,6 +111,13 @@ class BlockTask(models.Model):
         indexes = [
             models.Index(fields=["block", "order"]),
             models.Index(fields=["status"]),
+            # Siguientes tareas de un estudiante: tareas disponibles de cada bloque, en orden.
+            models.Index(
+                fields=["block", "order"],
+                condition=models.Q(status="available"),
+                name="task_available_order_idx",
+            ),
+            models.Index(fields=["updated_at"], name="task_updated_idx"),
         ]
 
     def __str__(self) -> str:
@@ -0,0 +1,107 @@
+"""
+Reordenamiento atómico de tareas dentro de un bloque y de bloques dentro de
+un tema.
+
+`(block, order)` y `(topic, number)` son únicos y la restricción se
+verifica fila a fila, así que una permutación no se puede escribir
+directamente:
+
+- En Postgres las dos restricciones son diferibles (`make_deferrable()`,
+  desde la migración `0005`): se difieren hasta el final del `UPDATE`, que
+  escribe las posiciones finales de una vez.
+- En SQLite no hay restricciones diferibles. Se hace en dos `UPDATE`:
+  primero cada fila que cambia pasa a su posición final más un
+  desplazamiento mayor que cualquier valor actual (no choca con nadie) y
+  después se resta el desplazamiento. SQLite guarda enteros de 64 bits, así
+  que el valor temporal no desborda la columna `smallint`, como pasaría en
+  Postgres.
+
+No se usa un rango negativo temporal: `PositiveSmallIntegerField` tiene un
+`CHECK >= 0`.
+"""
+
+from django.db import connections, transaction
+from django.db.models import Case, F, IntegerField, Value, When
+from django.utils import timezone
+
+from common.cache import bump_generation
+
+# Restricción única diferible (en Postgres) y sus columnas, por modelo.
+DEFERRABLE_CONSTRAINTS = {
+    "tasks.studyblock": ("block_topic_number_uniq", ("topic_id", "number")),
+    "tasks.blocktask": ("task_block_order_uniq", ("block_id", "order")),
+}
+
+
+def make_deferrable(schema_editor, models, deferrable=True):
+    """
+    Rehace como diferibles (o no) las restricciones únicas de `models`; para
+    usar desde una migración con `RunPython`. Solo en Postgres.
+    """
+    connection = schema_editor.connection
+    if connection.vendor != "postgresql":
+        return
+    qn = connection.ops.quote_name
+    mode = "DEFERRABLE INITIALLY IMMEDIATE" if deferrable else "NOT DEFERRABLE"
+    for model in models:
+        name, columns = DEFERRABLE_CONSTRAINTS[model._meta.label_lower]
+        table = model._meta.db_table
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(cursor, table)
+        # La de `unique_together` tiene un nombre generado por Django.
+        current = next(
+            key
+            for key, info in constraints.items()
+            if info["unique"] and not info["primary_key"] and info["columns"] == list(columns)
+        )
+        schema_editor.execute(
+            f"ALTER TABLE {qn(table)} DROP CONSTRAINT {qn(current)}, "
+            f"ADD CONSTRAINT {qn(name)} UNIQUE ({', '.join(qn(column) for column in columns)}) {mode}",
+            params=None,
+        )
+
+
+def reorder(queryset, field, ids):
+    """
+    Asigna `field` = 1..n a las filas de `queryset` siguiendo el orden de
+    `ids`, que debe contener exactamente los ids de esas filas.
+
+    Devuelve `False` si el orden ya era ese. Lanza `ValueError` si `ids` no
+    coincide con las filas.
+    """
+    with transaction.atomic():
+        current = dict(queryset.select_for_update().order_by().values_list("pk", field))
+        if len(set(ids)) != len(ids):
+            raise ValueError("La lista tiene ids repetidos.")
+        if set(ids) != set(current):
+            missing, unknown = sorted(set(current) - set(ids)), sorted(set(ids) - set(current))
+            raise ValueError(f"La lista debe tener todos los elementos (faltan {missing}, sobran {unknown}).")
+
+        positions = {pk: position for position, pk in enumerate(ids, start=1)}
+        changed = [pk for pk, position in positions.items() if current[pk] != position]
+        if not changed:
+            return False
+
+        rows = queryset.filter(pk__in=changed)
+        connection = connections[queryset.db]
+        if connection.vendor == "postgresql":
+            constraint = connection.ops.quote_name(DEFERRABLE_CONSTRAINTS[queryset.model._meta.label_lower][0])
+            with connection.cursor() as cursor:
+                cursor.execute(f"SET CONSTRAINTS {constraint} DEFERRED")
+                _assign(rows, field, positions, changed)
+                # Se verifica aquí y no al confirmar la transacción exterior.
+                cursor.execute(f"SET CONSTRAINTS {constraint} IMMEDIATE")
+        else:
+            offset = max(*current.values(), len(ids)) + 1
+            _assign(rows, field, {pk: offset + positions[pk] for pk in changed}, changed)
+            rows.update(**{field: F(field) - offset})
+        # `update()` no emite señales: se invalida la caché a mano.
+        bump_generation(queryset.model)
+    return True
+
+
+def _assign(rows, field, values, pks):
+    rows.update(
+        **{field: Case(*(When(pk=pk, then=Value(values[pk])) for pk in pks), output_field=IntegerField())},
+        updated_at=timezone.now(),
+    )
@@ -0,0 +1,35 @@
+from rest_framework.parsers import BaseParser
+
+from .curriculum import READERS
+
+
+class CurriculumParser(BaseParser):
+    """
+    Devuelve un generador de temas que lee el cuerpo a medida que la vista
+    los consume (ver `tasks.curriculum`).
+    """
+
+    format = None
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        return READERS[self.format](stream) if stream is not None else iter(())
+
+
+class CurriculumJSONParser(CurriculumParser):
+    media_type = "application/json"
+    format = "json"
+
+
+class CurriculumNDJSONParser(CurriculumParser):
+    media_type = "application/x-ndjson"
+    format = "json"
+
+
+class CurriculumYAMLParser(CurriculumParser):
+    media_type = "application/yaml"
+    format = "yaml"
+
+
+class CurriculumCSVParser(CurriculumParser):
+    media_type = "text/csv"
+    format = "csv"
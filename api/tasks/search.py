@@ -0,0 +1,19 @@
+"""Índices de texto completo del catálogo (ver `common.search`)."""
+
+from common.search import Related, SearchIndex
+
+TOPIC_INDEX = SearchIndex("tasks_studytopic", {"name": "A", "description": "B"})
+
+BLOCK_INDEX = SearchIndex(
+    "tasks_studyblock",
+    {"title": "A", "description": "B"},
+    related=[Related("topic_name", "tasks_studytopic", "topic_id", "name", "C")],
+)
+
+TASK_INDEX = SearchIndex(
+    "tasks_blocktask",
+    {"title": "A", "instructions": "B"},
+    related=[Related("block_title", "tasks_studyblock", "block_id", "title", "C")],
+)
+
+INDEXES = (TOPIC_INDEX, BLOCK_INDEX, TASK_INDEX)
@@ -1,9 +1,11 @@
 from rest_framework import serializers
 
+from common.serializers import SparseFieldsetsMixin
+
 from .models import BlockTask, StudyBlock, StudyTopic
 
 
-class BlockTaskSerializer(serializers.ModelSerializer):
+class BlockTaskSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     class Meta:
         model = BlockTask
         fields = [
@@ -21,7 +23,7 @@ class BlockTaskSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "created_at", "updated_at"]
 
 
-class StudyBlockSerializer(serializers.ModelSerializer):
+class StudyBlockSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     tasks = BlockTaskSerializer(many=True, read_only=True)
 
     class Meta:
@@ -41,7 +43,31 @@ class StudyBlockSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "created_at", "updated_at", "tasks"]
 
 
-class StudyTopicSerializer(serializers.ModelSerializer):
+class StudyBlockSummarySerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
+    """Bloque sin sus tareas; los totales salen de anotaciones del queryset."""
+
+    tasks_count = serializers.IntegerField(read_only=True)
+    total_estimated_minutes = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = StudyBlock
+        fields = [
+            "id",
+            "topic",
+            "number",
+            "title",
+            "description",
+            "estimated_minutes",
+            "is_published",
+            "created_at",
+            "updated_at",
+            "tasks_count",
+            "total_estimated_minutes",
+        ]
+        read_only_fields = fields
+
+
+class StudyTopicSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     blocks = StudyBlockSerializer(many=True, read_only=True)
 
     class Meta:
@@ -57,3 +83,52 @@ class StudyTopicSerializer(serializers.ModelSerializer):
             "blocks",
         ]
         read_only_fields = ["id", "created_at", "updated_at", "blocks"]
+
+
+class StudyTopicSummarySerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
+    """
+    Representación ligera para listados de temas.
+
+    Solo incluye contadores agregados; `blocks` aparece únicamente si el
+    contexto trae `expand` con `blocks` o `blocks.tasks`.
+    """
+
+    blocks_count = serializers.IntegerField(read_only=True)
+    tasks_count = serializers.IntegerField(read_only=True)
+    total_estimated_minutes = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = StudyTopic
+        fields = [
+            "id",
+            "name",
+            "description",
+            "difficulty",
+            "is_active",
+            "created_at",
+            "updated_at",
+            "blocks_count",
+            "tasks_count",
+            "total_estimated_minutes",
+        ]
+        read_only_fields = fields
+
+    def get_expanded_fields(self, fields):
+        expand = self.context.get("expand", frozenset())
+        if "blocks.tasks" in expand:
+            fields["blocks"] = StudyBlockSerializer(many=True, read_only=True)
+        elif "blocks" in expand:
+            fields["blocks"] = StudyBlockSummarySerializer(many=True, read_only=True)
+        return fields
+
+
+class TaskReorderSerializer(serializers.Serializer):
+    """Nuevo orden de las tareas de un bloque: todos sus ids, del primero al último."""
+
+    tasks = serializers.ListField(child=serializers.IntegerField(min_value=1), allow_empty=False)
+
+
+class BlockReorderSerializer(serializers.Serializer):
+    """Nuevo orden de los bloques de un tema: todos sus ids, del primero al último."""
+
+    blocks = serializers.ListField(child=serializers.IntegerField(min_value=1), allow_empty=False)
@@ -1,43 +1,229 @@
-from rest_framework import viewsets
+from django.db.models import Count, Prefetch, Sum, Value
+from django.db.models.functions import Coalesce
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
 
+from common.export import ExportMixin
+from common.sync import DeltaSyncMixin
+from common.views import (
+    CachedResponseMixin,
+    ConditionalRequestMixin,
+    SparseFieldsetsViewMixin,
+    ValuesListMixin,
+)
+from users.assignment import assign_cohort
+from users.models import AssignmentJob
+from users.serializers import AssignmentJobSerializer, AssignmentRequestSerializer
+
+from .curriculum import CurriculumError, import_curriculum
 from .models import BlockTask, StudyBlock, StudyTopic
+from .ordering import reorder
+from .parsers import CurriculumCSVParser, CurriculumJSONParser, CurriculumNDJSONParser, CurriculumYAMLParser
+from .search import BLOCK_INDEX, TASK_INDEX, TOPIC_INDEX
 from .serializers import (
+    BlockReorderSerializer,
     BlockTaskSerializer,
     StudyBlockSerializer,
     StudyTopicSerializer,
+    StudyTopicSummarySerializer,
+    TaskReorderSerializer,
 )
 
+# Niveles que `?expand=` acepta en el listado de temas.
+TOPIC_EXPANSIONS = {"blocks", "blocks.tasks"}
+# Acciones que devuelven el objeto con sus hijos anidados.
+NESTED_DETAIL_ACTIONS = {"retrieve", "update", "partial_update"}
+
+
+def assign_response(request, **target):
+    """Valida la cohorte y asigna `target` (tema o bloque) a sus estudiantes."""
+    serializer = AssignmentRequestSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    try:
+        job = assign_cohort(serializer.validated_data, **target)
+    except ValueError as exc:
+        raise ValidationError({"filter": {field: list(errors) for field, errors in exc.args[0].items()}})
+    code = status.HTTP_202_ACCEPTED if job.status == AssignmentJob.Status.PENDING else status.HTTP_200_OK
+    return Response(AssignmentJobSerializer(job).data, status=code)
+
+
+def reorder_response(request, serializer_class, queryset, field):
+    """Valida la lista de ids y aplica el nuevo orden sobre `queryset`."""
+    serializer = serializer_class(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    key, ids = next(iter(serializer.validated_data.items()))
+    try:
+        reorder(queryset, field, ids)
+    except ValueError as exc:
+        raise ValidationError({key: [str(exc)]})
+    return Response({key: ids})
+
 
-class StudyTopicViewSet(viewsets.ModelViewSet):
-    """CRUD de temas de estudio."""
+def _task_totals(prefix=""):
+    """Anotaciones de cantidad y minutos totales de las tareas bajo `prefix`."""
+    return {
+        "tasks_count": Count(f"{prefix}tasks"),
+        "total_estimated_minutes": Coalesce(Sum(f"{prefix}tasks__estimated_minutes"), Value(0)),
+    }
 
-    queryset = StudyTopic.objects.prefetch_related("blocks__tasks").all()
+
+class StudyTopicViewSet(
+    DeltaSyncMixin, ConditionalRequestMixin, CachedResponseMixin, ExportMixin, SparseFieldsetsViewMixin,
+    viewsets.ModelViewSet,
+):
+    """
+    CRUD de temas de estudio.
+
+    El listado devuelve un resumen con contadores calculados en la base de
+    datos; `?expand=blocks` o `?expand=blocks.tasks` agregan los niveles
+    pedidos. El detalle conserva el árbol completo tema → bloques → tareas.
+    """
+
+    queryset = StudyTopic.objects.all()
     serializer_class = StudyTopicSerializer
     permission_classes = [AllowAny]
     lookup_field = "id"
     filterset_fields = ["difficulty", "is_active"]
     search_fields = ["name", "description"]
+    search_index = TOPIC_INDEX
+    export_fields = ("id", "name", "description", "difficulty", "is_active", "created_at", "updated_at")
     ordering_fields = ["name", "created_at", "updated_at"]
+    cache_dependencies = (StudyTopic, StudyBlock, BlockTask)
+    # Parámetros que la lectura asíncrona del listado también resuelve (common.async_views).
+    async_query_params = ("expand", "fields", "omit")
+    throttle_scopes = {"list": "topics-list", "export": "exports"}
 
+    def get_expand(self):
+        raw = self.request.query_params.get("expand", "") if self.request else ""
+        expand = {item.strip() for item in raw.split(",")} & TOPIC_EXPANSIONS
+        if "blocks.tasks" in expand:
+            expand.add("blocks")
+        return frozenset(expand)
 
-class StudyBlockViewSet(viewsets.ModelViewSet):
-    """CRUD de bloques dentro de un tema."""
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action != "list":
+            if self.action not in NESTED_DETAIL_ACTIONS or "blocks" in self.get_omitted_fields():
+                return queryset
+            return queryset.prefetch_related("blocks__tasks")
 
-    queryset = (
-        StudyBlock.objects.select_related("topic")
-        .prefetch_related("tasks")
-        .all()
+        # Las consultas con GROUP BY no heredan Meta.ordering.
+        queryset = queryset.annotate(
+            blocks_count=Count("blocks", distinct=True),
+            **_task_totals("blocks__"),
+        ).order_by(*StudyTopic._meta.ordering)
+        expand = self.get_expand()
+        if "blocks" in self.get_omitted_fields():
+            expand = frozenset()
+        if "blocks.tasks" in expand:
+            queryset = queryset.prefetch_related("blocks__tasks")
+        elif "blocks" in expand:
+            blocks = StudyBlock.objects.annotate(**_task_totals())
+            queryset = queryset.prefetch_related(Prefetch("blocks", queryset=blocks))
+        return queryset
+
+    def get_serializer_class(self):
+        if self.action == "list":
+            return StudyTopicSummarySerializer
+        return super().get_serializer_class()
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.action == "list":
+            context["expand"] = self.get_expand()
+        return context
+
+    @action(detail=True, methods=["post"])
+    def assign(self, request, id=None):
+        """
+        Crea el progreso pendiente de todas las tareas disponibles del tema
+        (en bloques publicados) para una cohorte: `{"students": [ids]}` o
+        `{"filter": {...}}`. Las cohortes grandes responden 202 con el
+        trabajo en `/api/assignment-jobs/{id}/`.
+        """
+        return assign_response(request, topic=self.get_object())
+
+    @action(detail=True, methods=["post"], url_path="reorder-blocks")
+    def reorder_blocks(self, request, id=None):
+        """
+        Renumera los bloques del tema: `{"blocks": [ids]}` con todos sus
+        bloques en el nuevo orden (quedan con `number` 1..n).
+        """
+        topic = self.get_object()
+        return reorder_response(request, BlockReorderSerializer, StudyBlock.objects.filter(topic=topic), "number")
+
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="import",
+        url_name="import",
+        parser_classes=[CurriculumJSONParser, CurriculumNDJSONParser, CurriculumYAMLParser, CurriculumCSVParser],
     )
+    def import_curriculum(self, request):
+        """
+        Importa temas con sus bloques y tareas (JSON, NDJSON, YAML o CSV),
+        identificados por nombre, número de bloque y orden de tarea. Cada tema
+        se escribe en su propia transacción; `?dry_run=true` solo devuelve
+        los cambios que se aplicarían.
+        """
+        dry_run = request.query_params.get("dry_run", "").lower() in ("1", "true", "yes")
+        try:
+            report = import_curriculum(request.data, dry_run=dry_run)
+        except CurriculumError as exc:
+            raise ValidationError({"non_field_errors": [str(exc)]})
+        return Response(report)
+
+
+class StudyBlockViewSet(
+    DeltaSyncMixin, ConditionalRequestMixin, CachedResponseMixin, ExportMixin, SparseFieldsetsViewMixin,
+    viewsets.ModelViewSet,
+):
+    """CRUD de bloques dentro de un tema."""
+
+    queryset = StudyBlock.objects.select_related("topic").all()
     serializer_class = StudyBlockSerializer
     permission_classes = [AllowAny]
     lookup_field = "id"
     filterset_fields = ["topic", "is_published"]
     search_fields = ["title", "description", "topic__name"]
+    search_index = BLOCK_INDEX
+    export_fields = (
+        "id", "topic", "number", "title", "description", "estimated_minutes", "is_published",
+        "created_at", "updated_at",
+    )
     ordering_fields = ["topic", "number", "created_at", "updated_at"]
+    # `?search=` también busca en el nombre del tema.
+    cache_dependencies = (StudyTopic, StudyBlock, BlockTask)
+    throttle_scopes = {"export": "exports"}
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action not in NESTED_DETAIL_ACTIONS | {"list"} or "tasks" in self.get_omitted_fields():
+            return queryset
+        return queryset.prefetch_related("tasks")
 
+    @action(detail=True, methods=["post"])
+    def assign(self, request, id=None):
+        """Igual que la asignación de temas, limitada a las tareas de este bloque."""
+        return assign_response(request, block=self.get_object())
 
-class BlockTaskViewSet(viewsets.ModelViewSet):
+    @action(detail=True, methods=["post"])
+    def reorder(self, request, id=None):
+        """
+        Reordena las tareas del bloque en una transacción: `{"tasks": [ids]}`
+        con todas sus tareas en el nuevo orden (quedan con `order` 1..n).
+        """
+        block = self.get_object()
+        return reorder_response(request, TaskReorderSerializer, BlockTask.objects.filter(block=block), "order")
+
+
+class BlockTaskViewSet(
+    DeltaSyncMixin, ConditionalRequestMixin, CachedResponseMixin, ExportMixin, SparseFieldsetsViewMixin,
+    ValuesListMixin, viewsets.ModelViewSet,
+):
     """CRUD de tareas dentro de un bloque."""
 
     queryset = (
@@ -48,4 +234,15 @@ class BlockTaskViewSet(viewsets.ModelViewSet):
     lookup_field = "id"
     filterset_fields = ["block", "status", "block__topic"]
     search_fields = ["title", "instructions", "block__title"]
+    search_index = TASK_INDEX
+    export_fields = (
+        "id", "block", "block__topic", "title", "instructions", "resources", "estimated_minutes", "order",
+        "status", "created_at", "updated_at",
+    )
     ordering_fields = ["block", "order", "created_at", "updated_at"]
+    # `?search=` busca en el título del bloque y `?block__topic=` filtra por el tema.
+    cache_dependencies = (StudyTopic, StudyBlock, BlockTask)
+    async_query_params = ("fields", "omit")
+    throttle_scopes = {"list": "block-tasks-list", "export": "exports"}
+    # Clave del índice único (block, order) para `?pagination=cursor`.
+    keyset_fields = ("block", "order")
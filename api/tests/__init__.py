@@ -8,3 +8,25 @@ from .block_test import *  # noqa: F401,F403
 from .task_test import *  # noqa: F401,F403
 from .student_test import *  # noqa: F401,F403
 from .progress_test import *  # noqa: F401,F403
+from .pagination_test import *  # noqa: F401,F403
+from .bulk_test import *  # noqa: F401,F403
+from .assignment_test import *  # noqa: F401,F403
+from .rollup_test import *  # noqa: F401,F403
+from .cache_test import *  # noqa: F401,F403
+from .conditional_test import *  # noqa: F401,F403
+from .search_test import *  # noqa: F401,F403
+from .export_test import *  # noqa: F401,F403
+from .curriculum_test import *  # noqa: F401,F403
+from .reorder_test import *  # noqa: F401,F403
+from .metrics_test import *  # noqa: F401,F403
+from .query_count_test import *  # noqa: F401,F403
+from .seed_test import *  # noqa: F401,F403
+from .async_views_test import *  # noqa: F401,F403
+from .replica_test import *  # noqa: F401,F403
+from .fast_serializer_test import *  # noqa: F401,F403
+from .next_tasks_test import *  # noqa: F401,F403
+from .throttling_test import *  # noqa: F401,F403
+from .api_key_test import *  # noqa: F401,F403
+from .sessions_test import *  # noqa: F401,F403
+from .changes_test import *  # noqa: F401,F403
+from .sync_test import *  # noqa: F401,F403
@@ -0,0 +1,146 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, APITestCase
+
+from common import authentication
+from common.authentication import APIKeyAuthentication, ServiceClient, VerifiedKey
+from common.cache import bump_generation
+from common.models import ServiceAPIKey
+from common.throttling import APIKeyRateThrottle, UserRateThrottle
+
+RATES = {"anon": None, "user": None, "api-key": "5/min", "topics-list": None, "exports": None}
+
+
+@override_settings(API_KEY_USAGE_FLUSH_SECONDS=3600, API_KEY_USAGE_FLUSH_REQUESTS=1000)
+class APIKeyAuthenticationTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        authentication.verified_keys.clear()
+        authentication.usage.reset()
+        self.api_key, self.raw_key = ServiceAPIKey.objects.create_key(name="lms")
+
+    def tearDown(self):
+        authentication.usage.reset()
+
+    def authenticate(self, raw_key=None):
+        request = APIRequestFactory().get("/", HTTP_AUTHORIZATION=f"Api-Key {raw_key or self.raw_key}")
+        return APIKeyAuthentication().authenticate(Request(request))
+
+    def test_valid_key(self):
+        user, auth = self.authenticate()
+        self.assertIsInstance(user, ServiceClient)
+        self.assertTrue(user.is_authenticated)
+        self.assertIsInstance(auth, VerifiedKey)
+        self.assertEqual(auth.id, self.api_key.pk)
+
+    def test_without_header_falls_through(self):
+        request = Request(APIRequestFactory().get("/"))
+        self.assertIsNone(APIKeyAuthentication().authenticate(request))
+
+    def test_invalid_expired_and_revoked_keys_are_rejected(self):
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate(self.raw_key[:-1] + "x")
+        _, expired = ServiceAPIKey.objects.create_key(name="vieja", expiry_date=timezone.now() - timedelta(days=1))
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate(expired)
+        _, revoked = ServiceAPIKey.objects.create_key(name="revocada", revoked=True)
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate(revoked)
+
+    def test_verified_key_is_cached(self):
+        self.authenticate()
+        with self.assertNumQueries(1):  # Solo la generación de las claves.
+            self.authenticate()
+
+    def test_revocation_invalidates_cache(self):
+        self.authenticate()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.api_key.revoked = True
+            self.api_key.save()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+    def test_other_process_sees_revocation(self):
+        self.authenticate()
+        # Otro proceso revocó la clave: este conserva lo verificado y su caché
+        # local no se enteró; solo cambió la generación en la base.
+        ServiceAPIKey.objects.filter(pk=self.api_key.pk).update(revoked=True)
+        bump_generation(ServiceAPIKey)
+        cache.clear()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+    def test_cache_entry_expires(self):
+        self.authenticate()
+        with mock.patch.object(authentication.time, "monotonic", return_value=authentication.time.monotonic() + 61):
+            with self.assertNumQueries(2):
+                self.authenticate()
+
+    def test_usage_is_flushed_in_batches(self):
+        with override_settings(API_KEY_USAGE_FLUSH_REQUESTS=3):
+            with self.assertNumQueries(3):  # La verificación y las generaciones.
+                self.authenticate()
+                self.authenticate()
+            self.api_key.refresh_from_db()
+            self.assertEqual(self.api_key.request_count, 0)
+            with self.assertNumQueries(2):  # La generación y el UPDATE de los contadores.
+                self.authenticate()
+        self.api_key.refresh_from_db()
+        self.assertEqual(self.api_key.request_count, 3)
+        self.assertIsNotNone(self.api_key.last_used_at)
+
+
+@mock.patch.object(APIKeyRateThrottle, "THROTTLE_RATES", RATES)
+@mock.patch.object(UserRateThrottle, "THROTTLE_RATES", {**RATES, "user": "1/min"})
+class APIKeyThrottleTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        authentication.verified_keys.clear()
+        authentication.usage.reset()
+
+    def tearDown(self):
+        authentication.usage.reset()
+
+    def get(self, raw_key):
+        return self.client.get(reverse("study-topics-list"), HTTP_AUTHORIZATION=f"Api-Key {raw_key}")
+
+    def test_key_rate_overrides_scope(self):
+        _, raw_key = ServiceAPIKey.objects.create_key(name="lms", throttle_rate="2/min")
+        codes = [self.get(raw_key).status_code for _ in range(3)]
+        self.assertEqual(codes, [200, 200, 429])
+
+    def test_default_scope_and_keys_are_counted_apart(self):
+        _, first = ServiceAPIKey.objects.create_key(name="uno")
+        _, second = ServiceAPIKey.objects.create_key(name="dos")
+        # El límite por usuario (1/min) no se aplica a las claves.
+        codes = [self.get(first).status_code for _ in range(6)]
+        self.assertEqual(codes, [200] * 5 + [429])
+        self.assertEqual(self.get(second).status_code, status.HTTP_200_OK)
+
+    def test_invalid_key_is_forbidden(self):
+        self.assertEqual(self.get("nada.nada").status_code, status.HTTP_403_FORBIDDEN)
+
+
+class CreateAPIKeyCommandTests(APITestCase):
+    def test_creates_key(self):
+        out = StringIO()
+        call_command("create_api_key", "lms", "--rate", "600/min", stdout=out)
+        api_key = ServiceAPIKey.objects.get(name="lms")
+        self.assertEqual(api_key.throttle_rate, "600/min")
+        raw_key = out.getvalue().split(": ", 1)[1].split()[0]
+        self.assertTrue(api_key.is_valid(raw_key))
+
+    def test_rejects_invalid_rate(self):
+        with self.assertRaises(CommandError):
+            call_command("create_api_key", "lms", "--rate", "muchas", stdout=StringIO())
+        self.assertFalse(ServiceAPIKey.objects.exists())
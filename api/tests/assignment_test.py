@@ -0,0 +1,94 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from tasks.models import BlockTask, StudyBlock, StudyTopic
+from users.assignment import run_assignment_job
+from users.models import AssignmentJob, Student, StudentTaskProgress
+
+User = get_user_model()
+
+
+class CohortAssignmentTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.topic = StudyTopic.objects.create(name="Tema Cohorte")
+        cls.block = StudyBlock.objects.create(topic=cls.topic, number=1, title="Publicado")
+        hidden = StudyBlock.objects.create(topic=cls.topic, number=2, title="Oculto", is_published=False)
+        cls.tasks = [
+            BlockTask.objects.create(block=cls.block, title=f"Tarea {order}", instructions="-", order=order)
+            for order in (1, 2)
+        ]
+        BlockTask.objects.create(block=cls.block, title="Archivada", instructions="-", order=3, status="archived")
+        BlockTask.objects.create(block=hidden, title="En bloque oculto", instructions="-", order=1)
+        cls.students = [
+            Student.objects.create(user=User.objects.create(username=f"cohort_{i}"), full_name=f"Cohorte {i}")
+            for i in range(3)
+        ]
+        cls.done = StudentTaskProgress.objects.create(student=cls.students[0], task=cls.tasks[0], status="completed")
+
+    def _assign(self, payload, target="study-topics", pk=None):
+        return self.client.post(reverse(f"{target}-assign", args=[pk or self.topic.id]), payload, format="json")
+
+    def test_assign_topic_to_student_ids(self):
+        res = self._assign({"students": [s.id for s in self.students]})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.json()["status"], "completed")
+        # 3 estudiantes × 2 tareas asignables, menos el progreso que ya existía.
+        self.assertEqual(res.json()["created_rows"], 5)
+        self.assertEqual(StudentTaskProgress.objects.filter(task__block__topic=self.topic).count(), 6)
+        self.done.refresh_from_db()
+        self.assertEqual(self.done.status, "completed")
+
+    def test_assign_is_idempotent(self):
+        self._assign({"students": [self.students[1].id]})
+        res = self._assign({"students": [self.students[1].id]})
+        self.assertEqual(res.json()["created_rows"], 0)
+
+    def test_assign_block_with_filter(self):
+        res = self._assign({"filter": {"full_name": "Cohorte 2"}}, target="study-blocks", pk=self.block.id)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.json()["total_students"], 1)
+        self.assertEqual(StudentTaskProgress.objects.filter(student=self.students[2]).count(), 2)
+
+    def test_assign_does_not_load_rows(self):
+        # COUNT de la cohorte, alta del trabajo, INSERT ... SELECT (con su
+        # SAVEPOINT), los bloques a marcar en los resúmenes y las
+        # actualizaciones de avance.
+        with self.assertNumQueries(12):
+            self._assign({"students": [s.id for s in self.students]})
+
+    def test_requires_exactly_one_cohort_source(self):
+        self.assertEqual(self._assign({}).status_code, status.HTTP_400_BAD_REQUEST)
+        res = self._assign({"students": [1], "filter": {}})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_unknown_or_invalid_filters_are_rejected(self):
+        before = StudentTaskProgress.objects.count()
+        res = self._assign({"filter": {"nme": "nadie"}})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(list(res.json()["filter"]), ["nme"])
+        res = self._assign({"filter": {"started_after": "ayer"}})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(list(res.json()["filter"]), ["started_after"])
+        self.assertEqual(StudentTaskProgress.objects.count(), before)
+
+    @override_settings(ASSIGNMENT_ASYNC_THRESHOLD=1, ASSIGNMENT_CHUNK_SIZE=2)
+    def test_large_cohort_runs_as_background_job(self):
+        with mock.patch("users.assignment.start_job_thread") as start:
+            with self.captureOnCommitCallbacks(execute=True):
+                res = self._assign({"filter": {}})
+        self.assertEqual(res.status_code, status.HTTP_202_ACCEPTED)
+        job_id = res.json()["id"]
+        start.assert_called_once_with(job_id)
+
+        with mock.patch("users.assignment.connections.close_all"):
+            run_assignment_job(job_id)
+        job = self.client.get(reverse("assignment-jobs-detail", args=[job_id])).json()
+        self.assertEqual(job["status"], AssignmentJob.Status.COMPLETED)
+        self.assertEqual((job["processed_students"], job["total_students"]), (3, 3))
+        self.assertEqual(job["created_rows"], 5)
@@ -0,0 +1,112 @@
+from unittest import mock
+
+from asgiref.sync import iscoroutinefunction
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import resolve, reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from common.async_views import AsyncListReader
+from tasks.models import BlockTask, StudyBlock, StudyTopic
+from users.models import Student, StudentTaskProgress
+
+User = get_user_model()
+
+
+@override_settings(SERVER_TIMING=True)
+class AsyncListViewTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.student = Student.objects.create(user=User.objects.create(username="async"), full_name="Asíncrono")
+        for t in range(3):
+            topic = StudyTopic.objects.create(name=f"Tema Async {t}", difficulty="beginner")
+            for b in range(1, 3):
+                block = StudyBlock.objects.create(topic=topic, number=b, title=f"Bloque {b}")
+                for order in range(1, 5):
+                    task = BlockTask.objects.create(block=block, title=f"Tarea {order}", instructions="-", order=order)
+                    StudentTaskProgress.objects.create(student=cls.student, task=task)
+        cls.topic, cls.block = topic, block
+
+    def setUp(self):
+        cache.clear()
+
+    def get_both(self, route, params=None, **headers):
+        """Respuesta de la vista asíncrona y de la síncrona para la misma petición."""
+        url = reverse(route)
+        spy = mock.patch.object(AsyncListReader, "serialize", autospec=True, side_effect=AsyncListReader.serialize)
+        with spy as serialize:
+            async_response = self.client.get(url, params, **headers)
+        self.assertTrue(serialize.called or async_response.status_code == status.HTTP_304_NOT_MODIFIED)
+        cache.clear()
+        with mock.patch.object(AsyncListReader, "supports", return_value=False):
+            sync_response = self.client.get(url, params, **headers)
+        return async_response, sync_response
+
+    def assertSameResponse(self, async_response, sync_response):
+        self.assertEqual(async_response.status_code, sync_response.status_code)
+        self.assertEqual(async_response.content, sync_response.content)
+        for header in ("ETag", "X-Cache", "Content-Type"):
+            self.assertEqual(async_response.get(header), sync_response.get(header), header)
+        # La vista síncrona valida los filtros de relaciones dos veces (ETag y listado).
+        queries = [int(r["Server-Timing"].split('desc="')[1].split()[0]) for r in (async_response, sync_response)]
+        self.assertLessEqual(queries[0], queries[1])
+
+    def test_hot_list_routes_are_async(self):
+        for route in ("study-topics-list", "block-tasks-list", "student-task-progress-list"):
+            self.assertTrue(iscoroutinefunction(resolve(reverse(route)).func), route)
+        self.assertFalse(iscoroutinefunction(resolve(reverse("study-topics-detail", args=[self.topic.id])).func))
+
+    def test_responses_match_the_sync_viewset(self):
+        cases = [
+            ("study-topics-list", None),
+            ("study-topics-list", {"expand": "blocks.tasks", "difficulty": "beginner"}),
+            ("study-topics-list", {"fields": "id,name"}),
+            ("block-tasks-list", {"block__topic": self.topic.id, "status": "available"}),
+            ("block-tasks-list", {"page": 2}),
+            ("student-task-progress-list", {"student": self.student.id, "omit": "task_detail"}),
+        ]
+        for route, params in cases:
+            with self.subTest(route=route, params=params):
+                self.assertSameResponse(*self.get_both(route, params))
+
+    def test_conditional_and_cached_responses(self):
+        url = reverse("block-tasks-list")
+        first = self.client.get(url)
+        self.assertEqual(first["X-Cache"], "MISS")
+        self.assertEqual(self.client.get(url)["X-Cache"], "HIT")
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res["ETag"], first["ETag"])
+
+    def test_errors_match_the_sync_viewset(self):
+        for route, params in [
+            ("block-tasks-list", {"page": 99}),
+            ("block-tasks-list", {"status": "desconocido"}),
+            ("student-task-progress-list", {"student": 999999}),
+        ]:
+            with self.subTest(route=route, params=params):
+                async_response = self.client.get(reverse(route), params)
+                with mock.patch.object(AsyncListReader, "supports", return_value=False):
+                    sync_response = self.client.get(reverse(route), params)
+                self.assertGreaterEqual(async_response.status_code, 400)
+                self.assertEqual(async_response.status_code, sync_response.status_code)
+                self.assertEqual(async_response.json(), sync_response.json())
+
+    def test_other_requests_use_the_sync_viewset(self):
+        with mock.patch.object(AsyncListReader, "serialize", autospec=True) as serialize:
+            self.assertEqual(self.client.get(reverse("block-tasks-list"), {"search": "tarea"}).status_code, 200)
+            self.assertEqual(self.client.get(reverse("block-tasks-list"), {"pagination": "cursor"}).status_code, 200)
+            res = self.client.post(reverse("study-topics-list"), {"name": "Nuevo"}, format="json")
+            self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        serialize.assert_not_called()
+
+    async def test_asgi_request(self):
+        url = reverse("study-topics-list")
+        res = await self.async_client.get(url, {"expand": "blocks"})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.json()["count"], 3)
+        self.assertEqual(res["X-Cache"], "MISS")
+        # Las consultas del ORM asíncrono (en otro hilo) también se cuentan.
+        self.assertIn('desc="4 queries"', res["Server-Timing"])
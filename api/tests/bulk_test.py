@@ -0,0 +1,95 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from tasks.models import BlockTask, StudyBlock, StudyTopic
+from users.models import Student, StudentTaskProgress
+
+User = get_user_model()
+
+
+class StudentTaskProgressBulkTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        topic = StudyTopic.objects.create(name="Tema Masivo")
+        block = StudyBlock.objects.create(topic=topic, number=1, title="Bloque Masivo")
+        cls.tasks = [
+            BlockTask.objects.create(block=block, title=f"Tarea {order}", instructions="-", order=order)
+            for order in (1, 2)
+        ]
+        cls.students = [
+            Student.objects.create(user=User.objects.create(username=f"bulk_{i}"), full_name=f"Masivo {i}")
+            for i in range(2)
+        ]
+        cls.existing = StudentTaskProgress.objects.create(
+            student=cls.students[0], task=cls.tasks[0], status="completed", notes="hecho"
+        )
+        cls.url = reverse("student-task-progress-bulk")
+
+    def test_json_array_upserts_and_reports_per_row(self):
+        rows = [
+            {"student": self.students[0].id, "task": self.tasks[0].id, "status": "in_progress"},
+            {"student": self.students[1].id, "task": self.tasks[0].id},
+            {"student": self.students[1].id, "task": 999999},
+            {"student": "x"},
+        ]
+        res = self.client.post(self.url, rows, format="json")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        body = res.json()
+        self.assertEqual((body["created"], body["updated"], body["errors"]), (1, 1, 2))
+        self.assertEqual([r["status"] for r in body["results"]], ["updated", "created", "error", "error"])
+        self.assertEqual(body["results"][0]["id"], self.existing.id)
+        self.assertIn("task", body["results"][2]["errors"])
+
+        self.existing.refresh_from_db()
+        self.assertEqual(self.existing.status, "in_progress")
+        self.assertEqual(self.existing.notes, "hecho")
+        created = StudentTaskProgress.objects.get(id=body["results"][1]["id"])
+        self.assertEqual(created.status, "pending")
+
+    def test_rows_without_fields_keep_existing_progress(self):
+        rows = [{"student": self.students[0].id, "task": self.tasks[0].id}]
+        body = self.client.post(self.url, rows, format="json").json()
+        self.assertEqual(body["results"][0]["status"], "unchanged")
+        self.existing.refresh_from_db()
+        self.assertEqual(self.existing.status, "completed")
+
+    def test_ndjson_stream(self):
+        lines = [
+            json.dumps({"student": self.students[1].id, "task": task.id, "status": "pending"})
+            for task in self.tasks
+        ]
+        payload = ("\n".join(lines) + "\n{no es json}\n").encode()
+        res = self.client.post(self.url, payload, content_type="application/x-ndjson")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        body = res.json()
+        self.assertEqual((body["created"], body["errors"]), (2, 1))
+        self.assertEqual(StudentTaskProgress.objects.filter(student=self.students[1]).count(), 2)
+
+    @override_settings(BULK_BATCH_SIZE=2)
+    def test_one_lookup_query_per_batch(self):
+        rows = [
+            {"student": student.id, "task": task.id, "status": "pending"}
+            for student in self.students
+            for task in self.tasks
+        ]
+        # Por lote: consulta de validación + upsert, dentro de su SAVEPOINT.
+        with self.assertNumQueries(8):
+            res = self.client.post(self.url, rows, format="json")
+        self.assertEqual(res.json()["errors"], 0)
+
+    def test_empty_body_is_an_empty_batch(self):
+        for payload, content_type in (("[]", "application/json"), ("", "application/x-ndjson")):
+            with self.subTest(content_type=content_type):
+                res = self.client.post(self.url, payload, content_type=content_type)
+                self.assertEqual(res.status_code, status.HTTP_200_OK)
+                body = res.json()
+                self.assertEqual((body["created"], body["errors"], body["results"]), (0, 0, []))
+
+    def test_rejects_non_list_body(self):
+        res = self.client.post(self.url, {"student": 1}, format="json")
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,93 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from tasks.models import BlockTask, StudyBlock, StudyTopic
+from users.models import Student
+
+
+class CatalogResponseCacheTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.topic = StudyTopic.objects.create(name="Tema Caché")
+        cls.block = StudyBlock.objects.create(topic=cls.topic, number=1, title="Bloque Caché")
+        cls.task = BlockTask.objects.create(block=cls.block, title="Tarea Caché", instructions="-", order=1)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_repeated_get_is_served_from_cache(self):
+        url = reverse("study-topics-detail", args=[self.topic.id])
+        first = self.client.get(url)
+        self.assertEqual(first["X-Cache"], "MISS")
+        # Solo se consultan las generaciones y el `updated_at` del ETag.
+        with self.assertNumQueries(2):
+            second = self.client.get(url)
+        self.assertEqual(second["X-Cache"], "HIT")
+        self.assertEqual(second.json(), first.json())
+
+    def test_query_params_are_part_of_the_key(self):
+        url = reverse("block-tasks-list")
+        self.client.get(url, {"block": self.block.id})
+        self.assertEqual(self.client.get(url, {"block": self.block.id})["X-Cache"], "HIT")
+        self.assertEqual(self.client.get(url, {"block": self.block.id, "status": "available"})["X-Cache"], "MISS")
+
+    @override_settings(ALLOWED_HOSTS=["testserver", "api.example.com"])
+    def test_host_and_scheme_are_part_of_the_key(self):
+        # Los enlaces de paginación son absolutos.
+        url = reverse("block-tasks-list")
+        self.client.get(url)
+        self.assertEqual(self.client.get(url)["X-Cache"], "HIT")
+        self.assertEqual(self.client.get(url, HTTP_HOST="api.example.com")["X-Cache"], "MISS")
+        self.assertEqual(self.client.get(url, secure=True)["X-Cache"], "MISS")
+
+    def test_writes_invalidate_dependent_responses(self):
+        topic_url = reverse("study-topics-detail", args=[self.topic.id])
+        tasks_url = reverse("block-tasks-list")
+        self.client.get(topic_url)
+        self.client.get(tasks_url)
+
+        res = self.client.patch(
+            reverse("block-tasks-detail", args=[self.task.id]), {"title": "Renombrada"}, format="json"
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        res = self.client.get(topic_url)
+        self.assertEqual(res["X-Cache"], "MISS")
+        self.assertEqual(res.json()["blocks"][0]["tasks"][0]["title"], "Renombrada")
+        self.assertEqual(self.client.get(tasks_url)["X-Cache"], "MISS")
+
+        self.task.delete()
+        self.assertEqual(self.client.get(topic_url).json()["blocks"][0]["tasks"], [])
+
+    def test_unrelated_writes_keep_entries(self):
+        url = reverse("block-tasks-list")
+        self.client.get(url)
+        Student.objects.create(user=get_user_model().objects.create(username="otro"), full_name="Otro")
+        self.assertEqual(self.client.get(url)["X-Cache"], "HIT")
+
+    def test_parent_writes_invalidate_searches_over_them(self):
+        url = reverse("block-tasks-list")
+        self.assertEqual(len(self.client.get(url, {"search": "caché"}).json()["results"]), 1)
+        res = self.client.patch(
+            reverse("study-blocks-detail", args=[self.block.id]), {"title": "Geometria"}, format="json"
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.client.get(url, {"search": "geometria"}).json()["results"][0]["id"], self.task.id)
+
+        blocks_url = reverse("study-blocks-list")
+        self.client.get(blocks_url, {"search": "tema"})
+        self.topic.name = "Algebra"
+        self.topic.save()
+        res = self.client.get(blocks_url, {"search": "tema"})
+        self.assertEqual((res["X-Cache"], res.json()["results"]), ("MISS", []))
+
+    def test_metrics_endpoint(self):
+        url = reverse("study-blocks-list")
+        self.client.get(url)
+        self.client.get(url)
+        self.client.get(url)
+        metrics = self.client.get(reverse("health-cache")).json()["study-blocks"]
+        self.assertEqual(metrics, {"hits": 2, "misses": 1, "hit_ratio": 0.667})
@@ -0,0 +1,216 @@
+import io
+import json
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from tasks.models import BlockTask, StudyBlock, StudyTopic
+from users import changes
+from users.models import ProgressChange, Student, StudentTaskProgress
+
+User = get_user_model()
+
+
+def create_catalog(tasks=3):
+    block = StudyBlock.objects.create(topic=StudyTopic.objects.create(name="Tema"), number=1, title="Bloque")
+    return [
+        BlockTask.objects.create(block=block, title=f"Tarea {order}", instructions="-", order=order)
+        for order in range(1, tasks + 1)
+    ]
+
+
+def create_student(username):
+    return Student.objects.create(user=User.objects.create(username=username), full_name=username)
+
+
+class ChangeLogTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.tasks = create_catalog()
+        cls.ana, cls.beto = create_student("ana"), create_student("beto")
+
+    def setUp(self):
+        cache.clear()
+
+    def log(self):
+        return list(ProgressChange.objects.values_list("progress_id", "student_id", "operation"))
+
+    def test_triggers_record_every_write(self):
+        progress = StudentTaskProgress.objects.create(student=self.ana, task=self.tasks[0])
+        progress.status = "in_progress"
+        progress.save()
+        bulk = StudentTaskProgress.objects.bulk_create(
+            [StudentTaskProgress(student=self.ana, task=task) for task in self.tasks[1:]]
+        )
+        StudentTaskProgress.objects.filter(task=self.tasks[1]).update(status="completed")
+        pk, ana = progress.pk, self.ana.pk
+        progress.delete()
+        self.assertEqual(self.log(), [
+            (pk, ana, "created"),
+            (pk, ana, "updated"),
+            (bulk[0].pk, ana, "created"),
+            (bulk[1].pk, ana, "created"),
+            (bulk[0].pk, ana, "updated"),
+            (pk, ana, "deleted"),
+        ])
+        seqs = list(ProgressChange.objects.values_list("seq", flat=True))
+        self.assertEqual(seqs, sorted(set(seqs)))
+
+    def test_moving_progress_to_another_student_is_a_delete_for_the_first(self):
+        progress = StudentTaskProgress.objects.create(student=self.ana, task=self.tasks[0])
+        StudentTaskProgress.objects.filter(pk=progress.pk).update(student=self.beto)
+        self.assertEqual(self.log()[1:], [
+            (progress.pk, self.ana.pk, "deleted"),
+            (progress.pk, self.beto.pk, "updated"),
+        ])
+        data = changes.read(0)
+        self.assertEqual([(c["student"], c["operation"]) for c in data["results"]],
+                         [(self.ana.pk, "deleted"), (self.beto.pk, "updated")])
+        self.assertIsNone(data["results"][0]["progress"])
+
+    def test_endpoint_returns_coalesced_deltas_with_current_state(self):
+        url = reverse("changes-list")
+        start = self.client.get(url).json()
+        self.assertEqual(start, {"results": [], "last_seq": 0, "has_more": False})
+
+        first = StudentTaskProgress.objects.create(student=self.ana, task=self.tasks[0])
+        second = StudentTaskProgress.objects.create(student=self.beto, task=self.tasks[1])
+        first.status = "completed"
+        first.save()
+
+        response = self.client.get(url, {"since": start["last_seq"]})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        body = response.json()
+        self.assertEqual([(c["id"], c["operation"]) for c in body["results"]],
+                         [(second.pk, "created"), (first.pk, "updated")])
+        detail = self.client.get(reverse("student-task-progress-detail", args=[first.pk])).json()
+        self.assertEqual(body["results"][1]["progress"], detail)
+        self.assertEqual(body["last_seq"], ProgressChange.objects.latest("seq").seq)
+        self.assertFalse(body["has_more"])
+
+        # Desde el último seq no hay nada nuevo.
+        self.assertEqual(self.client.get(url, {"since": body["last_seq"]}).json()["results"], [])
+
+    def test_student_filter_and_limit(self):
+        for task in self.tasks:
+            StudentTaskProgress.objects.create(student=self.ana, task=task)
+        StudentTaskProgress.objects.create(student=self.beto, task=self.tasks[0])
+        url = reverse("changes-list")
+
+        body = self.client.get(url, {"since": 0, "student": self.beto.pk}).json()
+        self.assertEqual([c["student"] for c in body["results"]], [self.beto.pk])
+
+        body = self.client.get(url, {"since": 0, "limit": 2}).json()
+        self.assertEqual(len(body["results"]), 2)
+        self.assertTrue(body["has_more"])
+        rest = self.client.get(url, {"since": body["last_seq"], "limit": 2}).json()
+        self.assertEqual(len(rest["results"]), 2)
+        self.assertFalse(rest["has_more"])
+
+    def test_changes_are_read_in_transaction_order(self):
+        first = StudentTaskProgress.objects.create(student=self.ana, task=self.tasks[0])
+        second = StudentTaskProgress.objects.create(student=self.ana, task=self.tasks[1])
+        # Como en Postgres cuando la transacción del primero se confirma después.
+        ProgressChange.objects.filter(progress_id=first.pk).update(xact_id=20)
+        ProgressChange.objects.filter(progress_id=second.pk).update(xact_id=10)
+        second_seq = ProgressChange.objects.get(progress_id=second.pk).seq
+
+        page = changes.read(0)
+        self.assertEqual([c["id"] for c in page["results"]], [second.pk, first.pk])
+        self.assertEqual(changes.last_seq(), page["last_seq"])
+        # Desde el segundo todavía falta el primero, aunque tenga un seq menor.
+        self.assertEqual([c["id"] for c in changes.read(second_seq)["results"]], [first.pk])
+        self.assertEqual(changes.read(page["last_seq"])["results"], [])
+
+    def test_invalid_params(self):
+        response = self.client.get(reverse("changes-list"), {"since": -1, "limit": 5000})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(set(response.json()), {"since", "limit"})
+
+    def test_pruned_changes_are_gone(self):
+        for task in self.tasks:
+            StudentTaskProgress.objects.create(student=self.ana, task=task)
+        first = ProgressChange.objects.earliest("seq").seq
+        ProgressChange.objects.update(changed_at=timezone.now() - timedelta(days=30))
+
+        call_command("prune_progress_changes", "--days", "7", "--batch-size", "1", stdout=io.StringIO())
+        # Siempre queda el último: así se reconoce un `since` ya borrado.
+        self.assertEqual(ProgressChange.objects.count(), 1)
+        response = self.client.get(reverse("changes-list"), {"since": first})
+        self.assertEqual(response.status_code, status.HTTP_410_GONE)
+        latest = ProgressChange.objects.get().seq
+        self.assertEqual(self.client.get(reverse("changes-list"), {"since": latest}).status_code, 200)
+
+
+@override_settings(
+    PROGRESS_CHANGES_POLL_SECONDS=0.02, PROGRESS_CHANGES_HEARTBEAT_SECONDS=0.1, PROGRESS_CHANGES_STREAM_SECONDS=1
+)
+class ChangeStreamTests(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        # El vaciado entre pruebas borra el progreso con los triggers activos:
+        # según el orden de las tablas, deja sus bajas en el registro.
+        ProgressChange.objects.all().delete()
+        self.tasks = create_catalog()
+        self.ana, self.beto = create_student("ana"), create_student("beto")
+        self.existing = StudentTaskProgress.objects.create(student=self.ana, task=self.tasks[0])
+        self.first_seq = changes.last_seq()
+
+    async def read_events(self, response, count):
+        """Los próximos `count` eventos `progress` del stream, como (seq, id, operation)."""
+        events = []
+        async for chunk in response.streaming_content:
+            text = chunk.decode()
+            if "event: progress" in text:
+                lines = dict(line.split(": ", 1) for line in text.strip().splitlines())
+                data = json.loads(lines["data"])
+                events.append((int(lines["id"]), data["id"], data["operation"]))
+                if len(events) == count:
+                    break
+        return events
+
+    async def test_catch_up_then_live_changes(self):
+        url = reverse("changes-stream")
+        response = await self.async_client.get(url, {"since": 0})
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        self.assertEqual(await self.read_events(response, 1), [(self.first_seq, self.existing.pk, "created")])
+
+        progress = await sync_to_async(StudentTaskProgress.objects.create)(student=self.beto, task=self.tasks[1])
+        events = await self.read_events(response, 1)
+        self.assertEqual(events[0][1:], (progress.pk, "created"))
+        await response.streaming_content.aclose()
+
+    async def test_resumes_from_last_event_id_and_filters_student(self):
+        await sync_to_async(StudentTaskProgress.objects.create)(student=self.beto, task=self.tasks[1])
+        latest = await sync_to_async(changes.last_seq)()
+        response = await self.async_client.get(
+            reverse("changes-stream"), {"student": self.ana.pk}, headers={"Last-Event-ID": str(self.first_seq - 1)}
+        )
+        self.assertEqual(await self.read_events(response, 1), [(self.first_seq, self.existing.pk, "created")])
+
+        self.existing.status = "completed"
+        await sync_to_async(self.existing.save)()
+        await sync_to_async(StudentTaskProgress.objects.create)(student=self.beto, task=self.tasks[2])
+        events = await self.read_events(response, 1)
+        self.assertEqual(events, [(latest + 1, self.existing.pk, "updated")])
+        await response.streaming_content.aclose()
+
+    def test_wsgi_only_catches_up(self):
+        # Bajo WSGI el stream se junta entero antes de enviarse: se pone al día y cierra.
+        response = self.client.get(reverse("changes-stream"), {"since": 0})
+        with self.assertWarns(Warning):
+            body = b"".join(response).decode()
+        self.assertEqual(body.count("event: progress"), 1)
+        self.assertIn(f"id: {self.first_seq}\n", body)
+
+    def test_invalid_since(self):
+        response = self.client.get(reverse("changes-stream"), {"since": "x"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
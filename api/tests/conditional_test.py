@@ -0,0 +1,83 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from tasks.models import BlockTask, StudyBlock, StudyTopic
+from users.models import Student, StudentTaskProgress
+
+User = get_user_model()
+
+
+class ConditionalRequestTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.student = Student.objects.create(user=User.objects.create(username="etag"), full_name="Con ETag")
+        cls.topic = StudyTopic.objects.create(name="Tema ETag")
+        cls.block = StudyBlock.objects.create(topic=cls.topic, number=1, title="Bloque ETag")
+        cls.task = BlockTask.objects.create(block=cls.block, title="Tarea ETag", instructions="-", order=1)
+
+    def setUp(self):
+        cache.clear()
+        self.detail_url = reverse("students-detail", args=[self.student.id])
+
+    def test_detail_not_modified(self):
+        res = self.client.get(self.detail_url)
+        self.assertTrue(res["ETag"])
+        self.assertTrue(res["Last-Modified"])
+        # Solo se lee `updated_at`; no se carga ni se serializa el estudiante.
+        with self.assertNumQueries(1):
+            res = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=res["ETag"])
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        last_modified = self.client.get(self.detail_url)["Last-Modified"]
+        res = self.client.get(self.detail_url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_list_etag_tracks_changes_and_deletions(self):
+        url = reverse("students-list")
+        etag = self.client.get(url)["ETag"]
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_304_NOT_MODIFIED)
+
+        other = Student.objects.create(user=User.objects.create(username="etag2"), full_name="Otro")
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        etag = res["ETag"]
+
+        other.delete()
+        self.assertNotEqual(self.client.get(url)["ETag"], etag)
+
+    def test_if_match_guards_updates(self):
+        etag = self.client.get(self.detail_url)["ETag"]
+        res = self.client.patch(self.detail_url, {"full_name": "Primero"}, format="json", HTTP_IF_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res["ETag"], etag)
+
+        # Otro cliente con el ETag anterior no pisa el cambio.
+        res = self.client.patch(self.detail_url, {"full_name": "Segundo"}, format="json", HTTP_IF_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        self.student.refresh_from_db()
+        self.assertEqual(self.student.full_name, "Primero")
+
+    def test_nested_changes_change_the_etag(self):
+        url = reverse("study-topics-detail", args=[self.topic.id])
+        res = self.client.get(url)
+        self.assertNotIn("Last-Modified", res)
+        BlockTask.objects.filter(pk=self.task.pk).first().save()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=res["ETag"]).status_code, status.HTTP_200_OK)
+
+        progress = StudentTaskProgress.objects.create(student=self.student, task=self.task)
+        progress_url = reverse("student-task-progress-detail", args=[progress.id])
+        etag = self.client.get(progress_url)["ETag"]
+        self.task.title = "Renombrada"
+        self.task.save()
+        self.assertEqual(self.client.get(progress_url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_200_OK)
+
+    def test_lists_without_exact_count_have_no_etag(self):
+        res = self.client.get(reverse("block-tasks-list"), {"pagination": "cursor"})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotIn("ETag", res)
+
+    def test_users_have_no_validators(self):
+        self.assertNotIn("ETag", self.client.get(reverse("users-list")))
@@ -0,0 +1,165 @@
+import io
+import json
+import tempfile
+from pathlib import Path
+
+from django.core.management import CommandError, call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from tasks.curriculum import CurriculumError, iter_json
+from tasks.models import BlockTask, StudyBlock, StudyTopic
+
+YAML_DOCUMENT = """
+name: Álgebra
+difficulty: intermediate
+blocks:
+  - number: 1
+    title: Ecuaciones
+    tasks:
+      - {order: 1, title: Lineales, instructions: Resolver 10 ecuaciones, estimated_minutes: 20}
+      - {order: 2, title: Sistemas, instructions: Resolver 5 sistemas}
+  - number: 2
+    title: Polinomios
+    tasks:
+      - {order: 1, title: Factorizar, instructions: Factorizar 8 polinomios, resources: [{url: "https://x/1"}]}
+---
+name: Geometría
+blocks: []
+"""
+
+CSV_DOCUMENT = """topic.name,block.number,block.title,task.order,task.title,task.instructions,task.estimated_minutes
+Python,1,Sintaxis,1,Variables,Declarar variables,10
+Python,1,Sintaxis,2,Listas,Usar listas,15
+Python,2,Funciones,1,Def,Definir funciones,
+"""
+
+
+class CurriculumImportApiTests(APITestCase):
+    url = reverse("study-topics-import")
+
+    def _import(self, body, content_type="application/yaml", **params):
+        url = f"{self.url}?dry_run=true" if params.get("dry_run") else self.url
+        return self.client.post(url, body, content_type=content_type)
+
+    def test_creates_tree_and_reimport_is_unchanged(self):
+        list_url = reverse("study-topics-list")
+        self.client.get(list_url)
+        res = self._import(YAML_DOCUMENT)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        report = res.json()
+        self.assertEqual(report["totals"], {"created": 2, "updated": 0, "unchanged": 0, "invalid": 0})
+        self.assertEqual(report["topics"][0]["tasks"], {"created": 3, "updated": 0, "unchanged": 0})
+
+        topic = StudyTopic.objects.get(name="Álgebra")
+        self.assertEqual(topic.difficulty, "intermediate")
+        task = BlockTask.objects.get(block__topic=topic, block__number=2, order=1)
+        self.assertEqual(task.resources, [{"url": "https://x/1"}])
+        self.assertEqual(BlockTask.objects.get(block__topic=topic, block__number=1, order=2).estimated_minutes, 15)
+        # Las escrituras en bloque también invalidan la caché de los listados.
+        self.assertEqual(self.client.get(list_url)["X-Cache"], "MISS")
+
+        report = self._import(YAML_DOCUMENT).json()
+        self.assertEqual(report["totals"]["unchanged"], 2)
+        self.assertEqual(report["topics"][0]["tasks"]["unchanged"], 3)
+
+    def test_dry_run_returns_diff_without_writing(self):
+        self._import(YAML_DOCUMENT)
+        document = YAML_DOCUMENT.replace("title: Sistemas", "title: Sistemas 2x2").replace(
+            "blocks: []", "blocks: [{number: 1, title: Ángulos}]"
+        )
+        report = self._import(document, dry_run=True).json()
+
+        self.assertTrue(report["dry_run"])
+        self.assertEqual(report["totals"], {"created": 0, "updated": 2, "unchanged": 0, "invalid": 0})
+        self.assertEqual(
+            report["topics"][0]["changes"],
+            [
+                {
+                    "action": "update",
+                    "kind": "task",
+                    "key": "Álgebra/1/2",
+                    "fields": {"title": ["Sistemas", "Sistemas 2x2"]},
+                }
+            ],
+        )
+        self.assertEqual(report["topics"][1]["changes"], [{"action": "create", "kind": "block", "key": "Geometría/1"}])
+        self.assertTrue(BlockTask.objects.filter(title="Sistemas").exists())
+        self.assertFalse(StudyBlock.objects.filter(topic__name="Geometría").exists())
+
+        self._import(document)
+        self.assertTrue(BlockTask.objects.filter(title="Sistemas 2x2").exists())
+
+    def test_updates_resolve_natural_keys_in_constant_queries(self):
+        self._import(YAML_DOCUMENT)
+        document = json.dumps(
+            {
+                "name": "Álgebra",
+                "blocks": [
+                    {
+                        "number": n,
+                        "title": f"Bloque {n}",
+                        "tasks": [{"order": o, "title": f"T{o}", "instructions": "-"} for o in range(1, 10)],
+                    }
+                    for n in range(1, 6)
+                ],
+            }
+        )
+        # Tema, bloques y tareas existentes; dentro del savepoint, una inserción
+        # y una actualización por nivel y las generaciones de caché.
+        with self.assertNumQueries(10):
+            report = self._import(document, content_type="application/json").json()
+        self.assertEqual(report["topics"][0]["blocks"], {"created": 3, "updated": 2, "unchanged": 0})
+        self.assertEqual(report["topics"][0]["tasks"], {"created": 42, "updated": 3, "unchanged": 0})
+        self.assertEqual(BlockTask.objects.filter(block__topic__name="Álgebra").count(), 45)
+
+    def test_invalid_topic_is_skipped(self):
+        document = "\n".join(
+            [
+                json.dumps({"name": "Válido", "blocks": [{"number": 1, "title": "B"}]}),
+                json.dumps(
+                    {"name": "Roto", "difficulty": "extreme", "blocks": [{"number": 1, "tasks": [{"order": 1}]}]}
+                ),
+            ]
+        )
+        report = self._import(document, content_type="application/x-ndjson").json()
+
+        self.assertEqual(report["totals"], {"created": 1, "updated": 0, "unchanged": 0, "invalid": 1})
+        errors = report["topics"][1]["errors"]
+        self.assertEqual(
+            set(errors),
+            {"difficulty", "blocks[0].title", "blocks[0].tasks[0].title", "blocks[0].tasks[0].instructions"},
+        )
+        self.assertFalse(StudyTopic.objects.filter(name="Roto").exists())
+
+    def test_malformed_document_is_rejected(self):
+        res = self._import('[{"name": "A"}, {"name": ', content_type="application/json")
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class CurriculumReaderTests(APITestCase):
+    def test_json_array_and_concatenated_objects(self):
+        self.assertEqual(list(iter_json(io.BytesIO(b' [ {"a": 1}, {"b": [2]} ] '))), [{"a": 1}, {"b": [2]}])
+        self.assertEqual(list(iter_json(io.BytesIO(b'{"a": 1}\n{"b": 2}\n'))), [{"a": 1}, {"b": 2}])
+        with self.assertRaises(CurriculumError):
+            list(iter_json(io.BytesIO(b'[{"a": 1}')))
+
+    def test_command_imports_csv(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "plan.csv"
+            path.write_text(CSV_DOCUMENT, encoding="utf-8")
+            out = io.StringIO()
+            call_command("import_curriculum", str(path), "--dry-run", stdout=out)
+            self.assertIn("+ task Python/2/1", out.getvalue())
+            self.assertFalse(StudyTopic.objects.filter(name="Python").exists())
+
+            call_command("import_curriculum", str(path), stdout=io.StringIO())
+        tasks = BlockTask.objects.filter(block__topic__name="Python").order_by("block__number", "order")
+        self.assertEqual([(t.block.title, t.title, t.estimated_minutes) for t in tasks], [
+            ("Sintaxis", "Variables", 10), ("Sintaxis", "Listas", 15), ("Funciones", "Def", 15)
+        ])
+
+    def test_command_requires_known_format(self):
+        with self.assertRaises(CommandError):
+            call_command("import_curriculum", "plan.txt")
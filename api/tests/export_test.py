@@ -0,0 +1,77 @@
+import csv
+import io
+import json
+
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from tasks.models import BlockTask, StudyBlock, StudyTopic
+from users.models import Student, StudentTaskProgress
+
+User = get_user_model()
+
+
+@override_settings(EXPORT_CHUNK_SIZE=2)
+class StreamingExportTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.topic = StudyTopic.objects.create(name="Tema Export")
+        other_topic = StudyTopic.objects.create(name="Otro")
+        block = StudyBlock.objects.create(topic=cls.topic, number=1, title="Bloque Export")
+        other_block = StudyBlock.objects.create(topic=other_topic, number=1, title="Otro bloque")
+        cls.tasks = [
+            BlockTask.objects.create(
+                block=block, title=f"Tarea {i}", instructions="-", order=i, resources=[{"url": f"https://x/{i}"}]
+            )
+            for i in (1, 2, 3)
+        ]
+        other_task = BlockTask.objects.create(block=other_block, title="Ajena", instructions="-", order=1)
+        students = [
+            Student.objects.create(user=User.objects.create(username=f"export_{i}"), full_name=f"Alumno {i}")
+            for i in range(3)
+        ]
+        StudentTaskProgress.objects.bulk_create(
+            StudentTaskProgress(student=student, task=task, status="completed")
+            for student in students
+            for task in [*cls.tasks, other_task]
+        )
+
+    def _export(self, url_name, **params):
+        res = self.client.get(reverse(url_name), params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(res.streaming)
+        return res, b"".join(res.streaming_content).decode()
+
+    def test_csv_export_honors_filters(self):
+        url = reverse("student-task-progress-export")
+        # La validación del filtro por tema y una sola consulta de filas, leída
+        # por tramos, sin importar cuántas haya.
+        with self.assertNumQueries(2):
+            res = self.client.get(url, {"as": "csv", "task__block__topic": self.topic.id})
+            body = b"".join(res.streaming_content).decode()
+        self.assertEqual(res["Content-Type"], "text/csv; charset=utf-8")
+        self.assertIn('filename="student-task-progress.csv"', res["Content-Disposition"])
+        rows = list(csv.DictReader(io.StringIO(body)))
+        self.assertEqual(len(rows), 9)
+        self.assertEqual(rows[0]["status"], "completed")
+        self.assertTrue(rows[0]["student.full_name"].startswith("Alumno"))
+
+    def test_ndjson_export_with_field_selection(self):
+        res, body = self._export("block-tasks-export", fields="id,title,resources", block__topic=self.topic.id)
+        self.assertEqual(res["Content-Type"], "application/x-ndjson")
+        rows = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(set(rows[0]), {"id", "title", "resources"})
+        self.assertEqual(rows[0]["resources"], [{"url": "https://x/1"}])
+
+    def test_export_uses_search_and_ordering(self):
+        _, body = self._export("block-tasks-export", search="tarea", ordering="-order", fields="order")
+        self.assertEqual([json.loads(line)["order"] for line in body.splitlines()], [3, 2, 1])
+
+    def test_rejects_unknown_format_and_fields(self):
+        url = reverse("study-topics-export")
+        self.assertEqual(self.client.get(url, {"as": "xlsx"}).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(url, {"fields": "nope"}).status_code, status.HTTP_400_BAD_REQUEST)
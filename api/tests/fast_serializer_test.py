@@ -0,0 +1,175 @@
+import datetime
+import decimal
+import uuid
+from unittest import mock, skipIf
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, APITestCase
+
+from common import renderers
+from common.renderers import FastJSONRenderer
+from common.serializers import values_plan
+from common.views import ValuesListMixin
+from tasks.models import BlockTask, StudyBlock, StudyTopic
+from tasks.serializers import BlockTaskSerializer, StudyBlockSerializer
+from users.models import Student, StudentTaskProgress
+from users.serializers import StudentTaskProgressSerializer
+
+User = get_user_model()
+
+RESOURCES = [
+    None,
+    [],
+    ["https://example.com/a", 3, 2.5, True, None],
+    {"video": "clase\u2028uno", "extra": {"nivel": "básico 😀", "tags": ["a", "b"]}},
+    "texto suelto",
+]
+
+
+class ValuesPlanParityTests(APITestCase):
+    """El plan y el serializer de DRF tienen que dar exactamente los mismos bytes."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.student = Student.objects.create(user=User.objects.create(username="plan"), full_name="Plan Ñandú")
+        topic = StudyTopic.objects.create(name="Tema del plan")
+        block = StudyBlock.objects.create(topic=topic, number=1, title="Bloque")
+        moment = timezone.now().replace(microsecond=123456)
+        for index, resources in enumerate(RESOURCES):
+            task = BlockTask.objects.create(
+                block=block,
+                title=f"Tarea «{index}» \u2029 fin",
+                instructions="Línea 1\nLínea 2\t\"citada\" \\ barra",
+                resources=resources,
+                order=index + 1,
+                status="archived" if index % 2 else "available",
+            )
+            StudentTaskProgress.objects.create(
+                student=cls.student,
+                task=task,
+                status="completed" if index % 2 else "pending",
+                started_at=None if index == 0 else moment - datetime.timedelta(days=index),
+                completed_at=(moment if index % 2 else None) and moment.replace(microsecond=0),
+                notes="" if index == 0 else f"nota {index} ✓",
+            )
+        # `auto_now` no deja fijar la hora al crear.
+        BlockTask.objects.filter(order=1).update(created_at=moment.replace(microsecond=0))
+
+    def serializer(self, serializer_class, **params):
+        request = Request(APIRequestFactory().get("/", params))
+        return serializer_class(context={"request": request})
+
+    def assertSameBytes(self, serializer_class, queryset, **params):
+        serializer = self.serializer(serializer_class, **params)
+        plan = values_plan(serializer, queryset)
+        self.assertIsNotNone(plan)
+        expected = serializer_class(list(queryset), many=True, context=serializer.context).data
+        rows = list(queryset.values(*plan.paths))
+        for renderer in (JSONRenderer(), FastJSONRenderer()):
+            self.assertEqual(renderer.render(plan.represent_many(rows)), JSONRenderer().render(expected))
+
+    def test_block_tasks(self):
+        queryset = BlockTask.objects.order_by("id")
+        for params in ({}, {"fields": "id,resources,created_at"}, {"omit": "instructions,resources"}):
+            with self.subTest(params=params):
+                self.assertSameBytes(BlockTaskSerializer, queryset, **params)
+
+    def test_progress_with_nested_task(self):
+        queryset = StudentTaskProgress.objects.order_by("id")
+        for params in ({}, {"fields": "id,task_detail"}, {"omit": "task_detail,notes"}):
+            with self.subTest(params=params):
+                self.assertSameBytes(StudentTaskProgressSerializer, queryset, **params)
+
+    def test_active_timezone(self):
+        with timezone.override("America/Argentina/Buenos_Aires"):
+            self.assertSameBytes(StudentTaskProgressSerializer, StudentTaskProgress.objects.order_by("id"))
+
+    def test_plan_paths_follow_the_requested_fields(self):
+        queryset = StudentTaskProgress.objects.all()
+        plan = values_plan(self.serializer(StudentTaskProgressSerializer, fields="id,task_detail"), queryset)
+        self.assertEqual(plan.paths[:3], ["id", "task", "task__id"])
+        self.assertNotIn("notes", plan.paths)
+
+    def test_unsupported_serializers_have_no_plan(self):
+        # `tasks` es una relación inversa con muchos objetos.
+        self.assertIsNone(values_plan(self.serializer(StudyBlockSerializer), StudyBlock.objects.all()))
+
+
+class ValuesListViewTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.student = Student.objects.create(user=User.objects.create(username="lista"), full_name="Lista")
+        topic = StudyTopic.objects.create(name="Tema")
+        for number in (1, 2):
+            block = StudyBlock.objects.create(topic=topic, number=number, title=f"Bloque {number}")
+            for order in range(1, 16):
+                task = BlockTask.objects.create(
+                    block=block, title=f"Tarea {order}", instructions="-", order=order,
+                    resources={"orden": order} if order % 3 else None,
+                )
+                StudentTaskProgress.objects.create(student=cls.student, task=task)
+
+    def setUp(self):
+        cache.clear()
+
+    def get_both(self, route, params):
+        fast = self.client.get(reverse(route), params)
+        cache.clear()
+        with mock.patch.object(ValuesListMixin, "get_values_plan", return_value=None):
+            slow = self.client.get(reverse(route), params)
+        cache.clear()
+        return fast, slow
+
+    def test_lists_match_the_serializer(self):
+        cases = [
+            ("block-tasks-list", {}),
+            ("block-tasks-list", {"page": 2, "ordering": "-created_at"}),
+            ("block-tasks-list", {"search": "tarea", "fields": "id,title"}),
+            ("block-tasks-list", {"pagination": "cursor", "fields": "id"}),
+            ("student-task-progress-list", {"status": "pending"}),
+            ("student-task-progress-list", {"pagination": "cursor", "omit": "task_detail"}),
+        ]
+        for route, params in cases:
+            with self.subTest(route=route, params=params):
+                fast, slow = self.get_both(route, params)
+                self.assertEqual(fast.status_code, 200)
+                self.assertEqual(fast.content, slow.content)
+
+    def test_cursor_pages_without_the_key_columns(self):
+        res = self.client.get(reverse("block-tasks-list"), {"pagination": "cursor", "fields": "id"})
+        following = self.client.get(res.json()["next"])
+        ids = [row["id"] for row in res.json()["results"] + following.json()["results"]]
+        self.assertEqual(len(ids), 30)
+        self.assertEqual(len(set(ids)), 30)
+
+
+@skipIf(renderers.orjson is None, "orjson no está instalado")
+class FastJSONRendererTests(APITestCase):
+    def test_same_bytes_as_drf(self):
+        data = {
+            "fecha": datetime.datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=datetime.timezone.utc),
+            "dia": datetime.date(2024, 5, 1),
+            "hora": datetime.time(8, 15, 0, 500),
+            "duracion": datetime.timedelta(minutes=90),
+            "decimal": decimal.Decimal("12.50"),
+            "uuid": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+            "perezoso": gettext_lazy("Disponible"),
+            "texto": "separadores \u2028 y \u2029, emoji 😀, control \x01",
+            "numeros": [0, -1, 2**63 - 1, 0.1, 1e16, 123.456],
+            "tupla": (1, "dos"),
+            "vacio": {},
+        }
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_falls_back_to_drf(self):
+        for data in ({1: "clave entera"}, {"grande": 2**70}):
+            with self.subTest(data=data):
+                self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+        indented = FastJSONRenderer().render({"a": [1]}, "application/json; indent=2")
+        self.assertEqual(indented, JSONRenderer().render({"a": [1]}, "application/json; indent=2"))
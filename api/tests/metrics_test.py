@@ -0,0 +1,61 @@
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from health.metrics import registry
+from health.middleware import QueryBudgetExceeded
+from tasks.models import StudyBlock, StudyTopic
+
+
+@override_settings(SERVER_TIMING=True, RESPONSE_CACHE_TIMEOUT=0)
+class QueryMetricsTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        topic = StudyTopic.objects.create(name="Tema Métricas")
+        StudyBlock.objects.create(topic=topic, number=1, title="Bloque")
+
+    def setUp(self):
+        registry.reset()
+
+    def test_server_timing_reports_queries(self):
+        res = self.client.get(reverse("study-topics-list"))
+        self.assertIn('db;dur=', res["Server-Timing"])
+        self.assertIn('desc="3 queries"', res["Server-Timing"])
+        self.assertIn("render;dur=", res["Server-Timing"])
+
+    def test_metrics_endpoint_aggregates_by_action(self):
+        self.client.get(reverse("study-topics-list"))
+        self.client.get(reverse("study-topics-list"), {"expand": "blocks"})
+        res = self.client.get(reverse("health-metrics"))
+
+        self.assertTrue(res["Content-Type"].startswith("text/plain; version=0.0.4"))
+        body = res.content.decode()
+        self.assertIn("# TYPE taskmaster_db_queries_total counter", body)
+        self.assertIn('taskmaster_requests_total{endpoint="study-topics.list",method="GET"} 2', body)
+        self.assertIn('taskmaster_db_queries_total{endpoint="study-topics.list",method="GET"} 7', body)
+        self.assertIn('taskmaster_db_queries_max{endpoint="study-topics.list",method="GET"} 4', body)
+        size = int(next(
+            line.rsplit(" ", 1)[1] for line in body.splitlines()
+            if line.startswith('taskmaster_response_bytes_total{endpoint="study-topics.list"')
+        ))
+        self.assertGreater(size, 0)
+
+    @override_settings(QUERY_BUDGETS={"study-topics.list": 2}, QUERY_BUDGET_MODE="log")
+    def test_budget_logs_when_exceeded(self):
+        with self.assertLogs("health.middleware", "WARNING") as logs:
+            self.client.get(reverse("study-topics-list"))
+        self.assertIn("study-topics.list: 3 consultas (presupuesto 2)", logs.output[0])
+        self.assertIn(
+            'taskmaster_query_budget_exceeded_total{endpoint="study-topics.list",method="GET"} 1',
+            registry.prometheus(),
+        )
+
+    @override_settings(QUERY_BUDGETS={"study-topics.list": 2}, QUERY_BUDGET_MODE="raise")
+    def test_budget_raise_mode_fails_request(self):
+        with self.assertRaises(QueryBudgetExceeded):
+            self.client.get(reverse("study-topics-list"))
+
+    @override_settings(QUERY_BUDGET_MODE="raise")
+    def test_default_budgets_hold_for_catalog_reads(self):
+        for name in ("study-topics-list", "study-blocks-list", "block-tasks-list", "students-list"):
+            self.client.get(reverse(name))
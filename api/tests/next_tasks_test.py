@@ -0,0 +1,67 @@
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from tasks.models import BlockTask, StudyBlock, StudyTopic
+from users.models import Student, StudentTaskProgress
+from users.recommendations import next_tasks
+
+User = get_user_model()
+
+
+class NextTasksTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.student = Student.objects.create(user=User.objects.create(username="siguiente"), full_name="Siguiente")
+        cls.tasks = {}
+        for name in ("A", "B"):
+            topic = StudyTopic.objects.create(name=f"Tema {name}")
+            for number in (1, 2):
+                block = StudyBlock.objects.create(topic=topic, number=number, title=f"Bloque {number}")
+                for order in (1, 2):
+                    cls.tasks[name, number, order] = BlockTask.objects.create(
+                        block=block, title=f"{name}{number}.{order}", instructions="-", order=order
+                    )
+        cls.url = reverse("students-next-tasks", args=[cls.student.id])
+
+    def titles(self, **params):
+        res = self.client.get(self.url, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return [task["title"] for task in res.json()]
+
+    def test_order_by_block_number_and_task_order(self):
+        self.assertEqual(self.titles(limit=6), ["A1.1", "B1.1", "A1.2", "B1.2", "A2.1", "B2.1"])
+
+    def test_skips_completed_and_hidden_tasks(self):
+        for key, progress_status in [(("A", 1, 1), "completed"), (("B", 1, 1), "in_progress")]:
+            StudentTaskProgress.objects.create(student=self.student, task=self.tasks[key], status=progress_status)
+        # El progreso completado de otro estudiante no cuenta.
+        other = Student.objects.create(user=User.objects.create(username="otro"), full_name="Otro")
+        StudentTaskProgress.objects.create(student=other, task=self.tasks["A", 1, 2], status="completed")
+        BlockTask.objects.filter(pk=self.tasks["B", 1, 2].pk).update(status="archived")
+        StudyBlock.objects.filter(pk=self.tasks["A", 2, 1].block_id).update(is_published=False)
+        StudyTopic.objects.filter(name="Tema B").update(is_active=False)
+
+        self.assertEqual(self.titles(), ["A1.2"])
+
+    def test_response_fields(self):
+        task = self.client.get(self.url, {"limit": 1}).json()[0]
+        first = self.tasks["A", 1, 1]
+        self.assertEqual(task["id"], first.id)
+        self.assertEqual(task["topic"], first.block.topic_id)
+        self.assertEqual(task["block_number"], 1)
+        self.assertEqual(task["block"], first.block_id)
+
+    def test_single_query(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(len(list(next_tasks(self.student, 3))), 3)
+
+    def test_limit_validation_and_unknown_student(self):
+        self.assertEqual(len(self.titles()), 5)
+        for limit in ("0", "51", "x"):
+            res = self.client.get(self.url, {"limit": limit})
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST, limit)
+            self.assertIn("limit", res.json())
+        res = self.client.get(reverse("students-next-tasks", args=[999999]))
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,84 @@
+import base64
+import json
+
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from tasks.models import BlockTask, StudyBlock, StudyTopic
+from users.models import Student, StudentTaskProgress
+
+User = get_user_model()
+
+
+class PaginationTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        topic = StudyTopic.objects.create(name="Tema Paginación")
+        block = StudyBlock.objects.create(topic=topic, number=1, title="Bloque Paginación")
+        tasks = [
+            BlockTask.objects.create(block=block, title=f"Tarea {order}", instructions="-", order=order)
+            for order in range(1, 10)
+        ]
+        for index in range(3):
+            user = User.objects.create(username=f"pag_user_{index}")
+            student = Student.objects.create(user=user, full_name=f"Estudiante {index}")
+            for task in tasks:
+                StudentTaskProgress.objects.create(student=student, task=task)
+        cls.total = StudentTaskProgress.objects.count()
+
+    def test_cursor_walks_forward_and_back(self):
+        url = reverse("student-task-progress-list")
+        first = self.client.get(url, {"pagination": "cursor"}).json()
+        self.assertNotIn("count", first)
+        self.assertIsNone(first["previous"])
+        self.assertEqual(len(first["results"]), 20)
+
+        second = self.client.get(first["next"]).json()
+        self.assertIsNone(second["next"])
+        self.assertEqual(len(second["results"]), self.total - 20)
+        keys = [(p["student"], p["task"]) for p in first["results"] + second["results"]]
+        self.assertEqual(keys, sorted(keys))
+        self.assertEqual(len(set(keys)), self.total)
+
+        back = self.client.get(second["previous"]).json()
+        self.assertEqual([p["id"] for p in back["results"]], [p["id"] for p in first["results"]])
+        self.assertIsNone(back["previous"])
+
+    def test_cursor_pages_cost_the_same(self):
+        url = reverse("student-task-progress-list")
+        with self.assertNumQueries(1):
+            first = self.client.get(url, {"pagination": "cursor"}).json()
+        with self.assertNumQueries(1):
+            self.client.get(first["next"])
+
+    def test_invalid_cursor_returns_404(self):
+        res = self.client.get(reverse("block-tasks-list"), {"cursor": "no-es-un-cursor"})
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_cursor_with_wrong_value_types_returns_404(self):
+        for key in (["a", "b"], [None, None]):
+            cursor = base64.urlsafe_b64encode(json.dumps({"k": key}).encode()).decode()
+            res = self.client.get(reverse("block-tasks-list"), {"cursor": cursor})
+            self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND, key)
+
+    def test_page_number_clients_still_work(self):
+        res = self.client.get(reverse("student-task-progress-list"), {"page": 2})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.json()["count"], self.total)
+        self.assertEqual(len(res.json()["results"]), self.total - 20)
+
+    @override_settings(PAGINATION_COUNT_MODE="none")
+    def test_uncounted_mode_skips_count(self):
+        url = reverse("student-task-progress-list")
+        with self.assertNumQueries(1):
+            res = self.client.get(url)
+        body = res.json()
+        self.assertIsNone(body["count"])
+        self.assertIsNotNone(body["next"])
+        last = self.client.get(body["next"]).json()
+        self.assertIsNone(last["next"])
+        self.assertEqual(len(last["results"]), self.total - 20)
+        self.assertEqual(self.client.get(url, {"page": 3}).status_code, status.HTTP_404_NOT_FOUND)
@@ -1,4 +1,6 @@
 from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
@@ -75,3 +77,13 @@ class StudentTaskProgressApiTests(APITestCase):
         )
         res = self.client.delete(reverse("student-task-progress-detail", args=[temp.id]))
         self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+
+    def test_fields_skip_nested_task_detail(self):
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.get(reverse("student-task-progress-list"), {"fields": "id,task,status"})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        row = self._results(res.json())[0]
+        self.assertEqual(set(row), {"id", "task", "status"})
+        page_sql = ctx.captured_queries[-1]["sql"]
+        self.assertNotIn("tasks_blocktask", page_sql)
+        self.assertNotIn('"notes"', page_sql)
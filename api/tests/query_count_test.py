@@ -0,0 +1,114 @@
+"""
+Regresión de N+1: cada `list` y `retrieve` registrado en `api_router` debe
+ejecutar la misma cantidad de consultas con N y con 10×N objetos
+relacionados. Un endpoint nuevo queda cubierto al registrarlo en el router.
+"""
+
+from itertools import count
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from rest_framework.views import APIView
+
+from config.urls import api_router
+from tasks.models import BlockTask, StudyBlock, StudyTopic
+from users.models import AssignmentJob, Student, StudentTaskProgress
+
+User = get_user_model()
+
+N = 2
+
+# Variantes de parámetros que cambian las consultas del listado.
+LIST_VARIANTS = {
+    "study-topics": [{"expand": "blocks"}, {"expand": "blocks.tasks"}],
+    "study-blocks": [{"fields": "id,number"}],
+    "block-tasks": [{"pagination": "cursor"}, {"search": "tarea"}],
+    "student-task-progress": [{"pagination": "cursor"}, {"omit": "task_detail"}],
+}
+
+
+class CatalogFactory:
+    """
+    Crea datos alrededor de un tema, un bloque y un estudiante principales,
+    que son los que se piden en los detalles: cada llamada a `seed(n)` les
+    agrega `n` hijos y crea `n` objetos más de cada recurso.
+    """
+
+    def __init__(self):
+        self._ids = count(1)
+        self.topic = StudyTopic.objects.create(name="Tema principal")
+        self.block = StudyBlock.objects.create(topic=self.topic, number=1, title="Bloque principal")
+        self.student = self._student()
+        self.detail_objects = {
+            "study-topics": self.topic,
+            "study-blocks": self.block,
+            "students": self.student,
+            "users": self.student.user,
+        }
+
+    def _student(self):
+        user = User.objects.create(username=f"nplus_{next(self._ids)}")
+        return Student.objects.create(user=user, full_name=f"Alumno {user.username}")
+
+    def seed(self, n):
+        for _ in range(n):
+            i = next(self._ids)
+            block = StudyBlock.objects.create(topic=self.topic, number=i + 1, title=f"Bloque {i}")
+            task = BlockTask.objects.create(block=self.block, title=f"Tarea {i}", instructions="-", order=i)
+            BlockTask.objects.create(block=block, title=f"Tarea extra {i}", instructions="-", order=1)
+            other = StudyTopic.objects.create(name=f"Tema {i}")
+            other_block = StudyBlock.objects.create(topic=other, number=1, title=f"Bloque {i}")
+            BlockTask.objects.create(block=other_block, title=f"Tarea {i}", instructions="-", order=1)
+            student = self._student()
+            StudentTaskProgress.objects.create(student=student, task=task, status="completed")
+            StudentTaskProgress.objects.create(student=self.student, task=task, status="in_progress")
+            AssignmentJob.objects.create(topic=self.topic, cohort={"students": [student.pk]})
+
+    def detail_object(self, basename, viewset):
+        obj = self.detail_objects.get(basename)
+        return obj if obj is not None else viewset.queryset.model.objects.order_by("pk").first()
+
+
+@override_settings(RESPONSE_CACHE_TIMEOUT=0)
+class RouterQueryCountTests(APITestCase):
+    def setUp(self):
+        patcher = mock.patch.object(APIView, "throttle_classes", [])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client.force_authenticate(User.objects.create_superuser("nplus_admin", password="-"))
+
+    def _requests(self, factory):
+        for prefix, viewset, basename in api_router.registry:
+            if hasattr(viewset, "list"):
+                for params in [{}, *LIST_VARIANTS.get(basename, [])]:
+                    yield f"{basename}-list {params}", reverse(f"{basename}-list"), params
+            if hasattr(viewset, "retrieve"):
+                obj = factory.detail_object(basename, viewset)
+                yield f"{basename}-detail", reverse(f"{basename}-detail", args=[obj.pk]), {}
+
+    def _measure(self, factory):
+        counts = {}
+        for name, url, params in self._requests(factory):
+            with CaptureQueriesContext(connection) as queries:
+                res = self.client.get(url, params)
+            self.assertEqual(res.status_code, 200, name)
+            counts[name] = [query["sql"] for query in queries.captured_queries]
+        return counts
+
+    def test_list_and_retrieve_queries_do_not_grow_with_data(self):
+        factory = CatalogFactory()
+        factory.seed(N)
+        small = self._measure(factory)
+        factory.seed(9 * N)
+        large = self._measure(factory)
+
+        self.assertTrue(small)
+        for name, queries in small.items():
+            with self.subTest(endpoint=name):
+                extra = "\n".join(large[name][len(queries):])
+                self.assertEqual(len(large[name]), len(queries), f"{name}: consultas de más con N={10 * N}:\n{extra}")
@@ -0,0 +1,65 @@
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from tasks.models import BlockTask, StudyBlock, StudyTopic
+
+
+class ReorderTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.topic = StudyTopic.objects.create(name="Tema Orden")
+        cls.blocks = [
+            StudyBlock.objects.create(topic=cls.topic, number=number, title=f"Bloque {number}") for number in (1, 2, 3)
+        ]
+        cls.tasks = [
+            BlockTask.objects.create(block=cls.blocks[0], title=f"Tarea {order}", instructions="-", order=order)
+            for order in range(1, 41)
+        ]
+
+    def _orders(self):
+        return list(BlockTask.objects.filter(block=self.blocks[0]).order_by("order").values_list("id", flat=True))
+
+    def test_reverses_block_tasks_in_constant_queries(self):
+        ids = [task.id for task in reversed(self.tasks)]
+        url = reverse("study-blocks-reorder", args=[self.blocks[0].id])
+        # Bloque; dentro del savepoint: lectura con bloqueo, dos UPDATE y las
+        # generaciones de caché.
+        with self.assertNumQueries(7):
+            res = self.client.post(url, {"tasks": ids}, format="json")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.json(), {"tasks": ids})
+        self.assertEqual(self._orders(), ids)
+        self.assertEqual(
+            list(BlockTask.objects.filter(block=self.blocks[0]).order_by("order").values_list("order", flat=True)),
+            list(range(1, 41)),
+        )
+
+    def test_reorder_normalizes_gaps_and_invalidates_cache(self):
+        BlockTask.objects.filter(pk=self.tasks[0].pk).update(order=100)
+        detail = reverse("study-blocks-detail", args=[self.blocks[0].id])
+        self.client.get(detail)
+        ids = [*(task.id for task in self.tasks[1:]), self.tasks[0].id]
+        res = self.client.post(reverse("study-blocks-reorder", args=[self.blocks[0].id]), {"tasks": ids}, format="json")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(BlockTask.objects.get(pk=self.tasks[0].pk).order, 40)
+        res = self.client.get(detail)
+        self.assertEqual(res["X-Cache"], "MISS")
+        self.assertEqual(res.json()["tasks"][-1]["id"], self.tasks[0].id)
+
+    def test_rejects_incomplete_or_foreign_ids(self):
+        url = reverse("study-blocks-reorder", args=[self.blocks[0].id])
+        other = BlockTask.objects.create(block=self.blocks[1], title="Ajena", instructions="-", order=1)
+        for ids in ([t.id for t in self.tasks[:-1]], [*(t.id for t in self.tasks), other.id], [self.tasks[0].id] * 40):
+            res = self.client.post(url, {"tasks": ids}, format="json")
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn("tasks", res.json())
+        self.assertEqual(self._orders(), [task.id for task in self.tasks])
+
+    def test_reorders_topic_blocks(self):
+        ids = [self.blocks[2].id, self.blocks[0].id, self.blocks[1].id]
+        res = self.client.post(
+            reverse("study-topics-reorder-blocks", args=[self.topic.id]), {"blocks": ids}, format="json"
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(list(self.topic.blocks.order_by("number").values_list("id", flat=True)), ids)
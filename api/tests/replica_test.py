@@ -0,0 +1,103 @@
+import os
+import random
+import tempfile
+from datetime import timedelta
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connections
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from common.cache import bump_generation, get_generations
+from common.routers import replica_reads
+from tasks.models import StudyTopic
+
+
+@override_settings(DATABASE_REPLICAS=["replica"])
+class ReplicaRoutingTests(APITestCase):
+    """La réplica es otro archivo SQLite con datos distintos a los de `default`."""
+
+    @classmethod
+    def setUpClass(cls):
+        # El alias se crea aquí, después de que el runner preparó las bases de prueba.
+        cls.tmp = tempfile.TemporaryDirectory()
+        connections.settings["replica"] = {
+            **connections.settings["default"],
+            "NAME": os.path.join(cls.tmp.name, "replica.sqlite3"),
+        }
+        call_command("migrate", database="replica", verbosity=0)
+        cls.databases = {"default", "replica"}
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        connections["replica"].close()
+        del connections["replica"]
+        del connections.settings["replica"]
+        cls.tmp.cleanup()
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.primary_topic = StudyTopic.objects.create(name="Tema en la primaria")
+        cls.replica_topic = StudyTopic.objects.using("replica").create(name="Tema en la réplica")
+
+    def setUp(self):
+        cache.clear()
+
+    def list_names(self, route="study-topics-list", **params):
+        res = self.client.get(reverse(route), params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return [item["name"] for item in res.json()["results"]]
+
+    def test_reads_use_the_replica(self):
+        self.assertEqual(self.list_names(), ["Tema en la réplica"])
+        self.assertEqual(self.list_names(search="réplica"), ["Tema en la réplica"])
+        res = self.client.get(reverse("study-topics-export"))
+        self.assertIn("Tema en la réplica", b"".join(res.streaming_content).decode())
+
+    def test_one_replica_per_request(self):
+        # Generaciones, ETag, conteo y página: una sola elección.
+        with mock.patch("common.routers.random.choice", wraps=random.choice) as choice:
+            self.assertEqual(self.list_names(route="block-tasks-list"), [])
+        choice.assert_called_once_with(["replica"])
+
+    def test_cache_generations_are_read_from_the_primary(self):
+        bump_generation(StudyTopic)
+        with replica_reads("replica"):
+            generation = get_generations([StudyTopic])
+        self.assertNotEqual(generation, ["0"])
+
+    def test_writes_use_the_primary_and_stick_to_it(self):
+        res = self.client.patch(
+            reverse("study-topics-detail", args=[self.primary_topic.id]), {"description": "editado"}, format="json"
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.cookies[settings.REPLICA_STICKY_COOKIE]["max-age"], settings.REPLICA_STICKY_SECONDS)
+        self.assertFalse(StudyTopic.objects.using("replica").filter(description="editado").exists())
+
+        # El cliente que escribió lee de `default` mientras dure la cookie.
+        self.assertEqual(self.list_names(), ["Tema en la primaria"])
+        self.client.cookies.pop(settings.REPLICA_STICKY_COOKIE)
+        # Las generaciones salen de `default`: sin esto respondería la caché de la lectura anterior.
+        cache.clear()
+        self.assertEqual(self.list_names(), ["Tema en la réplica"])
+
+    def test_delta_sync_reads_from_the_primary(self):
+        # Una réplica atrasada perdería lo que `X-Sync-Timestamp` ya da por leído.
+        since = (timezone.now() - timedelta(hours=1)).isoformat()
+        self.assertEqual(self.list_names(updated_since=since), ["Tema en la primaria"])
+        topic_id = self.primary_topic.pk
+        self.primary_topic.delete()
+        res = self.client.get(reverse("study-topics-deleted"), {"updated_since": since})
+        self.assertEqual(res.json(), {"ids": [topic_id]})
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_without_replicas_everything_uses_default(self):
+        self.assertEqual(self.list_names(), ["Tema en la primaria"])
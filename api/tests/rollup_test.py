@@ -0,0 +1,101 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from tasks.models import BlockTask, StudyBlock, StudyTopic
+from users import rollups
+from users.models import Student, StudentBlockProgress, StudentTaskProgress, StudentTopicProgress
+
+User = get_user_model()
+
+
+class ProgressRollupTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.topic = StudyTopic.objects.create(name="Tema Resumen")
+        cls.block1 = StudyBlock.objects.create(topic=cls.topic, number=1, title="Bloque 1")
+        cls.block2 = StudyBlock.objects.create(topic=cls.topic, number=2, title="Bloque 2")
+        cls.tasks = [
+            BlockTask.objects.create(block=block, title=f"T{block.number}.{order}", instructions="-", order=order, estimated_minutes=10 * order)
+            for block in (cls.block1, cls.block2)
+            for order in (1, 2)
+        ]
+        cls.student = Student.objects.create(user=User.objects.create(username="rollup"), full_name="Resumen")
+
+    def _progress(self, task, status_value="pending"):
+        with self.captureOnCommitCallbacks(execute=True):
+            return StudentTaskProgress.objects.create(student=self.student, task=task, status=status_value)
+
+    def _topic_rollup(self):
+        return StudentTopicProgress.objects.get(student=self.student, topic=self.topic)
+
+    def test_writes_refresh_rollups_on_commit(self):
+        progress = self._progress(self.tasks[0], "completed")
+        self._progress(self.tasks[2], "in_progress")
+        rollup = self._topic_rollup()
+        self.assertEqual((rollup.completed, rollup.in_progress, rollup.completed_minutes), (1, 1, 10))
+        self.assertEqual(StudentBlockProgress.objects.get(student=self.student, block=self.block1).completed, 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            progress.delete()
+        self.assertEqual(self._topic_rollup().completed, 0)
+        self.assertFalse(StudentBlockProgress.objects.filter(student=self.student, block=self.block1).exists())
+
+    def test_task_changes_refresh_rollups(self):
+        self._progress(self.tasks[0], "completed")
+        task = self.tasks[0]
+        with self.captureOnCommitCallbacks(execute=True):
+            task.estimated_minutes = 45
+            task.block, task.order = self.block2, 3
+            task.save()
+        self.assertEqual(self._topic_rollup().completed_minutes, 45)
+        self.assertEqual(StudentBlockProgress.objects.get(student=self.student, block=self.block2).completed, 1)
+        self.assertFalse(StudentBlockProgress.objects.filter(student=self.student, block=self.block1).exists())
+
+    def test_refresh_updates_existing_rows_and_drops_empty_ones(self):
+        self._progress(self.tasks[0], "completed")
+        self._progress(self.tasks[2], "completed")
+        StudentTaskProgress.objects.filter(task=self.tasks[0]).update(status="in_progress")
+        StudentTaskProgress.objects.filter(task=self.tasks[2]).delete()
+        # Las filas del resumen ya existen: el recálculo las actualiza en su sitio.
+        rollups.refresh([self.student.id], block_ids=[self.block1.id, self.block2.id], topic_ids=[self.topic.id])
+        rollups.refresh([self.student.id], block_ids=[self.block1.id, self.block2.id], topic_ids=[self.topic.id])
+        rollup = self._topic_rollup()
+        self.assertEqual((rollup.completed, rollup.in_progress), (0, 1))
+        self.assertEqual(StudentBlockProgress.objects.get(student=self.student, block=self.block1).in_progress, 1)
+        self.assertFalse(StudentBlockProgress.objects.filter(student=self.student, block=self.block2).exists())
+
+    def test_bulk_upsert_refreshes_rollups(self):
+        rows = [{"student": self.student.id, "task": task.id, "status": "completed"} for task in self.tasks]
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse("student-task-progress-bulk"), rows, format="json")
+        rollup = self._topic_rollup()
+        self.assertEqual((rollup.completed, rollup.completed_minutes), (4, 60))
+
+    def test_summary_endpoint(self):
+        self._progress(self.tasks[0], "completed")
+        self._progress(self.tasks[1], "pending")
+        url = reverse("students-summary", args=[self.student.id])
+        # Estudiante, resúmenes por tema y por bloque, y totales de tareas.
+        with self.assertNumQueries(4):
+            res = self.client.get(url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        topic = res.json()["topics"][0]
+        self.assertEqual(topic["total_tasks"], 4)
+        self.assertEqual(topic["not_started"], 2)
+        self.assertEqual(topic["completion"], 25.0)
+        self.assertEqual(topic["total_minutes"], 60)
+        block = res.json()["blocks"][0]
+        self.assertEqual((block["block"], block["completion"]), (self.block1.id, 50.0))
+
+    def test_rebuild_command(self):
+        self._progress(self.tasks[0], "completed")
+        StudentTopicProgress.objects.all().delete()
+        StudentTaskProgress.objects.filter(student=self.student).update(status="in_progress")
+        call_command("rebuild_progress_rollups", stdout=StringIO())
+        rollup = self._topic_rollup()
+        self.assertEqual((rollup.completed, rollup.in_progress), (0, 1))
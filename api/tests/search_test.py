@@ -0,0 +1,73 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from tasks.models import BlockTask, StudyBlock, StudyTopic
+from users.models import Student
+
+User = get_user_model()
+
+
+class FullTextSearchTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.topic = StudyTopic.objects.create(name="Álgebra lineal", description="Vectores y matrices")
+        cls.block = StudyBlock.objects.create(topic=cls.topic, number=1, title="Determinantes")
+        cls.in_title = BlockTask.objects.create(
+            block=cls.block, title="Matrices inversas", instructions="Calcular a mano", order=1
+        )
+        cls.in_instructions = BlockTask.objects.create(
+            block=cls.block, title="Ejercicio libre", instructions="Usar matrices de 3x3", order=2
+        )
+        cls.unrelated = BlockTask.objects.create(
+            block=StudyBlock.objects.create(topic=cls.topic, number=2, title="Espacios"),
+            title="Bases",
+            instructions="Encontrar una base",
+            order=1,
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def _search(self, term, url_name="block-tasks-list", **params):
+        res = self.client.get(reverse(url_name), {"search": term, **params})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return [row["id"] for row in res.json()["results"]]
+
+    def test_results_are_ranked(self):
+        # La coincidencia en el título pesa más que en las instrucciones.
+        self.assertEqual(self._search("matrices"), [self.in_title.id, self.in_instructions.id])
+
+    def test_prefixes_and_all_words(self):
+        self.assertEqual(self._search("matri inv"), [self.in_title.id])
+        self.assertEqual(self._search("matrices bases"), [])
+
+    def test_related_columns_are_indexed(self):
+        self.assertCountEqual(self._search("determinantes"), [self.in_title.id, self.in_instructions.id])
+        self.assertEqual(self._search("algebra", "study-topics-list"), [self.topic.id])
+        self.assertEqual(len(self._search("lineal", "study-blocks-list")), 2)
+
+    def test_index_follows_writes(self):
+        StudyBlock.objects.filter(pk=self.block.pk).update(title="Inversas")
+        self.assertCountEqual(self._search("inversas"), [self.in_title.id, self.in_instructions.id])
+
+        BlockTask.objects.filter(pk=self.unrelated.pk).update(title="Bases ortonormales")
+        self.assertEqual(self._search("ortonormales"), [self.unrelated.id])
+
+        self.in_title.delete()
+        self.assertEqual(self._search("matrices"), [self.in_instructions.id])
+
+    def test_explicit_ordering_wins(self):
+        self.assertEqual(
+            self._search("matrices", ordering="-order"), [self.in_instructions.id, self.in_title.id]
+        )
+
+    def test_query_syntax_is_neutralized(self):
+        self.assertEqual(self._search('"matrices* OR (bases'), [])
+        self.assertEqual(len(self._search("***")), 3)
+
+    def test_views_without_index_keep_icontains(self):
+        student = Student.objects.create(user=User.objects.create(username="buscado"), full_name="Ana Pérez")
+        self.assertEqual(self._search("na pé", "students-list"), [student.id])
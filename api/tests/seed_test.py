@@ -0,0 +1,38 @@
+import io
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from tasks.models import BlockTask, StudyTopic
+from users.models import Student, StudentTaskProgress, StudentTopicProgress
+
+
+class SeedBenchmarkTests(TestCase):
+    def _seed(self, *args):
+        call_command(
+            "seed_benchmark", "--topics", "3", "--blocks", "2", "--tasks", "4", "--students", "7", "--progress", "5",
+            *args, stdout=io.StringIO(),
+        )
+
+    def _snapshot(self):
+        tasks = BlockTask.objects.order_by("block__topic__name", "block__number", "order")
+        return (
+            list(tasks.values_list("title", flat=True)),
+            sorted(StudentTaskProgress.objects.values_list("student__user__username", "task__title", "status")),
+        )
+
+    def test_generates_requested_sizes_with_rollups(self):
+        self._seed()
+        self.assertEqual(StudyTopic.objects.count(), 3)
+        self.assertEqual(BlockTask.objects.count(), 24)
+        self.assertEqual(Student.objects.count(), 7)
+        self.assertEqual(StudentTaskProgress.objects.count(), 35)
+        self.assertTrue(StudentTopicProgress.objects.exists())
+
+    def test_same_seed_reproduces_dataset(self):
+        self._seed()
+        first = self._snapshot()
+        with self.assertRaises(CommandError):
+            self._seed()
+        self._seed("--reset")
+        self.assertEqual(self._snapshot(), first)
@@ -0,0 +1,66 @@
+import io
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from common import sessions
+
+
+class PruneSessionsTests(TestCase):
+    def setUp(self):
+        now = timezone.now()
+        expired = [Session(session_key=f"vencida{i:03}", session_data="", expire_date=now - timedelta(days=1))
+                   for i in range(5)]
+        active = [Session(session_key=f"vigente{i:03}", session_data="", expire_date=now + timedelta(days=1))
+                  for i in range(2)]
+        Session.objects.bulk_create(expired + active)
+
+    def test_deletes_expired_in_batches(self):
+        # Tres tramos (2 + 2 + 1): una consulta de claves y un DELETE por tramo.
+        with self.assertNumQueries(6):
+            self.assertEqual(sessions.prune_expired(batch_size=2), 5)
+        self.assertEqual(sorted(Session.objects.values_list("pk", flat=True)), ["vigente000", "vigente001"])
+        self.assertEqual(sessions.prune_expired(batch_size=2), 0)
+
+    def test_command(self):
+        out = io.StringIO()
+        call_command("prune_sessions", "--batch-size", "3", stdout=out)
+        self.assertIn("5 sesiones vencidas borradas", out.getvalue())
+        self.assertEqual(Session.objects.count(), 2)
+
+
+class SessionBackendTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user("sesion", password="clave")
+
+    def queries_per_request(self, engine):
+        with override_settings(SESSION_ENGINE=f"django.contrib.sessions.backends.{engine}"):
+            self.client = self.client_class()
+            self.client.force_login(self.user)
+            self.client.get(reverse("heath"))
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(reverse("heath"))
+        self.assertEqual(response.wsgi_request.user, self.user)
+        return [query["sql"] for query in queries]
+
+    def test_db_reads_session_table(self):
+        queries = self.queries_per_request("db")
+        self.assertEqual(len(queries), 2)
+        self.assertTrue(any("django_session" in sql for sql in queries))
+
+    def test_cached_and_cookie_backends_skip_session_table(self):
+        for engine in ("cached_db", "cache", "signed_cookies"):
+            with self.subTest(engine=engine):
+                queries = self.queries_per_request(engine)
+                # Solo queda la consulta del usuario.
+                self.assertEqual(len(queries), 1)
+                self.assertIn("auth_user", queries[0])
@@ -0,0 +1,106 @@
+import io
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from common.models import Tombstone
+from tasks.models import BlockTask, StudyBlock, StudyTopic
+from users.models import Student, StudentTaskProgress
+
+
+class DeltaSyncTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.topic = StudyTopic.objects.create(name="Tema")
+        cls.other_topic = StudyTopic.objects.create(name="Otro tema")
+        cls.block = StudyBlock.objects.create(topic=cls.topic, number=1, title="Bloque")
+        cls.tasks = [
+            BlockTask.objects.create(block=cls.block, title=f"Tarea {order}", instructions="-", order=order)
+            for order in (1, 2, 3)
+        ]
+        student = Student.objects.create(user=get_user_model().objects.create(username="ana"), full_name="Ana")
+        cls.progress = StudentTaskProgress.objects.create(student=student, task=cls.tasks[0])
+
+    def setUp(self):
+        cache.clear()
+        # Todo lo creado queda "viejo"; el corte es posterior.
+        past = timezone.now() - timedelta(hours=1)
+        for model in (StudyTopic, StudyBlock, BlockTask, StudentTaskProgress):
+            model.objects.update(updated_at=past)
+        self.since = (timezone.now() - timedelta(seconds=1)).isoformat()
+
+    def test_updated_since_returns_only_changed_rows(self):
+        task = self.tasks[1]
+        task.title = "Renombrada"
+        task.save()
+        self.other_topic.save()
+
+        response = self.client.get(reverse("block-tasks-list"), {"updated_since": self.since})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([row["id"] for row in response.json()["results"]], [task.pk])
+        topics = self.client.get(reverse("study-topics-list"), {"updated_since": self.since}).json()
+        self.assertEqual([row["id"] for row in topics["results"]], [self.other_topic.pk])
+        progress = self.client.get(reverse("student-task-progress-list"), {"updated_since": self.since}).json()
+        self.assertEqual(progress["results"], [])
+
+    def test_responses_carry_the_next_updated_since(self):
+        # El listado completo (vista asíncrona) y el incremental.
+        for params in ({}, {"updated_since": self.since}):
+            before = timezone.now()
+            response = self.client.get(reverse("block-tasks-list"), params)
+            timestamp = parse_datetime(response["X-Sync-Timestamp"])
+            # `DELTA_SYNC_OVERLAP_SECONDS` antes de la petición.
+            self.assertGreaterEqual(timestamp, before - timedelta(seconds=5))
+            self.assertLessEqual(timestamp, timezone.now() - timedelta(seconds=5))
+        self.assertNotIn("X-Sync-Timestamp", self.client.get(reverse("study-blocks-detail", args=[self.block.pk])))
+
+    def test_deletes_are_tracked_including_cascades(self):
+        topic_ids = [self.other_topic.pk, self.topic.pk]
+        progress_id, task_ids = self.progress.pk, [task.pk for task in self.tasks]
+        self.other_topic.delete()
+        StudyTopic.objects.filter(pk=self.topic.pk).delete()
+
+        expected = {
+            "study-topics-deleted": topic_ids,
+            "study-blocks-deleted": [self.block.pk],
+            "block-tasks-deleted": task_ids,
+            "student-task-progress-deleted": [progress_id],
+        }
+        for name, ids in expected.items():
+            response = self.client.get(reverse(name), {"updated_since": self.since})
+            self.assertEqual(response.status_code, status.HTTP_200_OK, name)
+            self.assertEqual(sorted(response.json()["ids"]), sorted(ids), name)
+            self.assertIn("X-Sync-Timestamp", response)
+
+        later = (timezone.now() + timedelta(seconds=1)).isoformat()
+        self.assertEqual(self.client.get(reverse("block-tasks-deleted"), {"updated_since": later}).json(), {"ids": []})
+
+    def test_invalid_or_missing_updated_since(self):
+        response = self.client.get(reverse("block-tasks-list"), {"updated_since": "ayer"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("updated_since", response.json())
+        response = self.client.get(reverse("block-tasks-deleted"))
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("updated_since", response.json())
+
+    @override_settings(TOMBSTONE_RETENTION_DAYS=7)
+    def test_expired_tombstones(self):
+        kept = self.tasks[1].pk
+        self.tasks[2].delete()
+        Tombstone.objects.update(deleted_at=timezone.now() - timedelta(days=8))
+        self.tasks[1].delete()
+
+        old = (timezone.now() - timedelta(days=10)).isoformat()
+        response = self.client.get(reverse("block-tasks-deleted"), {"updated_since": old})
+        self.assertEqual(response.status_code, status.HTTP_410_GONE)
+
+        call_command("prune_tombstones", "--batch-size", "1", stdout=io.StringIO())
+        self.assertEqual(list(Tombstone.objects.values_list("object_id", flat=True)), [kept])
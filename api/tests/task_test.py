@@ -1,7 +1,11 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
 
+from tasks.models import BlockTask, StudyBlock, StudyTopic
+
 
 class BlockTaskApiTests(APITestCase):
     @classmethod
@@ -70,3 +74,42 @@ class BlockTaskApiTests(APITestCase):
         created = self.client.post(reverse("block-tasks-list"), self._task_payload(order=5), format="json").json()
         res = self.client.delete(reverse("block-tasks-detail", args=[created["id"]]))
         self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+
+
+class BlockTaskSparseFieldsetTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        topic = StudyTopic.objects.create(name="Tema Campos")
+        block = StudyBlock.objects.create(topic=topic, number=1, title="Bloque Campos")
+        cls.task = BlockTask.objects.create(
+            block=block,
+            title="Tarea Campos",
+            instructions="Instrucciones muy largas",
+            resources={"links": ["https://example.com"]},
+            order=1,
+        )
+
+    def test_fields_limits_payload_and_columns(self):
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.get(reverse("block-tasks-list"), {"fields": "id,title,status"})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(list(res.json()["results"][0]), ["id", "title", "status"])
+        page_sql = ctx.captured_queries[-1]["sql"]
+        self.assertNotIn('"instructions"', page_sql)
+        self.assertNotIn('"resources"', page_sql)
+
+    def test_omit_drops_fields(self):
+        res = self.client.get(reverse("block-tasks-detail", args=[self.task.id]), {"omit": "instructions,resources"})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotIn("instructions", res.json())
+        self.assertNotIn("resources", res.json())
+        self.assertEqual(res.json()["title"], "Tarea Campos")
+
+    def test_fields_ignored_on_write(self):
+        res = self.client.patch(
+            reverse("block-tasks-detail", args=[self.task.id]) + "?fields=id",
+            {"title": "Tarea renombrada"},
+            format="json",
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.json()["title"], "Tarea renombrada")
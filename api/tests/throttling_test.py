@@ -0,0 +1,100 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework.test import APIRequestFactory, APITestCase
+
+from common.throttling import ActionRateThrottle, AnonRateThrottle
+from tasks.models import BlockTask, StudyBlock, StudyTopic
+
+RATES = {"anon": "10/min", "user": None, "block-tasks-list": "3/min", "exports": None}
+
+
+class CountingCache:
+    """Caché que cuenta las operaciones que recibe."""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.calls = []
+
+    def __getattr__(self, name):
+        method = getattr(self.backend, name)
+
+        def call(*args, **kwargs):
+            self.calls.append(name)
+            return method(*args, **kwargs)
+
+        return call
+
+
+class SlidingWindowThrottleTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.request = APIRequestFactory().get("/", REMOTE_ADDR="10.0.0.1")
+        self.request.user = None
+        self.now = 600.0  # Comienzo de una ventana de 60 s.
+
+    def allow(self):
+        throttle = AnonRateThrottle()
+        throttle.timer = lambda: self.now
+        return throttle, throttle.allow_request(self.request, None)
+
+    def test_limit_and_retry_after(self):
+        with mock.patch.object(AnonRateThrottle, "THROTTLE_RATES", RATES):
+            results = [self.allow()[1] for _ in range(11)]
+            self.assertEqual(results, [True] * 10 + [False])
+            throttle, allowed = self.allow()
+        self.assertFalse(allowed)
+        # 12 peticiones en esta ventana: en la siguiente tienen que pesar menos de 9.
+        self.assertAlmostEqual(throttle.wait(), 60 + 60 * (1 - 9 / 12))
+
+    def test_previous_window_slides_out(self):
+        with mock.patch.object(AnonRateThrottle, "THROTTLE_RATES", RATES):
+            for _ in range(10):
+                self.allow()
+            # A mitad de la ventana siguiente las 10 anteriores pesan 5.
+            self.now += 90
+            results = [self.allow()[1] for _ in range(6)]
+            self.assertEqual(results, [True] * 5 + [False])
+            self.assertAlmostEqual(self.allow()[0].wait(), 60 * (1 - 2 / 10) - 30)
+            self.now += 60
+            self.assertTrue(self.allow()[1])
+
+    def test_fixed_memory_and_constant_cache_operations(self):
+        counting = CountingCache(cache)
+        with mock.patch.object(AnonRateThrottle, "THROTTLE_RATES", {**RATES, "anon": "1000/min"}), \
+                mock.patch.object(AnonRateThrottle, "cache", counting):
+            self.allow()
+            counting.calls.clear()
+            for _ in range(200):
+                self.allow()
+        # Un `incr` y un `get` por petición, con cualquier cantidad de peticiones previas.
+        self.assertEqual(counting.calls, ["incr", "get"] * 200)
+        key = AnonRateThrottle().get_cache_key(self.request, None)
+        self.assertEqual(cache.get(f"{key}:10"), 201)
+
+
+@mock.patch.object(AnonRateThrottle, "THROTTLE_RATES", {**RATES, "anon": "100/min"})
+@mock.patch.object(ActionRateThrottle, "THROTTLE_RATES", RATES)
+class ActionRateThrottleTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        block = StudyBlock.objects.create(topic=StudyTopic.objects.create(name="Tema"), number=1, title="Bloque")
+        cls.task = BlockTask.objects.create(block=block, title="Tarea", instructions="-", order=1)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_list_scope_only_limits_its_action(self):
+        url = reverse("block-tasks-list")
+        codes = [self.client.get(url, {"search": str(i)}).status_code for i in range(4)]
+        self.assertEqual(codes, [200, 200, 200, 429])
+        self.assertIn("Retry-After", self.client.get(url))
+        # El detalle y los otros listados no comparten ese límite.
+        self.assertEqual(self.client.get(reverse("block-tasks-detail", args=[self.task.id])).status_code, 200)
+        self.assertEqual(self.client.get(reverse("study-blocks-list")).status_code, 200)
+
+    def test_async_list_view_is_throttled(self):
+        url = reverse("block-tasks-list")
+        codes = [self.client.get(url).status_code for _ in range(4)]
+        self.assertEqual(codes, [200, 200, 200, 429])
@@ -1,9 +1,12 @@
 from uuid import uuid4
 
+from django.test import override_settings
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
 
+from tasks.models import BlockTask, StudyBlock, StudyTopic
+
 
 class StudyTopicApiTests(APITestCase):
     def _results(self, data):
@@ -50,3 +53,73 @@ class StudyTopicApiTests(APITestCase):
         created = self.client.post(reverse("study-topics-list"), self._topic_payload(), format="json").json()
         res = self.client.delete(reverse("study-topics-detail", args=[created["id"]]))
         self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+
+
+class StudyTopicListModeTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.topic = StudyTopic.objects.create(name="Tema Resumen", difficulty="beginner")
+        for number in (1, 2):
+            block = StudyBlock.objects.create(topic=cls.topic, number=number, title=f"Bloque {number}")
+            for order in (1, 2, 3):
+                BlockTask.objects.create(
+                    block=block,
+                    title=f"Tarea {number}.{order}",
+                    instructions="Texto largo",
+                    estimated_minutes=10,
+                    order=order,
+                )
+
+    def _topic(self, res):
+        return next(t for t in res.json()["results"] if t["id"] == self.topic.id)
+
+    def test_list_returns_summary_counts(self):
+        res = self.client.get(reverse("study-topics-list"))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        topic = self._topic(res)
+        self.assertNotIn("blocks", topic)
+        self.assertEqual(topic["blocks_count"], 2)
+        self.assertEqual(topic["tasks_count"], 6)
+        self.assertEqual(topic["total_estimated_minutes"], 60)
+
+    def test_list_expand_blocks_omits_tasks(self):
+        res = self.client.get(reverse("study-topics-list"), {"expand": "blocks"})
+        blocks = self._topic(res)["blocks"]
+        self.assertEqual([b["number"] for b in blocks], [1, 2])
+        self.assertNotIn("tasks", blocks[0])
+        self.assertEqual(blocks[0]["tasks_count"], 3)
+        self.assertEqual(blocks[0]["total_estimated_minutes"], 30)
+
+    def test_list_expand_blocks_tasks(self):
+        res = self.client.get(reverse("study-topics-list"), {"expand": "blocks.tasks"})
+        blocks = self._topic(res)["blocks"]
+        self.assertEqual(len(blocks[0]["tasks"]), 3)
+
+    @override_settings(RESPONSE_CACHE_TIMEOUT=0)
+    def test_list_sparse_fields_prune_expanded_blocks(self):
+        url = reverse("study-topics-list")
+        # Sin `blocks` en la respuesta tampoco se precargan: las mismas consultas que sin `expand`.
+        for params in ({"fields": "id,name", "expand": "blocks"}, {"omit": "blocks", "expand": "blocks.tasks"}):
+            with self.assertNumQueries(3):
+                res = self.client.get(url, params)
+            self.assertNotIn("blocks", self._topic(res), params)
+        res = self.client.get(url, {"fields": "id,name", "expand": "blocks"})
+        self.assertEqual(set(self._topic(res)), {"id", "name"})
+
+    @override_settings(RESPONSE_CACHE_TIMEOUT=0)
+    def test_list_query_count_is_constant(self):
+        url = reverse("study-topics-list")
+        # Generaciones + MAX/COUNT del ETag (que también da el total de la
+        # paginación) + página anotada; cada nivel expandido suma un prefetch.
+        with self.assertNumQueries(3):
+            self.client.get(url)
+        with self.assertNumQueries(4):
+            self.client.get(url, {"expand": "blocks"})
+        with self.assertNumQueries(5):
+            self.client.get(url, {"expand": "blocks.tasks"})
+
+    def test_detail_keeps_full_tree(self):
+        res = self.client.get(reverse("study-topics-detail", args=[self.topic.id]))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.json()["blocks"]), 2)
+        self.assertEqual(len(res.json()["blocks"][0]["tasks"]), 3)
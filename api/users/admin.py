@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import Student, StudentTaskProgress
+from .models import AssignmentJob, Student, StudentBlockProgress, StudentTaskProgress, StudentTopicProgress
 
 
 @admin.register(Student)
@@ -18,3 +18,16 @@ class StudentTaskProgressAdmin(admin.ModelAdmin):
     search_fields = ("student__full_name", "task__title", "task__block__title", "notes")
     ordering = ("-started_at",)
     autocomplete_fields = ("student", "task")
+
+
+@admin.register(AssignmentJob)
+class AssignmentJobAdmin(admin.ModelAdmin):
+    list_display = ("id", "topic", "block", "status", "processed_students", "total_students", "created_at")
+    list_filter = ("status",)
+    readonly_fields = ("created_at", "updated_at", "finished_at")
+
+
+@admin.register(StudentTopicProgress, StudentBlockProgress)
+class ProgressRollupAdmin(admin.ModelAdmin):
+    list_display = ("__str__", "completed", "in_progress", "pending", "completed_minutes", "updated_at")
+    readonly_fields = ("completed", "in_progress", "pending", "completed_minutes", "updated_at")
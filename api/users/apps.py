@@ -3,3 +3,11 @@ from django.apps import AppConfig
 
 class UsersConfig(AppConfig):
     name = 'users'
+
+    def ready(self):
+        from common.cache import track_generations
+
+        from . import signals  # noqa: F401
+        from .models import Student
+
+        track_generations(Student)
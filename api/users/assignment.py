@@ -0,0 +1,146 @@
+"""
+Asignación de un tema o bloque completo a una cohorte de estudiantes.
+
+Las filas de `StudentTaskProgress` se crean en la base de datos con un único
+`INSERT ... SELECT ... ON CONFLICT DO NOTHING` por tramo de estudiantes, sin
+cargarlas en Python. Las cohortes grandes se procesan en un hilo aparte y
+reportan su avance en `AssignmentJob`.
+"""
+
+import logging
+import threading
+
+from django.conf import settings
+from django.db import close_old_connections, connections, transaction
+from django.utils import timezone
+
+from tasks.models import BlockTask
+from . import rollups
+from .filters import StudentFilter
+from .models import AssignmentJob, Student, StudentTaskProgress
+
+logger = logging.getLogger(__name__)
+
+
+def assignable_tasks(topic=None, block=None):
+    """Tareas disponibles de los bloques publicados del tema o del bloque."""
+    tasks = BlockTask.objects.filter(status=BlockTask.Status.AVAILABLE, block__is_published=True)
+    if block is not None:
+        return tasks.filter(block=block)
+    return tasks.filter(block__topic=topic)
+
+
+def resolve_cohort(cohort):
+    """
+    Devuelve el queryset de estudiantes descrito por `cohort`.
+
+    `cohort` es `{"students": [ids]}` o `{"filter": {...}}` con los
+    parámetros de `StudentFilter`. Lanza `ValueError` con los errores del
+    filtro si no es válido.
+    """
+    students = Student.objects.all()
+    if "students" in cohort:
+        return students.filter(pk__in=cohort["students"])
+    filterset = StudentFilter(data=cohort.get("filter") or {}, queryset=students)
+    if not filterset.is_valid():
+        raise ValueError(filterset.errors)
+    return filterset.qs
+
+
+def insert_missing_progress(students, tasks):
+    """
+    Crea en la base de datos las filas `(student, task)` que falten.
+
+    Devuelve la cantidad de filas insertadas; las existentes no se tocan.
+    """
+    db = StudentTaskProgress.objects.db
+    connection = connections[db]
+    qn = connection.ops.quote_name
+    students_sql, students_params = students.order_by().values_list("id").query.get_compiler(db).as_sql()
+    tasks_sql, tasks_params = tasks.order_by().values_list("id").query.get_compiler(db).as_sql()
+    opts = StudentTaskProgress._meta
+    student_col, task_col, status_col, notes_col, updated_col = (
+        qn(opts.get_field(name).column) for name in ("student", "task", "status", "notes", "updated_at")
+    )
+
+    # `WHERE 1 = 1` evita que SQLite lea el ON CONFLICT como parte del JOIN.
+    sql = (
+        f"INSERT INTO {qn(opts.db_table)} ({student_col}, {task_col}, {status_col}, {notes_col}, {updated_col}) "
+        f"SELECT s.{qn('id')}, t.{qn('id')}, %s, %s, %s "
+        f"FROM ({students_sql}) s CROSS JOIN ({tasks_sql}) t WHERE 1 = 1 "
+        f"ON CONFLICT ({student_col}, {task_col}) DO NOTHING"
+    )
+    now = connection.ops.adapt_datetimefield_value(timezone.now())
+    params = (StudentTaskProgress.Status.PENDING, "", now, *students_params, *tasks_params)
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return max(cursor.rowcount, 0)
+
+
+def run_assignment(job):
+    """Procesa la cohorte de `job` por tramos de IDs y guarda el avance."""
+    tasks = assignable_tasks(topic=job.topic, block=job.block)
+    students = resolve_cohort(job.cohort).order_by("pk")
+    chunk_size = settings.ASSIGNMENT_CHUNK_SIZE
+    AssignmentJob.objects.filter(pk=job.pk).update(status=AssignmentJob.Status.RUNNING, updated_at=timezone.now())
+
+    last_id, block_ids = 0, None
+    while True:
+        chunk = list(students.filter(pk__gt=last_id).values_list("pk", flat=True)[:chunk_size])
+        if not chunk:
+            break
+        with transaction.atomic():
+            created = insert_missing_progress(Student.objects.filter(pk__in=chunk), tasks)
+            if created:
+                # Bloques de las tareas asignadas, cuyos resúmenes cambian.
+                if block_ids is None:
+                    block_ids = set(tasks.order_by().values_list("block_id", flat=True).distinct())
+                rollups.mark_dirty(students=chunk, blocks=block_ids)
+        last_id = chunk[-1]
+        job.processed_students += len(chunk)
+        job.created_rows += created
+        job.save(update_fields=["processed_students", "created_rows", "updated_at"])
+
+    job.status = AssignmentJob.Status.COMPLETED
+    job.finished_at = timezone.now()
+    job.save(update_fields=["status", "finished_at", "updated_at"])
+    return job
+
+
+def run_assignment_job(job_id):
+    """Punto de entrada del hilo: marca el trabajo como fallido si algo sale mal."""
+    close_old_connections()
+    job = AssignmentJob.objects.select_related("topic", "block").get(pk=job_id)
+    try:
+        run_assignment(job)
+    except Exception as exc:
+        logger.exception("Falló la asignación masiva %s", job_id)
+        AssignmentJob.objects.filter(pk=job_id).update(
+            status=AssignmentJob.Status.FAILED,
+            error=str(exc),
+            finished_at=timezone.now(),
+            updated_at=timezone.now(),
+        )
+    finally:
+        connections.close_all()
+
+
+def start_job_thread(job_id):
+    threading.Thread(target=run_assignment_job, args=(job_id,), daemon=True).start()
+
+
+def assign_cohort(cohort, topic=None, block=None):
+    """
+    Asigna el tema o bloque a la cohorte.
+
+    Con hasta `ASSIGNMENT_ASYNC_THRESHOLD` estudiantes se ejecuta en la
+    petición y devuelve el trabajo ya completado; por encima se encola en
+    un hilo y devuelve el trabajo pendiente.
+    """
+    students = resolve_cohort(cohort)
+    total = students.count()
+    job = AssignmentJob.objects.create(topic=topic, block=block, cohort=cohort, total_students=total)
+    if total <= settings.ASSIGNMENT_ASYNC_THRESHOLD:
+        return run_assignment(job)
+    transaction.on_commit(lambda: start_job_thread(job.pk))
+    return job
@@ -0,0 +1,167 @@
+"""
+Alta y actualización masiva (upsert) de `StudentTaskProgress`.
+
+Las filas se procesan en lotes: cada lote se valida con una sola consulta
+(que comprueba estudiantes, tareas y pares ya existentes) y se escribe con
+`bulk_create(update_conflicts=True)` sobre la clave única `(student, task)`.
+"""
+
+from itertools import islice
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import BigIntegerField, CharField, Value
+from rest_framework import serializers
+
+from tasks.models import BlockTask
+from . import rollups
+from .models import Student, StudentTaskProgress
+
+# Campos que una fila puede traer además de la clave (student, task).
+UPSERT_FIELDS = ("status", "started_at", "completed_at", "notes")
+
+
+class ProgressRowSerializer(serializers.Serializer):
+    """Valida la forma de una fila sin consultar la base de datos."""
+
+    student = serializers.IntegerField(min_value=1)
+    task = serializers.IntegerField(min_value=1)
+    status = serializers.ChoiceField(choices=StudentTaskProgress.Status.choices, required=False)
+    started_at = serializers.DateTimeField(required=False, allow_null=True)
+    completed_at = serializers.DateTimeField(required=False, allow_null=True)
+    notes = serializers.CharField(required=False, allow_blank=True)
+
+
+def _lookup(student_ids, task_ids):
+    """Una consulta: estudiantes y tareas existentes, y pares ya registrados."""
+
+    def tagged(queryset, columns, kind):
+        return queryset.order_by().values_list(*columns, Value(kind, output_field=CharField()))
+
+    zero = Value(0, output_field=BigIntegerField())
+    query = tagged(Student.objects.filter(pk__in=student_ids), ("pk", zero, zero), "student").union(
+        tagged(BlockTask.objects.filter(pk__in=task_ids), ("pk", zero, zero), "task"),
+        tagged(
+            StudentTaskProgress.objects.filter(student_id__in=student_ids, task_id__in=task_ids),
+            ("student_id", "task_id", "pk"),
+            "progress",
+        ),
+        all=True,
+    )
+    students, tasks, existing = set(), set(), {}
+    for first, second, progress_id, kind in query:
+        if kind == "student":
+            students.add(first)
+        elif kind == "task":
+            tasks.add(first)
+        else:
+            existing[(first, second)] = progress_id
+    return students, tasks, existing
+
+
+def _upsert_batch(rows, offset):
+    results = [None] * len(rows)
+    valid = {}
+    for index, row in enumerate(rows):
+        serializer = ProgressRowSerializer(data=row) if isinstance(row, dict) else None
+        if serializer is None:
+            results[index] = {"status": "error", "errors": {"non_field_errors": ["Se esperaba un objeto JSON."]}}
+        elif not serializer.is_valid():
+            results[index] = {"status": "error", "errors": serializer.errors}
+        else:
+            valid[index] = serializer.validated_data
+
+    students, tasks, existing = _lookup(
+        {data["student"] for data in valid.values()},
+        {data["task"] for data in valid.values()},
+    )
+
+    # Agrupa por conjunto de campos enviados: un upsert por grupo, y la
+    # última aparición de un par gana dentro del lote.
+    groups, seen = {}, {}
+    for index, data in valid.items():
+        errors = {}
+        if data["student"] not in students:
+            errors["student"] = [f"El estudiante {data['student']} no existe."]
+        if data["task"] not in tasks:
+            errors["task"] = [f"La tarea {data['task']} no existe."]
+        if errors:
+            results[index] = {"status": "error", "errors": errors}
+            continue
+        key = (data["student"], data["task"])
+        if key in seen:
+            results[seen[key]] = {
+                "status": "error",
+                "errors": {"non_field_errors": ["Par (student, task) repetido; se aplicó la última fila."]},
+            }
+        seen[key] = index
+
+    for key, index in seen.items():
+        fields = tuple(name for name in UPSERT_FIELDS if name in valid[index])
+        groups.setdefault(fields, []).append(index)
+
+    with transaction.atomic():
+        for fields, indexes in groups.items():
+            objs = [
+                StudentTaskProgress(
+                    student_id=valid[i]["student"],
+                    task_id=valid[i]["task"],
+                    **{name: valid[i][name] for name in fields},
+                )
+                for i in indexes
+            ]
+            if fields:
+                StudentTaskProgress.objects.bulk_create(
+                    objs,
+                    update_conflicts=True,
+                    unique_fields=["student", "task"],
+                    update_fields=[*fields, "updated_at"],
+                )
+            else:
+                # Sin campos que actualizar solo se insertan los pares nuevos.
+                new = [obj for obj in objs if (obj.student_id, obj.task_id) not in existing]
+                StudentTaskProgress.objects.bulk_create(new, ignore_conflicts=True)
+                missing = [obj for obj in new if obj.pk is None]
+                if missing:
+                    inserted = StudentTaskProgress.objects.filter(
+                        student_id__in={obj.student_id for obj in missing},
+                        task_id__in={obj.task_id for obj in missing},
+                    ).values_list("student_id", "task_id", "pk")
+                    ids = {(student, task): pk for student, task, pk in inserted}
+                    for obj in missing:
+                        obj.pk = ids.get((obj.student_id, obj.task_id))
+
+            for i, obj in zip(indexes, objs):
+                key = (obj.student_id, obj.task_id)
+                if key in existing:
+                    outcome = "updated" if fields else "unchanged"
+                    results[i] = {"status": outcome, "id": existing[key]}
+                else:
+                    results[i] = {"status": "created", "id": obj.pk}
+
+        written = [valid[i] for i in seen.values() if results[i]["status"] != "unchanged"]
+        if written:
+            rollups.mark_dirty(
+                students={row["student"] for row in written}, tasks={row["task"] for row in written}
+            )
+
+    return [{"index": offset + index, **result} for index, result in enumerate(results)]
+
+
+def bulk_upsert_progress(rows, batch_size=None):
+    """
+    Aplica `rows` (cualquier iterable, incluido un stream NDJSON) por lotes.
+
+    Devuelve un resumen con los totales por estado y un resultado por fila,
+    en el mismo orden de entrada.
+    """
+    batch_size = batch_size or settings.BULK_BATCH_SIZE
+    rows = iter(rows)
+    summary = {"created": 0, "updated": 0, "unchanged": 0, "errors": 0, "results": []}
+    offset = 0
+    while batch := list(islice(rows, batch_size)):
+        for result in _upsert_batch(batch, offset):
+            summary["errors" if result["status"] == "error" else result["status"]] += 1
+            summary["results"].append(result)
+        offset += len(batch)
+    return summary
@@ -0,0 +1,368 @@
+"""
+Registro de cambios del progreso (`ProgressChange`) para sincronizar por deltas.
+
+Triggers de la base de datos agregan una fila por cada alta, cambio o baja
+de `StudentTaskProgress`, en la misma transacción, así que también quedan
+registrados `bulk_create`, `update()`, el upsert masivo y los borrados en
+cascada. `seq` crece con cada cambio:
+
+- SQLite serializa las escrituras, así que el orden de `seq` es el de commit.
+- En Postgres dos transacciones pueden confirmarse en otro orden que el de
+  sus `seq`, y un cliente que ya leyó la mayor se saltaría la menor. Cada
+  cambio guarda además la transacción que lo escribió (`xact_id`, de
+  `pg_current_xact_id()`) y se leen en orden de `(xact_id, seq)`, solo los
+  de transacciones por debajo de `pg_snapshot_xmin()`: esas ya terminaron y
+  cualquiera que se confirme después tiene un `xact_id` mayor. Las
+  escrituras de progreso no se esperan entre sí; un cambio aparece cuando
+  terminan las transacciones que empezaron antes que la suya.
+
+`read()` devuelve los cambios posteriores a un `seq` (el último por fila de
+progreso, con su estado actual) y `prune()` borra los viejos por tramos.
+
+`event_stream()` arma el stream SSE. Los streams abiertos no consultan la
+base cada uno: un único `ChangeFeed` por proceso lee los cambios nuevos cada
+`PROGRESS_CHANGES_POLL_SECONDS` en un hilo propio (una conexión) y los
+reparte; cada stream solo consulta al abrirse, para ponerse al día desde su
+`since`.
+"""
+
+import asyncio
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from django.conf import settings
+from django.db import DatabaseError, close_old_connections, connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from rest_framework import fields, status
+from rest_framework.exceptions import APIException
+
+from common.serializers import values_plan
+from .models import ProgressChange, StudentTaskProgress
+from .serializers import StudentTaskProgressSerializer
+
+TABLE = StudentTaskProgress._meta.db_table
+LOG = ProgressChange._meta.db_table
+COLUMNS = "progress_id, student_id, task_id, operation, changed_at, xact_id"
+
+_datetime = fields.DateTimeField()
+
+logger = logging.getLogger(__name__)
+
+# Milisegundos que espera el navegador (`EventSource`) antes de reconectar.
+RETRY_MS = 3000
+
+
+class ChangesExpired(APIException):
+    status_code = status.HTTP_410_GONE
+    default_detail = "Los cambios desde ese seq ya se borraron: vuelve a listar el progreso y usa el last_seq."
+    default_code = "changes_expired"
+
+
+class PostgresChangeLog:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def install_sql(self):
+        qn = self.connection.ops.quote_name
+        function = qn(f"{LOG}_record")
+
+        def insert(row, operation):
+            return (
+                f"INSERT INTO {qn(LOG)} ({COLUMNS}) "
+                f"VALUES ({row}.id, {row}.student_id, {row}.task_id, {operation}, clock_timestamp(), "
+                f"pg_current_xact_id()::text::bigint);"
+            )
+
+        deleted = insert("OLD", "'deleted'")
+        saved = insert("NEW", "CASE TG_OP WHEN 'INSERT' THEN 'created' ELSE 'updated' END")
+        return [
+            f"CREATE OR REPLACE FUNCTION {function}() RETURNS trigger AS $$ BEGIN "
+            f"IF TG_OP = 'DELETE' THEN {deleted} RETURN NULL; END IF; "
+            # Si la fila pasa a otro estudiante, el anterior la ve borrada.
+            f"IF TG_OP = 'UPDATE' AND OLD.student_id <> NEW.student_id THEN {deleted} END IF; "
+            f"{saved} RETURN NULL; END $$ LANGUAGE plpgsql",
+            f"DROP TRIGGER IF EXISTS {qn(TABLE + '_changes')} ON {qn(TABLE)}",
+            f"CREATE TRIGGER {qn(TABLE + '_changes')} AFTER INSERT OR UPDATE OR DELETE ON {qn(TABLE)} "
+            f"FOR EACH ROW EXECUTE FUNCTION {function}()",
+        ]
+
+    def uninstall_sql(self):
+        qn = self.connection.ops.quote_name
+        return [
+            f"DROP TRIGGER IF EXISTS {qn(TABLE + '_changes')} ON {qn(TABLE)}",
+            f"DROP FUNCTION IF EXISTS {qn(LOG + '_record')}()",
+        ]
+
+
+class SQLiteChangeLog:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def install_sql(self):
+        qn = self.connection.ops.quote_name
+        # Mismo formato que guarda Django para un DateTimeField en UTC.
+        now = "strftime('%Y-%m-%d %H:%M:%f', 'now')"
+
+        # Las escrituras ya van en orden de commit: `xact_id` queda en 0.
+        def insert(row, operation, where=""):
+            return (
+                f"INSERT INTO {qn(LOG)} ({COLUMNS}) "
+                f"SELECT {row}.id, {row}.student_id, {row}.task_id, '{operation}', {now}, 0{where};"
+            )
+
+        moved = insert("OLD", "deleted", " WHERE OLD.student_id <> NEW.student_id")
+        return [
+            f"CREATE TRIGGER {qn(TABLE + '_changes_insert')} AFTER INSERT ON {qn(TABLE)} "
+            f"BEGIN {insert('NEW', 'created')} END",
+            f"CREATE TRIGGER {qn(TABLE + '_changes_update')} AFTER UPDATE ON {qn(TABLE)} "
+            f"BEGIN {moved} {insert('NEW', 'updated')} END",
+            f"CREATE TRIGGER {qn(TABLE + '_changes_delete')} AFTER DELETE ON {qn(TABLE)} "
+            f"BEGIN {insert('OLD', 'deleted')} END",
+        ]
+
+    def uninstall_sql(self):
+        qn = self.connection.ops.quote_name
+        return [
+            f"DROP TRIGGER IF EXISTS {qn(TABLE + '_changes_' + event)}" for event in ("insert", "update", "delete")
+        ]
+
+
+BACKENDS = {
+    "postgresql": PostgresChangeLog,
+    "sqlite": SQLiteChangeLog,
+}
+
+
+def install(schema_editor):
+    """Crea los triggers del registro; para usar desde una migración con `RunPython`."""
+    backend = BACKENDS.get(schema_editor.connection.vendor)
+    if backend:
+        for sql in backend(schema_editor.connection).install_sql():
+            schema_editor.execute(sql, params=None)
+
+
+def uninstall(schema_editor):
+    backend = BACKENDS.get(schema_editor.connection.vendor)
+    if backend:
+        for sql in backend(schema_editor.connection).uninstall_sql():
+            schema_editor.execute(sql, params=None)
+
+
+def _settled(changes):
+    """Solo los cambios de transacciones terminadas (ver el docstring del módulo)."""
+    if connections[changes.db].vendor == "postgresql":
+        return changes.filter(xact_id__lt=RawSQL("pg_snapshot_xmin(pg_current_snapshot())::text::bigint", ()))
+    return changes
+
+
+def last_seq():
+    changes = _settled(ProgressChange.objects.all())
+    return changes.order_by("-xact_id", "-seq").values_list("seq", flat=True).first() or 0
+
+
+def read(since, student=None, limit=None):
+    """
+    Cambios posteriores a `since` (de un estudiante, si se indica), hasta `limit`.
+
+    Si una fila de progreso cambió varias veces, queda solo su último cambio,
+    con `progress` en su estado actual (`None` si se borró o ya no existe).
+    `last_seq` es el `since` de la lectura siguiente.
+    """
+    page = _read(since, student, limit)
+    return {
+        "results": [change for _, change in page["results"]],
+        "last_seq": page["last_seq"],
+        "has_more": page["has_more"],
+    }
+
+
+def _xact_id(seq):
+    """`xact_id` del cambio `seq` (o del anterior que quede), o None si no hay."""
+    changes = ProgressChange.objects.filter(seq__lte=seq).order_by("-seq")
+    return changes.values_list("xact_id", flat=True).first()
+
+
+def _read(since, student=None, limit=None):
+    """
+    Como `read()`, pero cada resultado es `(posición, cambio)` y `position`
+    es la posición del último leído: `(xact_id, seq)`, el orden del registro.
+    """
+    limit = limit or settings.PROGRESS_CHANGES_PAGE_SIZE
+    xact_id = _xact_id(since) if since else None
+    position = (xact_id or 0, since)
+    after = Q(xact_id__gt=position[0]) | Q(xact_id=position[0], seq__gt=since)
+    changes = _settled(ProgressChange.objects.filter(after))
+    if student is not None:
+        changes = changes.filter(student_id=student)
+    columns = ("seq", "xact_id", "progress_id", "student_id", "task_id", "operation", "changed_at")
+    rows = list(changes.order_by("xact_id", "seq").values(*columns)[: limit + 1])
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    # Un salto tras `since` puede ser de otros estudiantes o de `prune()`:
+    # en el segundo caso ya no queda ningún cambio hasta `since`.
+    if since and xact_id is None and rows and min(row["seq"] for row in rows) > since + 1:
+        raise ChangesExpired()
+
+    # Por (progreso, estudiante): si la fila pasó a otro estudiante, el anterior conserva su baja.
+    latest = {}
+    for row in rows:
+        key = (row["progress_id"], row["student_id"])
+        latest.pop(key, None)
+        latest[key] = row
+    deleted = ProgressChange.Operation.DELETED
+    live = [row["progress_id"] for row in latest.values() if row["operation"] != deleted]
+    current = _current_progress(live) if live else {}
+    results = [
+        (
+            (row["xact_id"], row["seq"]),
+            {
+                "seq": row["seq"],
+                "operation": row["operation"],
+                "id": row["progress_id"],
+                "student": row["student_id"],
+                "task": row["task_id"],
+                "changed_at": _datetime.to_representation(row["changed_at"]),
+                "progress": None if row["operation"] == deleted else current.get(row["progress_id"]),
+            },
+        )
+        for row in latest.values()
+    ]
+    if rows:
+        position = (rows[-1]["xact_id"], rows[-1]["seq"])
+    return {"results": results, "last_seq": position[1], "position": position, "has_more": has_more}
+
+
+def _current_progress(ids):
+    queryset = StudentTaskProgress.objects.filter(pk__in=ids)
+    plan = values_plan(StudentTaskProgressSerializer(), queryset)
+    return {row["id"]: row for row in plan.represent_many(queryset.values(*plan.paths))}
+
+
+def prune(before, batch_size):
+    """
+    Borra por tramos los cambios anteriores a `before` y devuelve cuántos.
+    Siempre conserva el último, para que `read()` reconozca un `since` borrado.
+    """
+    old = ProgressChange.objects.filter(changed_at__lt=before, seq__lt=last_seq())
+    deleted = 0
+    while True:
+        seqs = list(old.values_list("seq", flat=True)[:batch_size])
+        if not seqs:
+            return deleted
+        deleted += ProgressChange.objects.filter(seq__in=seqs).delete()[0]
+
+
+def _in_feed_thread(func, *args):
+    close_old_connections()
+    return func(*args)
+
+
+class ChangeFeed:
+    """Lee los cambios nuevos una vez por proceso y los reparte entre los streams abiertos."""
+
+    def __init__(self):
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="progress-changes")
+        self._queues = set()
+        self._task = None
+        self._ready = None
+
+    async def run(self, func, *args):
+        """Ejecuta `func` (ORM síncrono) en el hilo del feed."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(_in_feed_thread, func, *args))
+
+    async def subscribe(self):
+        """
+        Cola que recibe cada lote de cambios nuevos, como pares `(posición,
+        cambio)` (ver `_read()`). Vuelve cuando el lector
+        ya fijó desde dónde lee: lo anterior lo cubre la lectura inicial del
+        stream y lo posterior llega a la cola.
+        """
+        queue = asyncio.Queue()
+        self._queues.add(queue)
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+            self._ready = asyncio.Event()
+            self._task = loop.create_task(self._poll())
+        try:
+            await self._ready.wait()
+        except BaseException:
+            self._queues.discard(queue)
+            raise
+        return queue
+
+    def unsubscribe(self, queue):
+        self._queues.discard(queue)
+
+    async def _poll(self):
+        since = None
+        while self._queues:
+            try:
+                if since is None:
+                    since = await self.run(last_seq)
+                    self._ready.set()
+                    continue
+                page = await self.run(_read, since)
+            except DatabaseError:
+                logger.warning("No se pudieron leer los cambios de progreso", exc_info=True)
+                await asyncio.sleep(settings.PROGRESS_CHANGES_POLL_SECONDS)
+                continue
+            if page["results"]:
+                for queue in self._queues:
+                    queue.put_nowait(page["results"])
+            since = page["last_seq"]
+            if not page["has_more"]:
+                await asyncio.sleep(settings.PROGRESS_CHANGES_POLL_SECONDS)
+
+
+feed = ChangeFeed()
+
+
+def _event(change):
+    data = json.dumps(change, ensure_ascii=False, separators=(",", ":"))
+    return f"id: {change['seq']}\nevent: progress\ndata: {data}\n\n"
+
+
+async def event_stream(since, student=None, seconds=None):
+    """
+    Eventos SSE con los cambios posteriores a `since` (`id` es el `seq`).
+
+    Cierra tras `seconds` (`PROGRESS_CHANGES_STREAM_SECONDS`); el navegador
+    reconecta con `Last-Event-ID`. Si los cambios desde `since` ya se
+    borraron, manda un evento `expired` y cierra.
+    """
+    loop = asyncio.get_running_loop()
+    seconds = settings.PROGRESS_CHANGES_STREAM_SECONDS if seconds is None else seconds
+    deadline = loop.time() + seconds
+    # Se suscribe antes de ponerse al día: lo que llegue mientras tanto queda en la cola.
+    queue = await feed.subscribe() if seconds > 0 else None
+    try:
+        yield f"retry: {RETRY_MS}\n\n"
+        while True:
+            try:
+                page = await feed.run(_read, since, student)
+            except ChangesExpired as exc:
+                yield f"event: expired\ndata: {json.dumps({'detail': str(exc.detail)}, ensure_ascii=False)}\n\n"
+                return
+            for _, change in page["results"]:
+                yield _event(change)
+            since, position = page["last_seq"], page["position"]
+            if not page["has_more"]:
+                break
+
+        while (remaining := deadline - loop.time()) > 0:
+            try:
+                batch = await asyncio.wait_for(queue.get(), min(remaining, settings.PROGRESS_CHANGES_HEARTBEAT_SECONDS))
+            except asyncio.TimeoutError:
+                yield ": ping\n\n"
+                continue
+            for change_position, change in batch:
+                if change_position > position and (student is None or change["student"] == student):
+                    yield _event(change)
+                    position = change_position
+    finally:
+        if queue is not None:
+            feed.unsubscribe(queue)
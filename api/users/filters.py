@@ -0,0 +1,16 @@
+import django_filters
+
+from .models import Student
+
+
+class StudentFilter(django_filters.FilterSet):
+    """Filtros de estudiantes; también definen cohortes en las asignaciones masivas."""
+
+    full_name = django_filters.CharFilter(lookup_expr="icontains")
+    is_active = django_filters.BooleanFilter(field_name="user__is_active")
+    started_after = django_filters.DateFilter(field_name="started_at", lookup_expr="gte")
+    started_before = django_filters.DateFilter(field_name="started_at", lookup_expr="lte")
+
+    class Meta:
+        model = Student
+        fields = ["full_name", "is_active", "started_after", "started_before"]
@@ -0,0 +1,35 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from users import changes
+
+
+class Command(BaseCommand):
+    help = "Borra por tramos los cambios de progreso más viejos que la retención."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=settings.PROGRESS_CHANGES_RETENTION_DAYS,
+            help="Días de cambios que se conservan.",
+        )
+        parser.add_argument("--batch-size", type=int, default=5000, help="Cambios borrados por transacción.")
+        parser.add_argument(
+            "--every",
+            type=int,
+            default=0,
+            help="Repite la limpieza cada tantos segundos, sin terminar.",
+        )
+
+    def handle(self, *args, days, batch_size, every, **options):
+        while True:
+            deleted = changes.prune(timezone.now() - timedelta(days=days), batch_size)
+            self.stdout.write(self.style.SUCCESS(f"{deleted} cambios de progreso borrados."))
+            if not every:
+                return
+            time.sleep(every)
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from users import rollups
+
+
+class Command(BaseCommand):
+    help = "Regenera los resúmenes de progreso por estudiante, tema y bloque."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=rollups.REFRESH_CHUNK_SIZE,
+            help="Estudiantes procesados por transacción.",
+        )
+
+    def handle(self, *args, batch_size, **options):
+        processed = rollups.rebuild(batch_size=batch_size)
+        self.stdout.write(self.style.SUCCESS(f"Resúmenes regenerados para {processed} estudiantes."))
@@ -0,0 +1,37 @@
+# Generated by Django 6.0.1 on 2026-10-18 20:15
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0001_initial'),
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AssignmentJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('cohort', models.JSONField(help_text='IDs de estudiantes o filtro con el que se resolvió la cohorte')),
+                ('status', models.CharField(choices=[('pending', 'Pendiente'), ('running', 'En ejecución'), ('completed', 'Completada'), ('failed', 'Fallida')], default='pending', max_length=12)),
+                ('total_students', models.PositiveIntegerField(default=0)),
+                ('processed_students', models.PositiveIntegerField(default=0)),
+                ('created_rows', models.PositiveIntegerField(default=0)),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('block', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='assignment_jobs', to='tasks.studyblock')),
+                ('topic', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='assignment_jobs', to='tasks.studytopic')),
+            ],
+            options={
+                'verbose_name': 'Asignación masiva',
+                'verbose_name_plural': 'Asignaciones masivas',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 6.0.1 on 2026-10-18 20:17
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0001_initial'),
+        ('users', '0002_assignmentjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StudentBlockProgress',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('completed', models.PositiveIntegerField(default=0)),
+                ('in_progress', models.PositiveIntegerField(default=0)),
+                ('pending', models.PositiveIntegerField(default=0)),
+                ('completed_minutes', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('block', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='tasks.studyblock')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='users.student')),
+            ],
+            options={
+                'verbose_name': 'Resumen de progreso por bloque',
+                'verbose_name_plural': 'Resúmenes de progreso por bloque',
+                'unique_together': {('student', 'block')},
+            },
+        ),
+        migrations.CreateModel(
+            name='StudentTopicProgress',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('completed', models.PositiveIntegerField(default=0)),
+                ('in_progress', models.PositiveIntegerField(default=0)),
+                ('pending', models.PositiveIntegerField(default=0)),
+                ('completed_minutes', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='users.student')),
+                ('topic', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='tasks.studytopic')),
+            ],
+            options={
+                'verbose_name': 'Resumen de progreso por tema',
+                'verbose_name_plural': 'Resúmenes de progreso por tema',
+                'unique_together': {('student', 'topic')},
+            },
+        ),
+    ]
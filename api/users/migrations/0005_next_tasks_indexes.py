@@ -0,0 +1,17 @@
+# Generated by Django 6.0.1 on 2026-10-18 21:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0004_student_updated_at_progress_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='studenttaskprogress',
+            index=models.Index(condition=models.Q(('status', 'completed')), fields=['student', 'task'], name='progress_completed_idx'),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 6.0.1 on 2026-10-18 21:24
+
+from django.db import migrations, models
+
+from users.changes import install, uninstall
+
+
+def create_change_triggers(apps, schema_editor):
+    install(schema_editor)
+
+
+def drop_change_triggers(apps, schema_editor):
+    uninstall(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0005_next_tasks_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProgressChange',
+            fields=[
+                ('seq', models.BigAutoField(primary_key=True, serialize=False)),
+                ('progress_id', models.BigIntegerField()),
+                ('student_id', models.BigIntegerField()),
+                ('task_id', models.BigIntegerField()),
+                ('operation', models.CharField(choices=[('created', 'Creado'), ('updated', 'Actualizado'), ('deleted', 'Borrado')], max_length=7)),
+                ('changed_at', models.DateTimeField()),
+            ],
+            options={
+                'verbose_name': 'Cambio de progreso',
+                'verbose_name_plural': 'Cambios de progreso',
+                'ordering': ['seq'],
+                'indexes': [models.Index(fields=['student_id', 'seq'], name='progress_change_student_idx')],
+            },
+        ),
+        migrations.RunPython(create_change_triggers, drop_change_triggers),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 6.0.1 on 2026-10-18 21:33
+
+from django.db import migrations, models
+
+from common import sync
+
+SYNCED_MODELS = ("StudentTaskProgress",)
+
+
+def _models(apps):
+    return [apps.get_model("users", name) for name in SYNCED_MODELS]
+
+
+def create_tombstone_triggers(apps, schema_editor):
+    sync.install(schema_editor, _models(apps))
+
+
+def drop_tombstone_triggers(apps, schema_editor):
+    sync.uninstall(schema_editor, _models(apps))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0004_delta_sync'),
+        ('common', '0003_tombstone'),
+        ('users', '0006_progress_changes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='studenttaskprogress',
+            index=models.Index(fields=['updated_at'], name='progress_updated_idx'),
+        ),
+        migrations.RunPython(create_tombstone_triggers, drop_tombstone_triggers),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 6.0.1 on 2026-10-18 21:51
+
+from django.db import migrations, models
+
+from users.changes import install, uninstall
+
+
+def create_change_triggers(apps, schema_editor):
+    install(schema_editor)
+
+
+def drop_change_triggers(apps, schema_editor):
+    uninstall(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0007_delta_sync'),
+    ]
+
+    # Los triggers se vuelven a crear: los nuevos guardan `xact_id` y ya no
+    # toman el advisory lock. Sin ellos, SQLite puede rehacer la tabla.
+    operations = [
+        migrations.RunPython(drop_change_triggers, create_change_triggers),
+        migrations.RemoveIndex(
+            model_name='progresschange',
+            name='progress_change_student_idx',
+        ),
+        migrations.AddField(
+            model_name='progresschange',
+            name='xact_id',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='progresschange',
+            index=models.Index(fields=['xact_id', 'seq'], name='progress_change_position_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='progresschange',
+            index=models.Index(fields=['student_id', 'xact_id', 'seq'], name='progress_student_position_idx'),
+        ),
+        migrations.RunPython(create_change_triggers, drop_change_triggers),
+    ]
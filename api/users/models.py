@@ -14,6 +14,7 @@ class Student(models.Model):
     )
     full_name = models.CharField(max_length=150, help_text="Nombre completo del estudiante")
     started_at = models.DateField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         verbose_name = "Estudiante"
@@ -49,6 +50,7 @@ class StudentTaskProgress(models.Model):
     started_at = models.DateTimeField(blank=True, null=True)
     completed_at = models.DateTimeField(blank=True, null=True)
     notes = models.TextField(blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         verbose_name = "Progreso de tarea"
@@ -58,7 +60,135 @@ class StudentTaskProgress(models.Model):
         indexes = [
             models.Index(fields=["student", "task"]),
             models.Index(fields=["status"]),
+            # Anti-join de las siguientes tareas: solo las completadas.
+            models.Index(
+                fields=["student", "task"],
+                condition=models.Q(status="completed"),
+                name="progress_completed_idx",
+            ),
+            # Sincronización incremental (`?updated_since=`).
+            models.Index(fields=["updated_at"], name="progress_updated_idx"),
         ]
 
     def __str__(self) -> str:
         return f"{self.student} · {self.task} · {self.status}"
+
+
+class AssignmentJob(models.Model):
+    """Asignación de un tema o bloque a una cohorte, ejecutada en segundo plano."""
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pendiente"
+        RUNNING = "running", "En ejecución"
+        COMPLETED = "completed", "Completada"
+        FAILED = "failed", "Fallida"
+
+    topic = models.ForeignKey(
+        "tasks.StudyTopic",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="assignment_jobs",
+    )
+    block = models.ForeignKey(
+        "tasks.StudyBlock",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="assignment_jobs",
+    )
+    cohort = models.JSONField(help_text="IDs de estudiantes o filtro con el que se resolvió la cohorte")
+    status = models.CharField(max_length=12, choices=Status.choices, default=Status.PENDING)
+    total_students = models.PositiveIntegerField(default=0)
+    processed_students = models.PositiveIntegerField(default=0)
+    created_rows = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        verbose_name = "Asignación masiva"
+        verbose_name_plural = "Asignaciones masivas"
+        ordering = ["-created_at"]
+
+    def __str__(self) -> str:
+        return f"Asignación {self.pk} · {self.status}"
+
+
+class ProgressRollup(models.Model):
+    """Contadores materializados del progreso de un estudiante (ver `users.rollups`)."""
+
+    student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name="+")
+    completed = models.PositiveIntegerField(default=0)
+    in_progress = models.PositiveIntegerField(default=0)
+    pending = models.PositiveIntegerField(default=0)
+    completed_minutes = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        abstract = True
+
+
+class StudentTopicProgress(ProgressRollup):
+    """Resumen del progreso de un estudiante en un tema."""
+
+    topic = models.ForeignKey("tasks.StudyTopic", on_delete=models.CASCADE, related_name="+")
+
+    class Meta:
+        verbose_name = "Resumen de progreso por tema"
+        verbose_name_plural = "Resúmenes de progreso por tema"
+        unique_together = ("student", "topic")
+
+    def __str__(self) -> str:
+        return f"{self.student} · {self.topic}"
+
+
+class StudentBlockProgress(ProgressRollup):
+    """Resumen del progreso de un estudiante en un bloque."""
+
+    block = models.ForeignKey("tasks.StudyBlock", on_delete=models.CASCADE, related_name="+")
+
+    class Meta:
+        verbose_name = "Resumen de progreso por bloque"
+        verbose_name_plural = "Resúmenes de progreso por bloque"
+        unique_together = ("student", "block")
+
+    def __str__(self) -> str:
+        return f"{self.student} · {self.block}"
+
+
+class ProgressChange(models.Model):
+    """
+    Registro de solo anexado de los cambios de `StudentTaskProgress`.
+
+    Lo escriben triggers de la base de datos (ver `users.changes`) en la
+    misma transacción que el cambio, incluidas las escrituras masivas. Sin
+    claves foráneas: la fila sobrevive al progreso y al estudiante borrados.
+    """
+
+    class Operation(models.TextChoices):
+        CREATED = "created", "Creado"
+        UPDATED = "updated", "Actualizado"
+        DELETED = "deleted", "Borrado"
+
+    seq = models.BigAutoField(primary_key=True)
+    progress_id = models.BigIntegerField()
+    student_id = models.BigIntegerField()
+    task_id = models.BigIntegerField()
+    operation = models.CharField(max_length=7, choices=Operation.choices)
+    changed_at = models.DateTimeField()
+    # Transacción que escribió el cambio (solo en Postgres); el registro se lee en orden de `(xact_id, seq)`.
+    xact_id = models.BigIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Cambio de progreso"
+        verbose_name_plural = "Cambios de progreso"
+        ordering = ["seq"]
+        indexes = [
+            models.Index(fields=["xact_id", "seq"], name="progress_change_position_idx"),
+            models.Index(fields=["student_id", "xact_id", "seq"], name="progress_student_position_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.seq} · {self.operation} {self.progress_id}"
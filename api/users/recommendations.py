@@ -0,0 +1,45 @@
+"""
+"¿Qué hago ahora?": las siguientes tareas de un estudiante.
+
+Son las tareas disponibles de bloques publicados de temas activos que el
+estudiante no completó, en orden de `(número de bloque, orden de la tarea)`.
+Se resuelven en una sola consulta con un anti-join (`NOT EXISTS`) contra su
+progreso completado, apoyada en índices parciales:
+
+- `block_published_number_idx` en `StudyBlock(number, topic)`: recorre los
+  bloques publicados ya en orden de número.
+- `task_available_order_idx` en `BlockTask(block, order)`: las tareas
+  disponibles de cada bloque, en orden.
+- `progress_completed_idx` en `StudentTaskProgress(student, task)`: el
+  anti-join se responde solo con el índice.
+
+Como los bloques llegan ordenados por número, Postgres completa el orden
+con un *incremental sort* y corta en cuanto tiene `limit` filas, sin leer
+todas las tareas.
+"""
+
+from django.db.models import Exists, OuterRef
+
+from tasks.models import BlockTask
+
+from .models import StudentTaskProgress
+
+DEFAULT_LIMIT = 5
+MAX_LIMIT = 50
+
+
+def next_tasks(student, limit=DEFAULT_LIMIT):
+    """Queryset con las primeras `limit` tareas pendientes de `student`."""
+    completed = StudentTaskProgress.objects.filter(
+        student=student, task=OuterRef("pk"), status=StudentTaskProgress.Status.COMPLETED
+    )
+    return (
+        BlockTask.objects.filter(
+            status=BlockTask.Status.AVAILABLE,
+            block__is_published=True,
+            block__topic__is_active=True,
+        )
+        .filter(~Exists(completed))
+        .select_related("block")
+        .order_by("block__number", "order", "block__topic_id")[:limit]
+    )
@@ -0,0 +1,212 @@
+"""
+Resúmenes materializados de progreso por (estudiante, tema) y (estudiante, bloque).
+
+Las escrituras marcan como pendientes los estudiantes, tareas, bloques y
+temas afectados; al confirmarse la transacción se recalculan solo esas
+filas con una agregación en la base de datos. `rebuild()` los regenera
+por completo (comando `rebuild_progress_rollups`).
+"""
+
+import threading
+
+from django.db import connections, transaction
+from django.db.models import Count, Exists, F, OuterRef, Q, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from tasks.models import BlockTask, StudyBlock
+from .models import Student, StudentBlockProgress, StudentTaskProgress, StudentTopicProgress
+
+_pending = threading.local()
+
+# Estudiantes por sentencia al recalcular, para no exceder el límite de
+# parámetros de SQLite en los `IN (...)`.
+REFRESH_CHUNK_SIZE = 500
+
+COMPLETED = StudentTaskProgress.Status.COMPLETED
+
+
+def _counters():
+    return {
+        "completed": Count("pk", filter=Q(status=COMPLETED)),
+        "in_progress": Count("pk", filter=Q(status=StudentTaskProgress.Status.IN_PROGRESS)),
+        "pending": Count("pk", filter=Q(status=StudentTaskProgress.Status.PENDING)),
+        "completed_minutes": Coalesce(Sum("task__estimated_minutes", filter=Q(status=COMPLETED)), Value(0)),
+    }
+
+
+COUNTERS = ("completed", "in_progress", "pending", "completed_minutes")
+
+
+def _aggregate(progress, group_by):
+    return progress.order_by().values(rollup_student=F("student"), rollup_target=F(group_by)).annotate(**_counters())
+
+
+def _insert_select(model, target, rows):
+    """
+    `INSERT ... SELECT` de la agregación: las filas no pasan por Python.
+
+    Es un upsert sobre `(student, target)`: dos recálculos simultáneos de la
+    misma fila no chocan con la restricción única, el último deja su conteo.
+    """
+    db = model.objects.db
+    connection = connections[db]
+    qn = connection.ops.quote_name
+    select_sql, params = rows.query.get_compiler(db).as_sql()
+    opts = model._meta
+    columns = [opts.get_field(name).column for name in ("student", target, *COUNTERS, "updated_at")]
+    source = ["rollup_student", "rollup_target", *COUNTERS]
+    updates = ", ".join(f"{qn(column)} = excluded.{qn(column)}" for column in columns[2:])
+    # `WHERE true`: SQLite lo exige para distinguir el ON CONFLICT de un JOIN.
+    sql = (
+        f"INSERT INTO {qn(opts.db_table)} ({', '.join(qn(column) for column in columns)}) "
+        f"SELECT {', '.join(f'agg.{qn(name)}' for name in source)}, %s FROM ({select_sql}) agg WHERE true "
+        f"ON CONFLICT ({qn(columns[0])}, {qn(columns[1])}) DO UPDATE SET {updates}"
+    )
+    now = connection.ops.adapt_datetimefield_value(timezone.now())
+    with connection.cursor() as cursor:
+        cursor.execute(sql, (now, *params))
+
+
+def _insert(block_progress, topic_progress):
+    _insert_select(StudentBlockProgress, "block", _aggregate(block_progress, "task__block"))
+    _insert_select(StudentTopicProgress, "topic", _aggregate(topic_progress, "task__block__topic"))
+
+
+def _student_chunks(student_ids, size=REFRESH_CHUNK_SIZE):
+    student_ids = sorted(student_ids)
+    for start in range(0, len(student_ids), size):
+        yield student_ids[start : start + size]
+
+
+def _has_progress(**target):
+    return Exists(StudentTaskProgress.objects.filter(student=OuterRef("student"), **target))
+
+
+def refresh(student_ids, block_ids=(), topic_ids=()):
+    """Recalcula los resúmenes de `student_ids` en los bloques y temas indicados."""
+    block_ids = set(block_ids)
+    topic_ids = set(topic_ids) | set(
+        StudyBlock.objects.filter(pk__in=block_ids).values_list("topic_id", flat=True)
+    )
+    if not (block_ids or topic_ids):
+        return
+
+    for chunk in _student_chunks(student_ids):
+        progress = StudentTaskProgress.objects.filter(student_id__in=chunk)
+        with transaction.atomic():
+            _insert(
+                progress.filter(task__block_id__in=block_ids),
+                progress.filter(task__block__topic_id__in=topic_ids),
+            )
+            # Solo se borran los resúmenes que ya no tienen progreso detrás.
+            StudentBlockProgress.objects.filter(student_id__in=chunk, block_id__in=block_ids).exclude(
+                _has_progress(task__block=OuterRef("block"))
+            ).delete()
+            StudentTopicProgress.objects.filter(student_id__in=chunk, topic_id__in=topic_ids).exclude(
+                _has_progress(task__block__topic=OuterRef("topic"))
+            ).delete()
+
+
+def mark_dirty(students=(), tasks=(), blocks=(), topics=()):
+    """
+    Anota lo que cambió y agenda el recálculo al confirmar la transacción.
+
+    Agrupar hasta el commit hace que un borrado en cascada (p. ej. una tarea
+    con cientos de progresos) se resuelva con un único recálculo.
+    """
+    if not hasattr(_pending, "students"):
+        _pending.students, _pending.tasks, _pending.blocks, _pending.topics = set(), set(), set(), set()
+    _pending.students.update(students)
+    _pending.tasks.update(tasks)
+    _pending.blocks.update(blocks)
+    _pending.topics.update(topics)
+    transaction.on_commit(flush)
+
+
+def flush():
+    if not hasattr(_pending, "students"):
+        return
+    students, tasks, blocks, topics = _pending.students, _pending.tasks, _pending.blocks, _pending.topics
+    del _pending.students, _pending.tasks, _pending.blocks, _pending.topics
+    if students:
+        blocks |= set(BlockTask.objects.filter(pk__in=tasks).values_list("block_id", flat=True))
+        refresh(students, blocks, topics)
+
+
+def rebuild(batch_size=REFRESH_CHUNK_SIZE):
+    """Regenera todos los resúmenes, por tramos de estudiantes. Devuelve cuántos se procesaron."""
+    StudentBlockProgress.objects.all().delete()
+    StudentTopicProgress.objects.all().delete()
+    processed, last_id = 0, 0
+    while True:
+        chunk = list(
+            Student.objects.filter(pk__gt=last_id).order_by("pk").values_list("pk", flat=True)[:batch_size]
+        )
+        if not chunk:
+            return processed
+        progress = StudentTaskProgress.objects.filter(student_id__in=chunk)
+        with transaction.atomic():
+            _insert(progress, progress)
+        processed += len(chunk)
+        last_id = chunk[-1]
+
+
+def summary(student):
+    """
+    Progreso del estudiante por tema y por bloque, leído de los resúmenes.
+
+    Usa un número fijo de consultas: resúmenes por tema, por bloque y los
+    totales de tareas de esos temas agrupados por bloque.
+    """
+    topic_rows = list(
+        StudentTopicProgress.objects.filter(student=student).select_related("topic").order_by("topic__name")
+    )
+    block_rows = list(
+        StudentBlockProgress.objects.filter(student=student)
+        .select_related("block")
+        .order_by("block__topic_id", "block__number")
+    )
+    block_totals, topic_totals = {}, {}
+    totals = (
+        BlockTask.objects.filter(block__topic_id__in=[row.topic_id for row in topic_rows])
+        .order_by()
+        .values("block", "block__topic")
+        .annotate(tasks=Count("pk"), minutes=Coalesce(Sum("estimated_minutes"), Value(0)))
+    )
+    for row in totals:
+        block_totals[row["block"]] = (row["tasks"], row["minutes"])
+        tasks, minutes = topic_totals.get(row["block__topic"], (0, 0))
+        topic_totals[row["block__topic"]] = (tasks + row["tasks"], minutes + row["minutes"])
+
+    def entry(rollup, totals):
+        total_tasks, total_minutes = totals
+        started = rollup.completed + rollup.in_progress + rollup.pending
+        return {
+            "total_tasks": total_tasks,
+            "completed": rollup.completed,
+            "in_progress": rollup.in_progress,
+            "pending": rollup.pending,
+            "not_started": max(total_tasks - started, 0),
+            "completed_minutes": rollup.completed_minutes,
+            "total_minutes": total_minutes,
+            "completion": round(100 * rollup.completed / total_tasks, 1) if total_tasks else 0.0,
+        }
+
+    return {
+        "student": student.pk,
+        "topics": [
+            {"topic": row.topic_id, "name": row.topic.name, **entry(row, topic_totals.get(row.topic_id, (0, 0)))}
+            for row in topic_rows
+        ],
+        "blocks": [
+            {
+                "block": row.block_id,
+                "topic": row.block.topic_id,
+                "number": row.block.number,
+                "title": row.block.title,
+                **entry(row, block_totals.get(row.block_id, (0, 0))),
+            }
+            for row in block_rows
+        ],
+    }
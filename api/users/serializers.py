@@ -1,13 +1,16 @@
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
 
+from common.serializers import SparseFieldsetsMixin
 from tasks.serializers import BlockTaskSerializer
-from .models import Student, StudentTaskProgress
+from .filters import StudentFilter
+from .models import AssignmentJob, Student, StudentTaskProgress
 
 User = get_user_model()
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     password = serializers.CharField(write_only=True, required=True, min_length=6)
 
     class Meta:
@@ -33,14 +36,14 @@ class UserSerializer(serializers.ModelSerializer):
         return user
 
 
-class StudentSerializer(serializers.ModelSerializer):
+class StudentSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     class Meta:
         model = Student
         fields = ["id", "user", "full_name", "started_at"]
         read_only_fields = ["id", "started_at"]
 
 
-class StudentTaskProgressSerializer(serializers.ModelSerializer):
+class StudentTaskProgressSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     task_detail = BlockTaskSerializer(source="task", read_only=True)
 
     class Meta:
@@ -56,3 +59,64 @@ class StudentTaskProgressSerializer(serializers.ModelSerializer):
             "task_detail",
         ]
         read_only_fields = ["id", "task_detail"]
+
+
+class NextTaskSerializer(BlockTaskSerializer):
+    """Tarea recomendada, con el tema y el número de bloque para ubicarla."""
+
+    topic = serializers.IntegerField(source="block.topic_id", read_only=True)
+    block_number = serializers.IntegerField(source="block.number", read_only=True)
+
+    class Meta(BlockTaskSerializer.Meta):
+        fields = ["topic", "block_number", *BlockTaskSerializer.Meta.fields]
+
+
+class AssignmentRequestSerializer(serializers.Serializer):
+    """Cohorte de una asignación masiva: lista de IDs o filtro de estudiantes."""
+
+    students = serializers.ListField(child=serializers.IntegerField(min_value=1), required=False, allow_empty=False)
+    filter = serializers.DictField(required=False)
+
+    def validate_filter(self, value):
+        # django-filter ignora las claves desconocidas: una errata asignaría a todos.
+        errors = {key: ["Filtro desconocido."] for key in value if key not in StudentFilter.base_filters}
+        if not errors:
+            filterset = StudentFilter(data=value, queryset=Student.objects.none())
+            if not filterset.is_valid():
+                errors = {field: list(messages) for field, messages in filterset.errors.items()}
+        if errors:
+            raise serializers.ValidationError(errors)
+        return value
+
+    def validate(self, attrs):
+        if ("students" in attrs) == ("filter" in attrs):
+            raise serializers.ValidationError("Envía `students` o `filter` (solo uno de los dos).")
+        return attrs
+
+
+class AssignmentJobSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
+    class Meta:
+        model = AssignmentJob
+        fields = [
+            "id",
+            "topic",
+            "block",
+            "cohort",
+            "status",
+            "total_students",
+            "processed_students",
+            "created_rows",
+            "error",
+            "created_at",
+            "updated_at",
+            "finished_at",
+        ]
+        read_only_fields = fields
+
+
+class ProgressChangeQuerySerializer(serializers.Serializer):
+    """Parámetros de `/api/changes/`: desde qué `seq`, de qué estudiante y cuántos cambios."""
+
+    since = serializers.IntegerField(min_value=0, required=False)
+    student = serializers.IntegerField(min_value=1, required=False)
+    limit = serializers.IntegerField(min_value=1, max_value=settings.PROGRESS_CHANGES_MAX_PAGE_SIZE, required=False)
@@ -0,0 +1,65 @@
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from tasks.models import BlockTask, StudyBlock
+from . import rollups
+from .models import StudentTaskProgress
+
+
+@receiver(pre_save, sender=StudentTaskProgress)
+def remember_progress_key(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Guarda el par (estudiante, tarea) anterior por si la actualización lo cambia."""
+    instance._rollup_previous = None
+    if raw or instance.pk is None:
+        return
+    if update_fields is None or {"student", "task"} & set(update_fields):
+        instance._rollup_previous = (
+            StudentTaskProgress.objects.filter(pk=instance.pk).values_list("student_id", "task_id").first()
+        )
+
+
+@receiver(post_save, sender=StudentTaskProgress)
+def progress_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    students, tasks = {instance.student_id}, {instance.task_id}
+    previous = getattr(instance, "_rollup_previous", None)
+    if previous:
+        students.add(previous[0])
+        tasks.add(previous[1])
+    rollups.mark_dirty(students=students, tasks=tasks)
+
+
+@receiver(post_delete, sender=StudentTaskProgress)
+def progress_deleted(sender, instance, **kwargs):
+    rollups.mark_dirty(students=[instance.student_id], tasks=[instance.task_id])
+
+
+@receiver(pre_save, sender=BlockTask)
+def remember_task_rollup_fields(sender, instance, raw=False, **kwargs):
+    instance._rollup_previous = None
+    if not raw and instance.pk is not None:
+        instance._rollup_previous = (
+            BlockTask.objects.filter(pk=instance.pk).values_list("block_id", "estimated_minutes").first()
+        )
+
+
+@receiver(post_save, sender=BlockTask)
+def task_saved(sender, instance, created=False, raw=False, **kwargs):
+    """Un cambio de bloque o de minutos estimados altera los resúmenes de quienes la tienen."""
+    previous = getattr(instance, "_rollup_previous", None)
+    if created or raw or not previous or previous == (instance.block_id, instance.estimated_minutes):
+        return
+    students = StudentTaskProgress.objects.filter(task_id=instance.pk).values_list("student_id", flat=True)
+    rollups.mark_dirty(students=students, blocks={previous[0], instance.block_id})
+
+
+@receiver(pre_delete, sender=BlockTask)
+def task_deleted(sender, instance, **kwargs):
+    # La tarea ya no existirá al recalcular: se anota su bloque ahora.
+    rollups.mark_dirty(blocks=[instance.block_id])
+
+
+@receiver(pre_delete, sender=StudyBlock)
+def block_deleted(sender, instance, **kwargs):
+    rollups.mark_dirty(topics=[instance.topic_id])
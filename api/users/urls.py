@@ -1,10 +1,18 @@
 from rest_framework.routers import DefaultRouter
 
-from .views import StudentTaskProgressViewSet, StudentViewSet, UserViewSet
+from .views import (
+    AssignmentJobViewSet,
+    ProgressChangeViewSet,
+    StudentTaskProgressViewSet,
+    StudentViewSet,
+    UserViewSet,
+)
 
 router = DefaultRouter()
 router.register(r"users", UserViewSet, basename="users")
 router.register(r"students", StudentViewSet, basename="students")
 router.register(r"student-task-progress", StudentTaskProgressViewSet, basename="student-task-progress")
+router.register(r"assignment-jobs", AssignmentJobViewSet, basename="assignment-jobs")
+router.register(r"changes", ProgressChangeViewSet, basename="changes")
 
 urlpatterns = router.urls
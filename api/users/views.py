@@ -1,9 +1,30 @@
+from types import GeneratorType
+
+from asgiref.sync import sync_to_async
 from django.contrib.auth import get_user_model
-from rest_framework import viewsets
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from rest_framework import serializers, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.parsers import JSONParser
 from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+
+from common.export import ExportMixin
+from common.parsers import NDJSONParser
+from common.sync import DeltaSyncMixin
+from common.views import ConditionalRequestMixin, SparseFieldsetsViewMixin, ValuesListMixin
+from tasks.models import BlockTask, StudyBlock, StudyTopic
 
-from .models import Student, StudentTaskProgress
+from . import changes, recommendations, rollups
+from .bulk import bulk_upsert_progress
+from .filters import StudentFilter
+from .models import AssignmentJob, Student, StudentTaskProgress
 from .serializers import (
+    AssignmentJobSerializer,
+    NextTaskSerializer,
+    ProgressChangeQuerySerializer,
     StudentSerializer,
     StudentTaskProgressSerializer,
     UserSerializer,
@@ -12,7 +33,7 @@ from .serializers import (
 User = get_user_model()
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(ConditionalRequestMixin, SparseFieldsetsViewMixin, viewsets.ModelViewSet):
     """CRUD básico sobre el usuario Django por defecto."""
 
     queryset = User.objects.all().order_by("id")
@@ -21,20 +42,45 @@ class UserViewSet(viewsets.ModelViewSet):
     lookup_field = "id"
     search_fields = ["username", "email", "first_name", "last_name"]
     ordering_fields = ["date_joined", "username", "id"]
+    # auth.User no tiene `updated_at`: sin ETag ni Last-Modified.
+    etag_field = None
 
 
-class StudentViewSet(viewsets.ModelViewSet):
+class StudentViewSet(ConditionalRequestMixin, SparseFieldsetsViewMixin, viewsets.ModelViewSet):
     """CRUD para estudiantes."""
 
     queryset = Student.objects.select_related("user").all()
     serializer_class = StudentSerializer
     permission_classes = [AllowAny]
     lookup_field = "id"
+    filterset_class = StudentFilter
     search_fields = ["full_name", "user__username", "user__email"]
     ordering_fields = ["full_name", "started_at"]
 
+    @action(detail=True, methods=["get"])
+    def summary(self, request, id=None):
+        """Progreso por tema y por bloque, leído de los resúmenes precalculados."""
+        return Response(rollups.summary(self.get_object()))
+
+    @action(detail=True, methods=["get"], url_path="next-tasks")
+    def next_tasks(self, request, id=None):
+        """
+        Siguientes tareas del estudiante: disponibles y sin completar, en orden
+        de bloque y de tarea (`?limit=`, 5 por defecto y hasta 50).
+        """
+        field = serializers.IntegerField(min_value=1, max_value=recommendations.MAX_LIMIT)
+        try:
+            limit = field.run_validation(request.query_params.get("limit", recommendations.DEFAULT_LIMIT))
+        except ValidationError as exc:
+            raise ValidationError({"limit": exc.detail})
+        tasks = recommendations.next_tasks(self.get_object(), limit)
+        return Response(NextTaskSerializer(tasks, many=True).data)
 
-class StudentTaskProgressViewSet(viewsets.ModelViewSet):
+
+class StudentTaskProgressViewSet(
+    DeltaSyncMixin, ConditionalRequestMixin, ExportMixin, SparseFieldsetsViewMixin, ValuesListMixin,
+    viewsets.ModelViewSet,
+):
     """Asignación y seguimiento de tareas para estudiantes."""
 
     queryset = (
@@ -52,3 +98,101 @@ class StudentTaskProgressViewSet(viewsets.ModelViewSet):
         "notes",
     ]
     ordering_fields = ["started_at", "completed_at", "status"]
+    # Clave del índice único (student, task) para `?pagination=cursor`.
+    keyset_fields = ("student", "task")
+    # `task_detail` anida la tarea, y la búsqueda y los filtros llegan al
+    # estudiante, el bloque y el tema: sus cambios también cambian el ETag.
+    cache_dependencies = (Student, StudyTopic, StudyBlock, BlockTask)
+    async_query_params = ("fields", "omit")
+    throttle_scopes = {"list": "progress-list", "export": "exports"}
+    export_fields = (
+        "id", "student", "student__full_name", "task", "task__title", "task__block", "task__block__topic",
+        "status", "started_at", "completed_at", "notes", "updated_at",
+    )
+
+    @action(detail=False, methods=["post"], url_path="bulk", parser_classes=[JSONParser, NDJSONParser])
+    def bulk(self, request):
+        """
+        Upsert masivo sobre `(student, task)`.
+
+        Acepta una lista JSON o un stream NDJSON; responde con los totales y
+        un resultado por fila (`created`, `updated`, `unchanged` o `error`).
+        """
+        rows = request.data
+        if request.stream is None and request.content_type.startswith(NDJSONParser.media_type):
+            # Con el cuerpo vacío DRF no llama al parser y `data` queda en `{}`:
+            # un stream NDJSON vacío es un lote vacío, como `[]` en JSON.
+            rows = []
+        if not isinstance(rows, (list, GeneratorType)):
+            raise ValidationError({"non_field_errors": ["Se esperaba una lista de filas."]})
+        return Response(bulk_upsert_progress(rows))
+
+
+class AssignmentJobViewSet(
+    ConditionalRequestMixin, SparseFieldsetsViewMixin, viewsets.ReadOnlyModelViewSet
+):
+    """Estado y avance de las asignaciones masivas de temas y bloques."""
+
+    queryset = AssignmentJob.objects.all()
+    serializer_class = AssignmentJobSerializer
+    permission_classes = [AllowAny]
+    lookup_field = "id"
+    filterset_fields = ["status", "topic", "block"]
+    ordering_fields = ["created_at", "updated_at"]
+
+
+class ProgressChangeViewSet(viewsets.ViewSet):
+    """
+    Cambios del progreso para sincronizar por deltas (ver `users.changes`).
+
+    `?since=<seq>` devuelve los cambios posteriores (`?student=` filtra,
+    `?limit=` hasta 1000); sin `since`, solo el `last_seq` actual. El mismo
+    feed como Server-Sent Events está en `changes/stream/`.
+    """
+
+    permission_classes = [AllowAny]
+
+    def get_params(self, request, since=None):
+        data = request.query_params.dict()
+        if since:
+            data["since"] = since
+        serializer = ProgressChangeQuerySerializer(data=data)
+        serializer.is_valid(raise_exception=True)
+        return serializer.validated_data
+
+    def list(self, request):
+        params = self.get_params(request)
+        if "since" not in params:
+            return Response({"results": [], "last_seq": changes.last_seq(), "has_more": False})
+        return Response(changes.read(params["since"], params.get("student"), params.get("limit")))
+
+
+async def progress_change_stream(request):
+    """
+    `GET /api/changes/stream/`: los cambios del progreso como Server-Sent Events.
+
+    Empieza después de `Last-Event-ID` (al reconectar), de `?since=` o, sin
+    ninguno, del último cambio; `?student=` filtra. Autenticación, permisos y
+    throttling son los de `ProgressChangeViewSet`. Bajo WSGI Django junta el
+    stream entero antes de enviarlo, así que ahí solo se pone al día y cierra
+    (el navegador reconecta y queda en polling cada `RETRY_MS`).
+    """
+    view = ProgressChangeViewSet(action_map={"get": "stream"})
+    view.action, view.args, view.kwargs = "stream", (), {}
+    drf_request = view.initialize_request(request)
+    view.request, view.headers = drf_request, view.default_response_headers
+    try:
+        await sync_to_async(view.initial)(drf_request)
+        params = view.get_params(drf_request, since=request.headers.get("Last-Event-ID"))
+        since = params["since"] if "since" in params else await sync_to_async(changes.last_seq)()
+    except Exception as exc:
+        return view.finalize_response(drf_request, view.handle_exception(exc))
+
+    seconds = None if isinstance(request, ASGIRequest) else 0
+    response = StreamingHttpResponse(
+        changes.event_stream(since, params.get("student"), seconds), content_type="text/event-stream"
+    )
+    response["Cache-Control"] = "no-cache"
+    # Que un proxy (nginx) no acumule los eventos.
+    response["X-Accel-Buffering"] = "no"
+    return response
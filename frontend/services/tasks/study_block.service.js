@@ -109,4 +109,32 @@ export class StudyBlockService
             throw new Error(`Internal error: ${error}`);
         }
     }
+
+    async reorder(id, taskIds)
+    {
+        if (!id) throw new Error('Block id is required for reorder');
+        const url = `${this.baseUrl}${id}/reorder/`;
+
+        try
+        {
+            const response = await fetch(url, {
+                method: 'POST',
+                headers: {
+                    "Content-Type": "application/json"
+                },
+                body: JSON.stringify({ tasks: taskIds })
+            });
+
+            if (!response.ok) {
+                const error = await response.text();
+                throw new Error(`Response error: ${error}`);
+            }
+
+            return response.json();
+        }
+        catch (error)
+        {
+            throw new Error(`Internal error: ${error}`);
+        }
+    }
 }
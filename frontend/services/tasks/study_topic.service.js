@@ -109,4 +109,60 @@ export class StudyTopicService
             throw new Error(`Internal error: ${error}`);
         }
     }
+
+    async assign(topicId, cohort)
+    {
+        if (!topicId) throw new Error('Topic id is required for assign');
+        const url = `${this.baseUrl}${topicId}/assign/`;
+
+        try
+        {
+            const response = await fetch(url, {
+                method: 'POST',
+                headers: {
+                    "Content-Type": "application/json"
+                },
+                body: JSON.stringify(cohort)
+            });
+
+            if (!response.ok) {
+                const error = await response.text();
+                throw new Error(`Response error: ${error}`);
+            }
+
+            return response.json();
+        }
+        catch (error)
+        {
+            throw new Error(`Internal error: ${error}`);
+        }
+    }
+
+    async reorderBlocks(id, blockIds)
+    {
+        if (!id) throw new Error('Topic id is required for reorder');
+        const url = `${this.baseUrl}${id}/reorder-blocks/`;
+
+        try
+        {
+            const response = await fetch(url, {
+                method: 'POST',
+                headers: {
+                    "Content-Type": "application/json"
+                },
+                body: JSON.stringify({ blocks: blockIds })
+            });
+
+            if (!response.ok) {
+                const error = await response.text();
+                throw new Error(`Response error: ${error}`);
+            }
+
+            return response.json();
+        }
+        catch (error)
+        {
+            throw new Error(`Internal error: ${error}`);
+        }
+    }
 }
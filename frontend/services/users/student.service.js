@@ -108,4 +108,31 @@ export class StudentService
             throw new Error(`Internal error: ${error}`);
         }
     }
+
+    async getSummary(id)
+    {
+        if (!id) throw new Error('Student id is required for summary');
+        const url = `${this.baseUrl}${id}/summary/`;
+
+        try
+        {
+            const response = await fetch(url, {
+                method: 'GET',
+                headers: {
+                    "Content-Type": "application/json"
+                }
+            });
+
+            if (!response.ok) {
+                const error = await response.text();
+                throw new Error(`Response error: ${error}`);
+            }
+
+            return response.json();
+        }
+        catch (error)
+        {
+            throw new Error(`Internal error: ${error}`);
+        }
+    }
 }